@@ -0,0 +1,120 @@
+import os
+import re
+import sys
+import time
+import argparse
+from collections import Counter
+
+import pandas as pd
+from transformers import AutoTokenizer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from generator.pipeline import round_trip_mismatches
+
+# ==========================
+# 1. Arguments
+# ==========================
+parser = argparse.ArgumentParser(description="Mine frequent domain tokens (signal names, hex IDs) for the T5 tokenizer")
+parser.add_argument("sheets", nargs="*", default=["training_dataset_readable.xlsx"],
+                    help="Training sheet and DTC matrices to mine (Implementation / Readable_Output columns)")
+parser.add_argument("--tokenizer", default="t5-small", help="Base tokenizer (name or directory)")
+parser.add_argument("--min-count", type=int, default=5, help="Minimum number of occurrences of a token")
+parser.add_argument("--min-pieces", type=int, default=3, help="Only add words split into at least this many subwords")
+parser.add_argument("--max-tokens", type=int, default=500, help="Maximum number of tokens to add")
+parser.add_argument("--output", default="domain_tokens.txt", help="File read by train_model_readable.py")
+parser.add_argument("--latency-models", nargs=2, metavar=("BASE", "RETRAINED"),
+                    help="Model folders trained without and with the domain tokens: time their generate() "
+                         "on the inputs of the sheets (give a held-out sheet, not the training one)")
+parser.add_argument("--latency-sample", type=int, default=50, help="Inputs timed per model")
+args = parser.parse_args()
+
+max_input_length = 128
+max_output_length = 256
+
+# Signal / coding names, section headers and hex IDs
+CANDIDATE_PATTERN = re.compile(r"0x[0-9A-Fa-f]+|[A-Za-z_][A-Za-z0-9_]{3,}:?")
+
+# ==========================
+# 2. Texts
+# ==========================
+inputs, targets = [], []
+for sheet in args.sheets:
+    df = pd.read_excel(sheet)
+    inputs += df["Implementation"].dropna().astype(str).tolist()
+    if "Readable_Output" in df.columns:
+        targets += df["Readable_Output"].dropna().astype(str).tolist()
+print(f"{len(inputs)} inputs and {len(targets)} targets from {len(args.sheets)} sheet(s)")
+
+tokenizer = AutoTokenizer.from_pretrained(args.tokenizer)
+
+# ==========================
+# 3. Mining
+# ==========================
+counts = Counter(word for text in inputs + targets for word in CANDIDATE_PATTERN.findall(text))
+candidates = []
+for word, count in counts.items():
+    pieces = len(tokenizer.tokenize(word))
+    if count >= args.min_count and pieces >= args.min_pieces:
+        # Each occurrence saves all subwords but one
+        candidates.append((count * (pieces - 1), word))
+domain_tokens = [word for _, word in sorted(candidates, reverse=True)[:args.max_tokens]]
+
+with open(args.output, "w", encoding="utf-8") as f:
+    f.write("\n".join(domain_tokens) + "\n")
+print(f"{len(domain_tokens)} domain tokens written to {args.output}")
+
+# ==========================
+# 4. Report
+# ==========================
+def lengths(tok, texts):
+    return [len(ids) for ids in tok(texts).input_ids]
+
+
+def summary(name, before, after, budget):
+    mean_before = sum(before) / len(before)
+    mean_after = sum(after) / len(after)
+    print(
+        f"{name}: {mean_before:.1f} -> {mean_after:.1f} tokens on average "
+        f"(-{100 * (1 - mean_after / mean_before):.0f}%), "
+        f"over the {budget} budget: {sum(n > budget for n in before)} -> {sum(n > budget for n in after)}"
+    )
+    return mean_before, mean_after
+
+
+extended = AutoTokenizer.from_pretrained(args.tokenizer)
+extended.add_tokens(domain_tokens)
+
+summary("Inputs", lengths(tokenizer, inputs), lengths(extended, inputs), max_input_length)
+if targets:
+    before, after = summary("Targets", lengths(tokenizer, targets), lengths(extended, targets), max_output_length)
+    # A token count, not a latency: the decode time is only known once a model is retrained (--latency-models)
+    print(f"Target token reduction: x{before / after:.2f} fewer decoder steps per output")
+
+    # The added tokens must not change what parse_model_output reads from a decoded target
+    # (T5 drops spaces around added tokens unless the tokenizer keeps them)
+    known = {text for text, _ in round_trip_mismatches(tokenizer, targets)}
+    broken = [(text, decoded) for text, decoded in round_trip_mismatches(extended, targets) if text not in known]
+    print(f"Targets no longer parsed the same after encode/decode: {len(broken)}")
+    for text, decoded in broken[:5]:
+        print(f"  {text!r}\n  -> {decoded!r}")
+
+
+# ==========================
+# 5. Decode latency (optional)
+# ==========================
+def mean_generate_ms(model_dir, texts):
+    from generator.pipeline import DtcTestGenerator
+
+    generator = DtcTestGenerator(model_dir)
+    generator.generate_rule_output_raw(texts[0])  # Warm-up
+    start = time.perf_counter()
+    for text in texts:
+        generator.generate_rule_output_raw(text)
+    return 1000 * (time.perf_counter() - start) / len(texts)
+
+
+if args.latency_models:
+    sample = inputs[:args.latency_sample]
+    base_ms, retrained_ms = (mean_generate_ms(model_dir, sample) for model_dir in args.latency_models)
+    print(f"generate(): {base_ms:.0f} -> {retrained_ms:.0f} ms per input on {len(sample)} inputs "
+          f"(measured speed-up x{base_ms / retrained_ms:.2f})")
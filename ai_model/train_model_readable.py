@@ -1,6 +1,7 @@
+import os
 import pandas as pd
 import torch
-from transformers import T5ForConditionalGeneration, T5Tokenizer, Trainer, TrainingArguments
+from transformers import AutoTokenizer, T5ForConditionalGeneration, Trainer, TrainingArguments
 from datasets import Dataset
 
 # ==========================
@@ -19,9 +20,34 @@ dataset = dataset.train_test_split(test_size=0.2)
 # 2. Tokenizer and model
 # ==========================
 model_name = "t5-small"  
-tokenizer = T5Tokenizer.from_pretrained(model_name)
+# AutoTokenizer (the fast tokenizer) instead of the former slow T5Tokenizer: generator/pipeline.py
+# decodes with AutoTokenizer, and the two tokenize added tokens differently. Training with the class
+# used at inference keeps the labels identical to what the app decodes (checked below)
+tokenizer = AutoTokenizer.from_pretrained(model_name)
 model = T5ForConditionalGeneration.from_pretrained(model_name)
 
+# Domain vocabulary mined by mine_vocabulary.py (signal names, hex IDs...):
+# one token each instead of many subwords, saved in added_tokens.json with the tokenizer
+if os.path.exists("domain_tokens.txt"):
+    with open("domain_tokens.txt", encoding="utf-8") as f:
+        domain_tokens = [line.strip() for line in f if line.strip()]
+    added = tokenizer.add_tokens(domain_tokens)
+    model.resize_token_embeddings(len(tokenizer))
+    print(f"Added {added} domain tokens to the tokenizer")
+
+# Every target must still read the same through parse_model_output once encoded and decoded
+# (spacing around the added tokens); targets the base tokenizer already alters are not counted
+import sys
+sys.path.insert(0, os.path.abspath(".."))
+from generator.pipeline import round_trip_mismatches
+
+targets = df["Readable_Output"].dropna().astype(str).tolist()
+known = {text for text, _ in round_trip_mismatches(AutoTokenizer.from_pretrained(model_name), targets)}
+broken = [(text, decoded) for text, decoded in round_trip_mismatches(tokenizer, targets) if text not in known]
+if broken:
+    text, decoded = broken[0]
+    sys.exit(f"{len(broken)} targets are parsed differently after encode/decode, e.g.\n{text!r}\n-> {decoded!r}")
+
 max_input_length = 128
 max_output_length = 256
 
@@ -57,7 +83,8 @@ training_args = TrainingArguments(
     save_total_limit=2,
     logging_dir="./logs",
     logging_steps=50,
-    report_to="none"
+    report_to="none",
+    save_safetensors=True  # model.safetensors is memory-mapped by the app at load time
 )
 
 # ==========================
@@ -83,3 +110,14 @@ trainer.save_model("../t5_model")
 tokenizer.save_pretrained("../t5_model")
 
 print("✅ Training completed and model saved in ../t5_model")
+
+# ==========================
+# 7. Model registry (optional)
+# ==========================
+# KPIT_REGISTER_MODEL=1: also publish the checkpoint as a new registry version with its
+# evaluation scores; the apps switch to it once activated (python generator/registry.py activate vNNN)
+if os.getenv("KPIT_REGISTER_MODEL") == "1":
+    from generator.registry import ModelRegistry
+
+    metadata = ModelRegistry().register("../t5_model", eval_scores=trainer.evaluate(), notes=f"{model_name} fine-tuned")
+    print(f"✅ Registered as model version {metadata['version']}")
@@ -10,8 +10,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from PyQt5.QtWidgets import QApplication
 
 # === Internal Imports ===
+import logging
+from server.logging_config import setup_logging
 from frontend.window_manager import WindowManager
 
+logger = logging.getLogger("frontend.main")
+
 # === Utility Functions ===
 def create_shortcut_with_icon():
     """Creates a desktop shortcut with an icon, without external dependencies"""
@@ -33,17 +37,19 @@ def create_shortcut_with_icon():
         shortcut.WindowStyle = 1  # 7 = Minimized, 1 = Normal
         shortcut.save()
 
-        print("Shortcut successfully created on desktop")
+        logger.info("Shortcut successfully created on desktop")
         return True
     except ImportError:
-        print("Warning: pywin32 not installed, cannot create desktop shortcut")
+        logger.warning("pywin32 not installed, cannot create desktop shortcut")
         return False
     except Exception as e:
-        print(f"Shortcut creation error: {str(e)}")
+        logger.error("Shortcut creation error: %s", e)
         return False
 
 # === Main Application Entry Point ===
 def main():
+    setup_logging("app")
+
     # Hide console immediately (Windows only)
     if sys.platform == "win32":
         import ctypes
@@ -78,8 +84,8 @@ if __name__ == "__main__":
             from PIL import Image
             img = Image.open("assets/kpit_logo.png")
             img.save(icon_path, format='ICO')
-            print("Icon successfully converted to .ico")
+            logger.info("Icon successfully converted to .ico")
         except Exception as e:
-            print(f"Icon conversion error: {str(e)}")
+            logger.error("Icon conversion error: %s", e)
 
     main()
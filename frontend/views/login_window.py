@@ -1,13 +1,18 @@
 import os
-from PyQt5.QtCore import Qt, QPropertyAnimation, QEasingCurve
+import logging
+import threading
+from concurrent.futures import Future
+from PyQt5.QtCore import Qt, QPropertyAnimation, QEasingCurve, QTimer
 from PyQt5.QtGui import QPixmap, QIcon
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QLineEdit, QPushButton, QFrame, QCheckBox, QDialog, QMessageBox
 )
 from server.supabase_config import supabase_config
+from server.readiness import SERVER_URL, wait_for_server
 
 base_dir = os.path.dirname(os.path.abspath(__file__))
+logger = logging.getLogger(__name__)
 
 class ResetPasswordDialog(QDialog):
 
@@ -65,6 +70,7 @@ class ResetPasswordDialog(QDialog):
         buttons_layout = QHBoxLayout()
         cancel_btn = QPushButton("Cancel")
         send_btn = QPushButton("Send Link")
+        self.send_btn = send_btn
 
         cancel_btn.setObjectName("cancelBtn")
         send_btn.setObjectName("sendBtn")
@@ -139,6 +145,13 @@ class ResetPasswordDialog(QDialog):
         cancel_btn.clicked.connect(self.reject)
         send_btn.clicked.connect(self.send_reset_email)
 
+        # The server wait runs in a thread; this timer picks up its result on the GUI thread
+        self.server_wait = None
+        self.pending_email = None
+        self.server_timer = QTimer(self)
+        self.server_timer.setInterval(200)
+        self.server_timer.timeout.connect(self.check_server_wait)
+
    
    #------- Function to reset password -----------
 
@@ -149,30 +162,47 @@ class ResetPasswordDialog(QDialog):
             self.show_status("Please enter a valid email address", "error")
             return
 
-        try:
-            # Get Supabase client from parent window
-            parent_window = self.parent()
-            if not hasattr(parent_window, 'supabase') or not parent_window.supabase:
-                self.show_status("Database connection not available", "error")
-                return
+        # Get Supabase client from parent window
+        parent_window = self.parent()
+        if not hasattr(parent_window, 'supabase') or not parent_window.supabase:
+            self.show_status("Database connection not available", "error")
+            return
 
-            # Check if Flask server is running
-            import requests
-            try:
-                response = requests.get("http://localhost:8000", timeout=2)
-                server_running = True
-            except:
-                server_running = False
+        # The server starts alongside the GUI; only wait for it when a reset link is needed,
+        # in a background thread so the dialog stays responsive
+        self.pending_email = email
+        self.send_btn.setEnabled(False)
+        self.show_status("Waiting for the password reset server...", "info")
+        self.server_wait = Future()
+        threading.Thread(target=self._wait_for_server, args=(self.server_wait,), daemon=True).start()
+        self.server_timer.start()
+
+    @staticmethod
+    def _wait_for_server(future):
+        try:
+            future.set_result(wait_for_server(timeout=10.0))
+        except Exception as e:
+            future.set_exception(e)
 
-            if not server_running:
-                self.show_status("Flask server not running! Please start 'python redirect_server.py' first.", "error")
-                return
+    def check_server_wait(self):
+        """Timer slot: send the link once the server wait has finished"""
+        if self.server_wait is None or not self.server_wait.done():
+            return
+        self.server_timer.stop()
+        future, self.server_wait = self.server_wait, None
+        self.send_btn.setEnabled(True)
+        if future.exception() is not None or not future.result():
+            self.show_status("Flask server not running! Please start 'python server/wsgi.py' first.", "error")
+            return
+        self.send_reset_link(self.pending_email)
 
+    def send_reset_link(self, email):
+        try:
             # Use Supabase password reset with correct redirect URL
-            response = parent_window.supabase.auth.reset_password_email(
+            response = self.parent().supabase.auth.reset_password_email(
                 email,
                 options={
-                    "redirect_to": "http://localhost:8000/reset-password"
+                    "redirect_to": f"{SERVER_URL}/reset-password"
                 }
             )
 
@@ -182,7 +212,7 @@ class ResetPasswordDialog(QDialog):
                 "The link will open in your web browser.",
                 "success"
             )
-            print(f"Password reset email sent to: {email}")
+            logger.info("Password reset email sent to: %s", email)
 
         except Exception as e:
             error_msg = str(e).lower()
@@ -191,7 +221,7 @@ class ResetPasswordDialog(QDialog):
                 self.show_status("If this email is registered, you will receive a reset link.", "success")
             else:
                 self.show_status(f"Error: {str(e)}", "error")
-            print(f" Password reset error: {e}")
+            logger.warning("Password reset error: %s", e)
 
     def show_status(self, message, type="info"):
         self.status_label.setText(message)
@@ -233,7 +263,7 @@ class LoginWindow(QMainWindow):
         try:
             logo_path = os.path.join(base_dir, "../assets/kpit_logo.png")
             logo_pixmap = QPixmap(logo_path)
-            print("Pixmap loaded:", not logo_pixmap.isNull())
+            logger.debug("Pixmap loaded: %s", not logo_pixmap.isNull())
 
             logo_label.setPixmap(logo_pixmap)
         except:
@@ -339,14 +369,14 @@ class LoginWindow(QMainWindow):
         """Initialize Supabase with better error handling"""
         try:
             if not supabase_config.is_configured():
-                print("Supabase not configured - missing environment variables")
+                logger.warning("Supabase not configured - missing environment variables")
                 self.supabase = None
                 return
 
             self.supabase = supabase_config.get_client()
-            print("Supabase initialized successfully in LoginWindow")
+            logger.debug("Supabase initialized in LoginWindow")
         except Exception as e:
-            print(f"Error initializing Supabase: {e}")
+            logger.error("Error initializing Supabase: %s", e)
             self.supabase = None
 
     def animate_ui(self):
@@ -401,7 +431,7 @@ class LoginWindow(QMainWindow):
                 "password": password
             })
             
-            print(f"User ID after auth: {response.user.id}")
+            logger.info("User %s authenticated", response.user.id)
 
             user_profile_response = self.supabase.table('user_profiles') .select('*') .eq('email', email) .maybe_single().execute()
 
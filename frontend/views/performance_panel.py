@@ -0,0 +1,75 @@
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem,
+    QHeaderView, QFileDialog, QMessageBox
+)
+from PyQt5.QtCore import Qt
+
+from generator.tracing import tracer
+
+
+class PerformancePanel(QDialog):
+    """Per-stage timings of the pipeline (count, mean, p50, p95, max, total)"""
+
+    COLUMNS = [
+        ("Stage", "stage"), ("Count", "count"), ("Mean (ms)", "mean_ms"), ("p50 (ms)", "p50_ms"),
+        ("p95 (ms)", "p95_ms"), ("Max (ms)", "max_ms"), ("Total (s)", "total_ms"),
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Performance")
+        self.setMinimumSize(760, 360)
+
+        layout = QVBoxLayout(self)
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for title, _ in self.COLUMNS])
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(self.reset)
+        export_btn = QPushButton("Export Chrome Trace")
+        export_btn.clicked.connect(self.export_trace)
+        buttons.addWidget(refresh_btn)
+        buttons.addWidget(reset_btn)
+        buttons.addStretch()
+        buttons.addWidget(export_btn)
+        layout.addLayout(buttons)
+
+        self.refresh()
+
+    def refresh(self):
+        stages = tracer.summary()
+        self.table.setRowCount(len(stages))
+        for row, stage in enumerate(stages):
+            for column, (_, key) in enumerate(self.COLUMNS):
+                value = stage[key]
+                if key == "total_ms":
+                    text = f"{value / 1000:.2f}"
+                elif isinstance(value, float):
+                    text = f"{value:.1f}"
+                else:
+                    text = str(value)
+                item = QTableWidgetItem(text)
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+    def reset(self):
+        tracer.reset()
+        self.refresh()
+
+    def export_trace(self):
+        save_path, _ = QFileDialog.getSaveFileName(
+            self, "Export Chrome Trace", "kpit_trace.json", "Trace Files (*.json)"
+        )
+        if save_path:
+            tracer.write_chrome_trace(save_path)
+            QMessageBox.information(
+                self, "Saved", f"Trace saved:\n{save_path}\n\nOpen it in chrome://tracing or ui.perfetto.dev"
+            )
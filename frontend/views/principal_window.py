@@ -1,19 +1,33 @@
 import os
 import json
-import re
-import random
-import pandas as pd
-from jinja2 import Environment, FileSystemLoader
+import queue
+import logging
+import threading
 
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QLineEdit, QPushButton, QFrame, QTableWidget,
-    QTableWidgetItem, QFileDialog, QMessageBox, QTextEdit,
-    QHeaderView 
+    QLabel, QLineEdit, QPushButton, QFrame, QFileDialog,
+    QMessageBox, QTextEdit, QHeaderView, QApplication, QComboBox
 )
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QIcon
-import torch
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+from generator.lifecycle import ModelLifecycle, process_memory_mb
+from generator.registry import ModelRegistry
+from generator.export import render_test_case, plan_suites, write_keywords_resource
+from generator.archive import write_suites_archive
+from generator.tracing import span
+from generator.ingest import find_workbooks, load_dtc_index
+from frontend.views.result_table import (
+    DtcResultTableModel, DtcResultFilterProxyModel, DtcResultTableView
+)
+from frontend.views.performance_panel import PerformancePanel
+
+logger = logging.getLogger(__name__)
+
+# Rows given to the model per batch when a whole workbook is generated; each batch is
+# appended to the result table in one insert while the next one runs
+GUI_BATCH_SIZE = int(os.getenv("KPIT_GUI_BATCH_SIZE", "32"))
 
 
 class PrincipalWindow(QMainWindow):
@@ -25,18 +39,33 @@ class PrincipalWindow(QMainWindow):
         logo_path = os.path.join(base_dir, "../assets/kpit_logo.png")
         self.setWindowIcon(QIcon(logo_path))
 
-        # Load AI model
-        model_id = "./t5_model"
-        self.tokenizer = AutoTokenizer.from_pretrained(model_id)
-        self.model = AutoModelForSeq2SeqLM.from_pretrained(model_id)
-        self.device = torch.device("cpu")
-        self.model.to(self.device)
+        # AI model: loaded in the background now, unloaded after an idle period,
+        # reloaded on the next Run (prefetched as soon as the user starts a new case).
+        # Follows the active version of the model registry (t5_model when it is empty)
+        self.models = ModelLifecycle(registry=ModelRegistry(), device="cpu")
+        self.model_versions = None
+        self.models.prefetch()
 
         self.current_test_case_data = None
+        self.performance_panel = None
+        self.workbook_cache = None  # (((path, mtime), ...), DataFrame, ValidationReport)
+        self.batch_results = None   # Queue of result batches while a workbook is generated
+        self.batch_stop = None
+        self.batch_total = 0
+        self.batch_done = 0
 
         self._build_ui()
         self.apply_styles()
 
+        self.model_timer = QTimer(self)
+        self.model_timer.timeout.connect(self.check_model)
+        self.model_timer.start(2000)
+        self.check_model()
+
+        self.batch_timer = QTimer(self)
+        self.batch_timer.setInterval(100)
+        self.batch_timer.timeout.connect(self.drain_batch_results)
+
     # ---------------- UI ---------------- #
     def _build_ui(self):
         central_widget = QWidget()
@@ -51,7 +80,7 @@ class PrincipalWindow(QMainWindow):
         top_layout.setContentsMargins(0, 0, 0, 0)
 
         self.excel_path_input = QLineEdit()
-        self.excel_path_input.setPlaceholderText("Select the Excel file...")
+        self.excel_path_input.setPlaceholderText("Select the Excel files (or type a folder)...")
         self.excel_path_input.setMinimumHeight(40)
         self.excel_path_input.setStyleSheet("padding: 8px;")
 
@@ -76,6 +105,7 @@ class PrincipalWindow(QMainWindow):
         self.test_case_input.setPlaceholderText("Enter the DTC ID...")
         self.test_case_input.setMinimumHeight(40)
         self.test_case_input.setStyleSheet("padding: 8px;")
+        self.test_case_input.textEdited.connect(lambda _: self.models.prefetch())
 
         self.tester_name_input = QLineEdit()
         self.tester_name_input.setPlaceholderText("Enter tester name...")
@@ -105,29 +135,42 @@ class PrincipalWindow(QMainWindow):
         test_case_layout.addSpacing(20)
         test_case_layout.addWidget(self.run_btn)  # Run button to the right of the Tester Name field
 
+        # Whole workbook, generated in batches in the background
+        self.run_all_btn = QPushButton("Run All")
+        self.run_all_btn.clicked.connect(self.generate_all_test_cases)
+        self.run_all_btn.setFixedWidth(100)
+        self.run_all_btn.setMinimumHeight(40)
+        test_case_layout.addWidget(self.run_all_btn)
+
         main_layout.addWidget(test_case_frame)
 
 
         # --- Result Table --- #
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["DTC ID", "Coding", "Trigger Conditions", "Debounce Time"])
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter results (DTC, coding, trigger, debounce)...")
+        self.filter_input.setMinimumHeight(36)
+        main_layout.addWidget(self.filter_input)
+
+        self.result_model = DtcResultTableModel(self)
+        self.result_proxy = DtcResultFilterProxyModel(self)
+        self.result_proxy.setSourceModel(self.result_model)
+        self.filter_input.textChanged.connect(self.result_proxy.setFilterFixedString)
+
+        self.table = DtcResultTableView()
+        self.table.setModel(self.result_proxy)
         self.table.setMinimumHeight(100)  
         self.table.horizontalHeader().setStretchLastSection(True)
-        self.table.verticalHeader().setVisible(False)
+        self.table.clicked.connect(self.preview_result)
         main_layout.addWidget(self.table, 1)
 
         # Adjust the column widths
         header = self.table.horizontalHeader()
+        header.setResizeContentsPrecision(200)                        # Sample rows instead of scanning all of them
         header.setSectionResizeMode(0, QHeaderView.ResizeToContents)  # DTC ID takes just the necessary space
         header.setSectionResizeMode(1, QHeaderView.Stretch)           # Coding takes up more space
         header.setSectionResizeMode(2, QHeaderView.Stretch)           # Trigger Conditions takes up more space
         header.setSectionResizeMode(3, QHeaderView.ResizeToContents)  # Debounce Time compacted
-
-        self.table.verticalHeader().setDefaultSectionSize(60)  # Default height 60px
-        self.table.verticalHeader().setMinimumSectionSize(40)  # Minimum 40px
-        self.table.setWordWrap(True)                          # Allows word wrapping (line breaks)
-        self.table.resizeRowsToContents()                     # Adjusts the height according to the content
+        self.table.sortByColumn(0, Qt.AscendingOrder)
 
 
         # --- Generated Test Case Display --- #
@@ -141,7 +184,25 @@ class PrincipalWindow(QMainWindow):
         self.download_btn = QPushButton("Download Test Case")
         self.download_btn.setEnabled(False)
         self.download_btn.clicked.connect(self.download_test_case)
-        main_layout.addWidget(self.download_btn)
+        self.export_all_btn = QPushButton("Export All Test Cases")
+        self.export_all_btn.clicked.connect(self.export_all_test_cases)
+        download_layout = QHBoxLayout()
+        download_layout.addWidget(self.download_btn)
+        download_layout.addWidget(self.export_all_btn)
+        main_layout.addLayout(download_layout)
+
+        # --- Performance Button --- #
+        performance_btn = QPushButton("Performance")
+        performance_btn.clicked.connect(self.show_performance)
+        self.statusBar().addWidget(performance_btn)
+
+        # --- Status bar: model version, state and memory --- #
+        self.model_version_combo = QComboBox()
+        self.model_version_combo.setToolTip("Model version (switched in the background)")
+        self.model_version_combo.activated.connect(self.switch_model_version)
+        self.statusBar().addPermanentWidget(self.model_version_combo)
+        self.model_status_label = QLabel()
+        self.statusBar().addPermanentWidget(self.model_status_label)
 
     def apply_styles(self):
         self.setStyleSheet("""
@@ -182,7 +243,7 @@ class PrincipalWindow(QMainWindow):
         }
 
         /* Table */
-        QTableWidget {
+        QTableView {
             background-color: #1e1e1e;
             color: #e0e0e0;
             border: 1px solid #2e7d32;
@@ -190,7 +251,7 @@ class PrincipalWindow(QMainWindow):
             alternate-background-color: #1b1b1b;
         }
 
-        QTableWidget::item {
+        QTableView::item {
             padding: 6px;
         }
 
@@ -214,125 +275,141 @@ class PrincipalWindow(QMainWindow):
         """)
 
     # ---------------- IA ---------------- #
-    def generate_rule_output_raw(self, rule_text):
-        inputs = self.tokenizer(rule_text, return_tensors="pt", truncation=True, max_length=256).to(self.device)
-        outputs = self.model.generate(**inputs, max_new_tokens=256, num_beams=10, early_stopping=True)
-        return self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+    def load_workbook(self, excel_path):
+        """Read and validate every sheet of the workbooks once per file version.
 
-    def parse_model_output(self, raw_output):
-        """
-        Parse the raw output text from the model into structured codding and trigger_conditions.
-        If operator is missing in triggers, default to '<'.
+        excel_path holds one or more workbooks or folders separated by ";".
+        Returns (DataFrame, ValidationReport), see generator.ingest.load_dtc_index.
         """
-        raw_output = raw_output.replace("\n", " ").strip()
-        # Extract CODDING and TRIGGERS or IF sections
-        coding_match = re.search(r'CODDING:\s*(.*?)\s*(TRIGGERS:|IF:|$)', raw_output, re.IGNORECASE)
-        triggers_match = re.search(r'(TRIGGERS:|IF:)\s*(.*)', raw_output, re.IGNORECASE)
-
-        coding_raw = coding_match.group(1).strip() if coding_match else ""
-        triggers_raw = triggers_match.group(2).strip() if triggers_match else ""
-
-        # Parse codding
-        codding = []
-        coding_parts = re.split(r'\s{2,}', coding_raw)  # split by 2+ spaces
-        for part in coding_parts:
-            part = part.strip()
-            if part:
-                codding.append(part)
-
-        # Parse triggers
-        triggers = []
-        if triggers_raw:
-            parts = triggers_raw.split()
-            i = 0
-            while i < len(parts):
-                var = parts[i]
-                op = "<"  # default operator
-                val = None
-                hex_code = ""
-
-                # Check if next token is an operator
-                if i + 1 < len(parts) and parts[i + 1] in [">", "<", "==", "!=", ">=", "<="]:
-                    op = parts[i + 1]
-                    val = parts[i + 2] if i + 2 < len(parts) else None
-                    if i + 3 < len(parts) and parts[i + 3].startswith("0x"):
-                        hex_code = parts[i + 3]
-                        i += 4
-                    else:
-                        i += 3
-                else:
-                    # No explicit operator, value directly after var
-                    val = parts[i + 1] if i + 1 < len(parts) else None
-                    if i + 2 < len(parts) and parts[i + 2].startswith("0x"):
-                        hex_code = parts[i + 2]
-                        i += 3
-                    else:
-                        i += 2
-
-                if val:
-                    triggers.append({
-                        "variable": var,
-                        "operator": op,
-                        "value": val,
-                        "hex_code": hex_code
-                    })
-
-        return codding, triggers
-
-    def generate_test_case_for_dtc(self, input_dtc, excel_path):
-        df = pd.read_excel(excel_path)
+        paths = [path.strip() for path in excel_path.split(";") if path.strip()]
+        key = tuple((str(path), os.path.getmtime(path)) for path in find_workbooks(paths))
+        if self.workbook_cache is None or self.workbook_cache[0] != key:
+            with span("excel.read"):
+                df, report = load_dtc_index(paths)
+            if report.errors:
+                logger.warning("%s", report.format())
+            self.workbook_cache = (key, df, report)
+        return self.workbook_cache[1:]
+
+    def read_increment(self):
+        """Increment field text, or None (after a message) when it is not a number"""
+        text = self.increment_input.text().strip()
+        try:
+            if text:
+                float(text)
+        except ValueError:
+            QMessageBox.warning(self, "Invalid Increment", f"Increment must be a number, not \"{text}\".")
+            self.increment_input.setFocus()
+            return None
+        return text
+
+    def generate_test_case_for_dtc(self, input_dtc, excel_path, increment_text=""):
+        try:
+            df, report = self.load_workbook(excel_path)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"Excel file could not be read:\n{e}")
+            return None
+        if report.sheet_errors:
+            QMessageBox.critical(self, "Invalid Excel File", report.format())
+            return None
         row = df[df["DTC"] == input_dtc]
         if row.empty:
             QMessageBox.warning(self, "Warning", f"DTC {input_dtc} Not found.")
             return None
+        # Stop before the model runs on a row that cannot be generated
+        errors = report.errors_for(row.index[0])
+        if errors:
+            details = "\n".join(
+                f"{issue.get('source', '')} row {issue['row']}, {issue['column']}: {issue['message']}" for issue in errors
+            )
+            QMessageBox.warning(self, "Invalid DTC Row", f"DTC {input_dtc} cannot be generated:\n{details}")
+            return None
         row = row.iloc[0]
 
-        rule_text = row["Implementation"]
-        ECU = row.get("ECU", "ECU1")
-        Bus = row.get("BUS", "BUS")
-        Debounce = int(float(row.get("Debounce time", 1000)))
-
-        raw_output = self.generate_rule_output_raw(rule_text)
-
-        codding, trigger_conditions = self.parse_model_output(raw_output)
-
-        # Generate random values for trigger_conditions
-        for cond in trigger_conditions:
-            try:
-                val = float(cond.get("value", ""))
-            except (ValueError, TypeError):
-                val = None
-            op = cond.get("operator", "<")
-
-            increment_text = self.increment_input.text().strip()
-            if val is not None:
-                if op == ">":
-                    cond["error_value"] = val + int(increment_text) if increment_text else round(random.uniform(val + 1, val * 1.5), 1)
-                    cond["normal_value"] = val - int(increment_text) if increment_text else round(random.uniform(val * 0.5, val - 1), 1)
-                elif op == "<":
-                    cond["error_value"] = val - int(increment_text) if increment_text else round(random.uniform(val * 0.5, val - 1), 1)
-                    cond["normal_value"] = val + int(increment_text) if increment_text else round(random.uniform(val + 1, val * 1.5), 1)
-                else:
-                    cond["error_value"] = val
-                    cond["normal_value"] = val + round(random.uniform(val + 1, val * 1.5), 1)
-
-        tester_name = self.tester_name_input.text().strip() or "Unknown Tester"
-        data = {
-            "tester_name": tester_name.strip().lower().replace(" ", "."),
-            "dtc_code": input_dtc,
-            "ECU": ECU,
-            "Bus": Bus,
-            "Debounce": Debounce,
-            "codding": codding,
-            "trigger_conditions": trigger_conditions,
-        }
-        return data
+        if self.models.state != "loaded":
+            self.statusBar().showMessage("Loading AI model...")
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            with self.models.use() as generator:
+                return generator.build_test_data(
+                    row,
+                    tester_name=self.tester_name_input.text(),
+                    increment_text=increment_text,
+                )
+        except OSError as e:
+            logger.error("AI model could not be loaded from %s: %s", self.models.model_dir, e)
+            QMessageBox.critical(self, "Error", f"AI model could not be loaded:\n{e}")
+            return None
+        finally:
+            QApplication.restoreOverrideCursor()
+            self.statusBar().clearMessage()
+            self.check_model()
+
+    def check_model(self):
+        """Unload the model when idle, follow the registry and show the model state and memory use"""
+        self.models.evict_if_idle()
+        self.models.check_registry()
+        self.refresh_model_versions()
+        state = self.models.state
+        name = f"AI model {self.models.version}" if self.models.version else "AI model"
+        if self.models.switching_to:
+            text = f"{name}: {state}, switching to {self.models.switching_to}"
+        elif state == "loaded":
+            text = f"{name}: loaded ({self.models.model_size_mb():.0f} MB)"
+        else:
+            text = f"{name}: {state}"
+        memory = process_memory_mb()
+        if memory is not None:
+            text += f"  |  Memory: {memory:.0f} MB"
+        self.model_status_label.setText(text)
+
+    def refresh_model_versions(self):
+        """List the registry versions in the status bar (hidden while the registry is empty)"""
+        try:
+            versions = self.models.registry.versions()
+        except (OSError, ValueError, KeyError, json.JSONDecodeError) as e:
+            logger.warning("Model registry cannot be read: %s", e)
+            return
+        names = [meta["version"] for meta in versions]
+        if names != self.model_versions:
+            self.model_versions = names
+            self.model_version_combo.clear()
+            self.model_version_combo.addItem("Active version", "")
+            for meta in versions:
+                scores = ", ".join(f"{name} {value:.4g}" for name, value in (meta.get("eval") or {}).items()
+                                   if isinstance(value, (int, float)))
+                self.model_version_combo.addItem(
+                    f"{meta['version']} ({scores})" if scores else meta["version"], meta["version"]
+                )
+            self.model_version_combo.setVisible(bool(names))
+        pinned = "" if self.models.follow_registry else (self.models.switching_to or self.models.version)
+        self.model_version_combo.setCurrentIndex(max(0, self.model_version_combo.findData(pinned)))
+
+    def switch_model_version(self, index):
+        """Load the selected version in the background; Runs keep using the current one meanwhile"""
+        version = self.model_version_combo.itemData(index) or None
+        try:
+            if self.models.switch_version(version):
+                self.statusBar().showMessage(f"Loading model {version or 'active version'}...", 5000)
+        except ValueError as e:
+            QMessageBox.warning(self, "Model Version", str(e))
+        self.check_model()
 
     # ---------------- Actions UI ---------------- #
     def browse_file(self):
-        file_path, _ = QFileDialog.getOpenFileName(self, "Select Excel File", "", "Excel Files (*.xlsx *.xls)")
-        if file_path:
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "Select Excel Files", "", "Excel Files (*.xlsx *.xls)")
+        if file_paths:
+            file_path = "; ".join(file_paths)
             self.excel_path_input.setText(file_path)
+            self.models.prefetch()
+            # Report every problem of the sheet now rather than on the Run of a broken row
+            try:
+                _, report = self.load_workbook(file_path)
+            except (OSError, ValueError) as e:
+                QMessageBox.critical(self, "Error", f"Excel file could not be read:\n{e}")
+                return
+            if not report.ok:
+                QMessageBox.warning(self, "Excel File Errors", report.format(limit=20))
 
     def generate_test_case(self):
         excel_path = self.excel_path_input.text().strip()
@@ -340,49 +417,151 @@ class PrincipalWindow(QMainWindow):
         if not excel_path or not dtc_id:
             QMessageBox.warning(self, "Warning", "Select an Excel file and a DTC ID.")
             return
+        increment_text = self.read_increment()
+        if increment_text is None:
+            return
 
-        data = self.generate_test_case_for_dtc(dtc_id, excel_path)
-        if not data:
+        with span("run", dtc=dtc_id):
+            data = self.generate_test_case_for_dtc(dtc_id, excel_path, increment_text)
+            if not data:
+                return
+
+            # Add (or refresh) the DTC row and show its rendered test case
+            with span("table.update"):
+                row = self.result_model.upsert_result(data)
+                proxy_index = self.result_proxy.mapFromSource(self.result_model.index(row, 0))
+                if proxy_index.isValid():
+                    self.table.selectRow(proxy_index.row())
+                    self.table.scrollTo(proxy_index)
+            self.show_test_case(data)
+        if self.performance_panel is not None and self.performance_panel.isVisible():
+            self.performance_panel.refresh()
+
+        QMessageBox.information(
+            self, "Success",
+            f"Test case generated and displayed.\nEstimated bench time: {data['estimated_runtime']}"
+        )
+
+    def generate_all_test_cases(self):
+        """Generate every valid row of the workbooks in the background, batch by batch"""
+        if self.batch_results is not None:
+            # Second click: stop after the running batch
+            self.batch_stop.set()
+            self.run_all_btn.setEnabled(False)
+            return
+        excel_path = self.excel_path_input.text().strip()
+        if not excel_path:
+            QMessageBox.warning(self, "Warning", "Select an Excel file.")
+            return
+        increment_text = self.read_increment()
+        if increment_text is None:
+            return
+        try:
+            df, report = self.load_workbook(excel_path)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"Excel file could not be read:\n{e}")
+            return
+        if report.sheet_errors:
+            QMessageBox.critical(self, "Invalid Excel File", report.format())
+            return
+        invalid = report.invalid_index & set(df.index)
+        if invalid:
+            QMessageBox.warning(self, "Invalid DTC Rows",
+                                f"{len(invalid)} row(s) with errors are skipped:\n{report.format(limit=20)}")
+        df = df.drop(index=sorted(invalid))
+        if df.empty:
             return
 
-        # Dictionary list to string conversion
-        def dict_list_to_str(dict_list):
-            lines = []
-            for d in dict_list:
-                if isinstance(d, dict):
-                    line = ", ".join(f"{k}={v}" for k, v in d.items())
-                else:
-                    line = str(d)
-                lines.append(line)
-            return "\n".join(lines)
-
-        self.table.setRowCount(1)
-        self.table.setItem(0, 0, QTableWidgetItem(dtc_id))
-        coding_list = data.get("codding", [])
-        if coding_list:
-            coding_str = " and ".join(str(c).strip() for c in coding_list if str(c).strip())
-        else:
-            coding_str = ""
+        self.batch_results, self.batch_stop = queue.Queue(), threading.Event()
+        self.batch_total, self.batch_done = len(df), 0
+        self.run_btn.setEnabled(False)
+        self.run_all_btn.setText("Stop")
+        self.statusBar().showMessage(f"Generating {self.batch_total} DTCs...")
+        threading.Thread(
+            target=self._generate_batches,
+            args=(df, self.tester_name_input.text(), increment_text,
+                  self.batch_results, self.batch_stop),
+            daemon=True,
+        ).start()
+        self.batch_timer.start()
+
+    def _generate_batches(self, df, tester_name, increment_text, results, stop):
+        """Worker thread: feed the model GUI_BATCH_SIZE rows at a time, queue each batch of results.
+
+        The queue ends with None, or with the exception that stopped the generation.
+        """
+        try:
+            with self.models.use() as generator:
+                for start in range(0, len(df), GUI_BATCH_SIZE):
+                    if stop.is_set():
+                        break
+                    results.put(generator.generate_workbook(df.iloc[start:start + GUI_BATCH_SIZE],
+                                                            tester_name, increment_text))
+            results.put(None)
+        except Exception as e:
+            logger.exception("Workbook generation failed")
+            results.put(e)
+
+    def drain_batch_results(self):
+        """Timer slot: append the batches generated since the last tick in one insert"""
+        batch, end = [], False
+        while True:
+            try:
+                item = self.batch_results.get_nowait()
+            except queue.Empty:
+                break
+            if item is None or isinstance(item, Exception):
+                end = item if item is not None else True
+                break
+            batch += item
+        if batch:
+            with span("table.update", rows=len(batch)):
+                self.result_model.append_results(batch)
+            self.batch_done += len(batch)
+            self.statusBar().showMessage(f"Generated {self.batch_done} / {self.batch_total} DTCs...")
+        if end is False:
+            return
 
+        self.batch_timer.stop()
+        self.batch_results = self.batch_stop = None
+        self.run_btn.setEnabled(True)
+        self.run_all_btn.setEnabled(True)
+        self.run_all_btn.setText("Run All")
+        self.statusBar().clearMessage()
+        self.check_model()
+        if isinstance(end, Exception):
+            QMessageBox.critical(self, "Error", f"Generation stopped after {self.batch_done} DTCs:\n{end}")
+        else:
+            QMessageBox.information(self, "Success", f"{self.batch_done} of {self.batch_total} test cases generated.")
 
-        trigger_str = " or ".join(
-            f"{tc.get('variable','')} {tc.get('operator','')} {tc.get('value','')}"
-            for tc in data["trigger_conditions"]
-        )
-        self.table.setItem(0, 1, QTableWidgetItem(coding_str))
-        self.table.setItem(0, 2, QTableWidgetItem(trigger_str))
-        self.table.setItem(0, 3, QTableWidgetItem(str(data.get("Debounce", "1000"))))
+    def render_test_case(self, data):
+        """Render (once) and cache the Robot test case of a generated DTC"""
+        if "rendered" not in data:
+            template_data = {k: v for k, v in data.items() if k != "rendered"}
+            with span("render_template"):
+                data["rendered"] = render_test_case(template_data)
+        return data["rendered"]
 
+    def show_test_case(self, data):
         self.current_test_case_data = data
         self.download_btn.setEnabled(True)
-
-        # Render the test case template and display it in the QTextEdit
-        env = Environment(loader=FileSystemLoader("."))
-        template = env.get_template("dtc_test_template.robot.j2")
-        rendered_test_case = template.render(**data)
-        self.test_case_text.setPlainText(rendered_test_case)
-
-        QMessageBox.information(self, "Success", "Test case generated and displayed.")
+        rendered = self.render_test_case(data)
+        with span("text.update"):
+            self.test_case_text.setPlainText(rendered)
+
+    def show_performance(self):
+        """Open (or raise) the per-stage timing panel"""
+        if self.performance_panel is None:
+            self.performance_panel = PerformancePanel(self)
+        self.performance_panel.refresh()
+        self.performance_panel.show()
+        self.performance_panel.raise_()
+
+    def preview_result(self, proxy_index):
+        """Show the rendered test of the clicked DTC row"""
+        source_index = self.result_proxy.mapToSource(proxy_index)
+        if source_index.isValid():
+            self.show_test_case(self.result_model.result_at(source_index.row()))
 
     def download_test_case(self):
         if not self.current_test_case_data:
@@ -396,14 +575,44 @@ class PrincipalWindow(QMainWindow):
             "Robot Framework Files (*.robot)"
         )
         if save_path:
-            # Save the rendered content currently displayed in QTextEdit
-            rendered_test_case = self.test_case_text.toPlainText()
+            # Save the cached rendering (not a copy of the QTextEdit contents)
             with open(save_path, "w", encoding="utf-8") as f:
-                f.write(rendered_test_case)
-            QMessageBox.information(self, "Saved", f"Test case saved:\n{save_path}")
+                f.write(self.render_test_case(self.current_test_case_data))
+            # The test calls the shared DTC keywords, imported from the same folder
+            resource_path = write_keywords_resource(os.path.dirname(save_path) or ".")
+            QMessageBox.information(self, "Saved", f"Test case saved:\n{save_path}\n{resource_path}")
+
+    def export_all_test_cases(self):
+        """Stream every generated test case of the table into one zip/tar.gz archive"""
+        results = [self.result_model.result_at(row) for row in range(self.result_model.rowCount())]
+        if not results:
+            QMessageBox.warning(self, "Warning", "No generated test cases to export.")
+            return
+
+        save_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Export All Test Cases",
+            "dtc_tests.zip",
+            "Zip archives (*.zip);;Tar archives (*.tar.gz)"
+        )
+        if not save_path:
+            return
+        archive_format = "tar.gz" if save_path.endswith(".tar.gz") or selected_filter.startswith("Tar") else "zip"
+        suites = plan_suites([{k: v for k, v in data.items() if k != "rendered"} for data in results])
+        try:
+            with span("export.archive_all"):
+                archive_path, = write_suites_archive(suites, save_path, archive_format)
+        except OSError as e:
+            logger.exception("Archive export failed: %s", save_path)
+            QMessageBox.critical(self, "Error", f"Cannot write the archive:\n{e}")
+            return
+        QMessageBox.information(
+            self, "Exported", f"{len(suites)} test file(s) exported:\n{archive_path}"
+        )
 
 
 
     def set_user_data(self, user_data):
         self.user_data = user_data
-        print("User data set:", user_data)
+        user = (user_data or {}).get("user")
+        logger.debug("User data set for user %s", getattr(user, "id", None))
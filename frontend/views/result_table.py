@@ -0,0 +1,173 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QTimer
+from PyQt5.QtWidgets import QTableView, QHeaderView, QAbstractItemView
+
+# Roles used by the proxy model
+SORT_ROLE = Qt.UserRole + 1
+RESULT_ROLE = Qt.UserRole + 2
+
+
+def format_result_row(data):
+    """Build the display strings for one generated DTC (computed once per row)"""
+    coding_list = data.get("codding", [])
+    coding_str = " and ".join(str(c).strip() for c in coding_list if str(c).strip())
+    trigger_str = " or ".join(
+        f"{tc.get('variable','')} {tc.get('operator','')} {tc.get('value','')}"
+        for tc in data.get("trigger_conditions", [])
+    )
+    return [str(data.get("dtc_code", "")), coding_str, trigger_str, str(data.get("Debounce", "1000"))]
+
+
+class DtcResultTableModel(QAbstractTableModel):
+    """Table model holding generated DTC results; rows are appended incrementally"""
+
+    HEADERS = ["DTC ID", "Coding", "Trigger Conditions", "Debounce Time"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._results = []       # generated data dicts
+        self._display = []       # cached display strings per row
+        self._row_by_dtc = {}    # dtc_code -> row
+
+    # --- Qt model interface --- #
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._results)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self._display[row][column]
+        if role == SORT_ROLE:
+            if column == 3:
+                try:
+                    return float(self._display[row][column])
+                except ValueError:
+                    return 0.0
+            return self._display[row][column]
+        if role == RESULT_ROLE:
+            return self._results[row]
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignLeft | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    # --- Result management --- #
+    def append_results(self, results):
+        """Append a batch of results in a single insert (used while results stream in)"""
+        new_results = []
+        for data in results:
+            row = self._row_by_dtc.get(data.get("dtc_code"))
+            if row is not None:
+                self._replace_row(row, data)
+            else:
+                new_results.append(data)
+        if not new_results:
+            return
+
+        first = len(self._results)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_results) - 1)
+        for offset, data in enumerate(new_results):
+            self._results.append(data)
+            self._display.append(format_result_row(data))
+            self._row_by_dtc[data.get("dtc_code")] = first + offset
+        self.endInsertRows()
+
+    def upsert_result(self, data):
+        """Add one result, or replace the existing row for the same DTC"""
+        self.append_results([data])
+        return self._row_by_dtc[data.get("dtc_code")]
+
+    def _replace_row(self, row, data):
+        self._results[row] = data
+        self._display[row] = format_result_row(data)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+
+    def result_at(self, row):
+        return self._results[row]
+
+    def clear(self):
+        self.beginResetModel()
+        self._results.clear()
+        self._display.clear()
+        self._row_by_dtc.clear()
+        self.endResetModel()
+
+
+class DtcResultFilterProxyModel(QSortFilterProxyModel):
+    """Case-insensitive filter over every column, numeric sort on Debounce Time"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.setFilterKeyColumn(-1)
+        self.setSortRole(SORT_ROLE)
+        self.setDynamicSortFilter(True)
+
+
+class DtcResultTableView(QTableView):
+    """Table view that sizes row heights lazily, only for rows scrolled into view"""
+
+    DEFAULT_ROW_HEIGHT = 60
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._sized_rows = set()
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(50)
+        self._resize_timer.timeout.connect(self.resize_visible_rows)
+
+        self.setWordWrap(True)
+        self.setSortingEnabled(True)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        vertical_header = self.verticalHeader()
+        vertical_header.setVisible(False)
+        vertical_header.setSectionResizeMode(QHeaderView.Interactive)
+        vertical_header.setDefaultSectionSize(self.DEFAULT_ROW_HEIGHT)
+        vertical_header.setMinimumSectionSize(40)
+        self.verticalScrollBar().valueChanged.connect(self.schedule_row_resize)
+
+    def setModel(self, model):
+        super().setModel(model)
+        model.rowsInserted.connect(self.schedule_row_resize)
+        model.rowsRemoved.connect(self.reset_row_sizes)
+        model.layoutChanged.connect(self.reset_row_sizes)
+        model.modelReset.connect(self.reset_row_sizes)
+        model.dataChanged.connect(self.reset_row_sizes)
+
+    def reset_row_sizes(self, *args):
+        self._sized_rows.clear()
+        self.schedule_row_resize()
+
+    def schedule_row_resize(self, *args):
+        self._resize_timer.start()
+
+    def resize_visible_rows(self):
+        """Fit the height of the rows currently in the viewport (each row only once)"""
+        model = self.model()
+        if model is None or model.rowCount() == 0:
+            return
+        first = self.rowAt(0)
+        last = self.rowAt(self.viewport().height())
+        if first < 0:
+            first = 0
+        if last < 0:
+            last = model.rowCount() - 1
+        for row in range(first, last + 1):
+            if row not in self._sized_rows:
+                self.resizeRowToContents(row)
+                self._sized_rows.add(row)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.reset_row_sizes()
@@ -1,4 +1,5 @@
 import re
+import logging
 from dotenv import load_dotenv
 import os
 import smtplib
@@ -15,6 +16,7 @@ from PyQt5.QtCore import Qt, QPropertyAnimation, QEasingCurve
 from server.supabase_config import supabase_config
 
 base_dir = os.path.dirname(os.path.abspath(__file__))
+logger = logging.getLogger(__name__)
 load_dotenv()
 DEFAULT_ADMIN_EMAIL = os.getenv("GMAIL_USER")
 
@@ -273,14 +275,14 @@ class SignupWindow(QMainWindow):
         """Initialize Supabase client"""
         try:
             if not supabase_config.is_configured():
-                print("Supabase not configured - missing environment variables")
+                logger.warning("Supabase not configured - missing environment variables")
                 self.supabase = None
                 return
 
             self.supabase = supabase_config.get_client()
-            print("Supabase initialized successfully in SignupWindow")
+            logger.debug("Supabase initialized in SignupWindow")
         except Exception as e:
-            print(f"Error initializing Supabase in SignupWindow: {e}")
+            logger.error("Error initializing Supabase in SignupWindow: %s", e)
             self.supabase = None
 
     def show_terms_dialog(self):
@@ -364,7 +366,7 @@ class SignupWindow(QMainWindow):
             return
 
         try:
-            print(f"Sign-up attempt for: {email}")
+            logger.info("Sign-up attempt for: %s", email)
 
             response = self.supabase.auth.sign_up({
                 "email": email,
@@ -410,9 +412,7 @@ class SignupWindow(QMainWindow):
                 self.show_error("Error", "Unable to create your account. Please try again.")
 
         except Exception as e:
-            print("Error :", repr(e))
-            import traceback
-            print("Traceback:", traceback.format_exc())
+            logger.exception("Sign-up error")
 
             error_msg = str(e).lower()
 
@@ -448,16 +448,16 @@ class SignupWindow(QMainWindow):
                 'nom': lastname,
                 'status': 'pending_approval',
             }).execute()
-            print("User profile created in user_profiles")
+            logger.info("User profile created in user_profiles")
         except Exception as e:
-            print(f"Profile creation error {e}")
+            logger.error("Profile creation error: %s", e)
 
     def send_admin_notification(self, user_email, firstname, lastname, user_id):
         """Send email ONLY to admin"""
         try:
 
             if not os.getenv("GMAIL_USER") or not os.getenv("GMAIL_APP_PASSWORD"):
-                print("Missing SMTP variables in .env file")
+                logger.warning("Missing SMTP variables in .env file")
                 return False
 
             msg = MIMEMultipart()
@@ -503,11 +503,11 @@ class SignupWindow(QMainWindow):
                 server.login(os.getenv("GMAIL_USER"), os.getenv("GMAIL_APP_PASSWORD"))
                 server.sendmail(os.getenv("GMAIL_USER"), DEFAULT_ADMIN_EMAIL, msg.as_string())
 
-            print(f"Admin notification email sent successfully: ({DEFAULT_ADMIN_EMAIL})")
+            logger.info("Admin notification email sent (%s)", DEFAULT_ADMIN_EMAIL)
             return True
 
         except Exception as e:
-            print(f"Error sending admin email: {str(e)}")
+            logger.error("Error sending admin email: %s", e)
             return False
 
     def get_current_datetime(self):
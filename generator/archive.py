@@ -0,0 +1,115 @@
+import io
+import os
+import json
+import time
+import tarfile
+import zipfile
+from datetime import datetime
+
+from generator.export import KEYWORDS_RESOURCE, RESOURCE_PATH, render_keywords_resource, stream_suite
+from generator.tracing import span
+
+# === Configuration ===
+ARCHIVE_FORMATS = {"zip": ".zip", "tar": ".tar", "tar.gz": ".tar.gz"}
+MANIFEST_NAME = "manifest.json"
+
+
+class ArchiveWriter:
+    """Write files one after the other into a zip or tar archive.
+
+    The archive is built as <path>.part next to its final path and renamed over it
+    by close(), so readers (and an interrupted export) never see a partial archive.
+    On a network share this is one sequential file write instead of one create,
+    write and close per test case.
+    """
+
+    def __init__(self, path, archive_format="zip"):
+        if archive_format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unknown archive format {archive_format!r}, expected one of {', '.join(ARCHIVE_FORMATS)}")
+        self.path = path
+        self.archive_format = archive_format
+        self.temp_path = f"{path}.part"
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if archive_format == "zip":
+            self._archive = zipfile.ZipFile(self.temp_path, "w", compression=zipfile.ZIP_DEFLATED)
+        else:
+            self._archive = tarfile.open(self.temp_path, "w:gz" if archive_format == "tar.gz" else "w")
+
+    def write(self, name, chunks):
+        """Add one file; chunks is a str or an iterable of str (e.g. stream_suite)"""
+        if isinstance(chunks, str):
+            chunks = [chunks]
+        if self.archive_format == "zip":
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with self._archive.open(info, "w") as f:
+                for chunk in chunks:
+                    f.write(chunk.encode("utf-8"))
+        else:
+            # tar needs the size up front: one test case is a few KB
+            data = "".join(chunks).encode("utf-8")
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self._archive.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        self._archive.close()
+        os.replace(self.temp_path, self.path)
+
+    def abort(self):
+        self._archive.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def suites_manifest(suites, names):
+    """Manifest of an exported archive: one entry per test file with its DTCs and estimates"""
+    tests = []
+    for name, (_, suite, is_group) in zip(names, suites):
+        members = suite["dtcs"] if is_group else [suite]
+        tests.append({
+            "file": name,
+            "dtcs": [data["dtc_code"] for data in members],
+            "ECU": suite["ECU"],
+            "Bus": suite["Bus"],
+            "estimated_runtime_ms": suite["estimated_runtime_ms"],
+            "sources": [data["source"] for data in members if data.get("source")],
+        })
+    return {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "test_count": len(tests),
+        "estimated_runtime_ms": sum(test["estimated_runtime_ms"] for test in tests),
+        "tests": tests,
+    }
+
+
+def write_suites_archive(suites, output_dir, archive_format="zip", prefix_order=False, **options):
+    """Stream the planned suites into output_dir + .zip/.tar/.tar.gz, with a manifest.json.
+
+    Same arguments as write_suites, so it can be given as writer to write_shards
+    (one archive per shard). Each test is rendered straight into the archive.
+    Returns [archive path].
+    """
+    suffix = ARCHIVE_FORMATS[archive_format]
+    path = output_dir if output_dir.endswith(suffix) else os.path.normpath(output_dir) + suffix
+    names = []
+    with ArchiveWriter(path, archive_format) as archive:
+        for position, (filename, suite, is_group) in enumerate(suites, start=1):
+            if prefix_order:
+                filename = f"{position:03d}__{filename}"
+            with span("export.archive"):
+                archive.write(filename, stream_suite(suite, is_group, **options))
+            names.append(filename)
+        archive.write(KEYWORDS_RESOURCE, render_keywords_resource(options.get("resource_path", RESOURCE_PATH)))
+        archive.write(MANIFEST_NAME, json.dumps(suites_manifest(suites, names), indent=2, default=str))
+    return [path]
@@ -0,0 +1,86 @@
+# === System Imports and Path Setup ===
+import sys
+import time
+import argparse
+from operator import eq
+from pathlib import Path
+
+# Add parent directory to sys.path (before local imports)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pandas as pd
+
+from generator.pipeline import DECODING_MODES, MODEL_DIR, parse_model_output
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the speed and output of the T5 decoding modes")
+    parser.add_argument("workbook", help="Workbook with an Implementation column (DTC workbook or training set)")
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    parser.add_argument("--limit", type=int, default=50, help="Number of rows to decode")
+    parser.add_argument("--modes", nargs="+", choices=DECODING_MODES, default=list(DECODING_MODES))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    from generator.pipeline import DtcTestGenerator
+
+    df = pd.read_excel(args.workbook).head(args.limit)
+    texts = df["Implementation"].astype(str).tolist()
+    # Training sets carry the expected output: compare the parsed result against it
+    expected = (
+        [parse_model_output(str(target)) for target in df["Readable_Output"]]
+        if "Readable_Output" in df.columns else None
+    )
+    generator = DtcTestGenerator(args.model_dir)
+    generator.generate_rule_output_raw(texts[0], "greedy")  # warm-up
+
+    outputs, seconds, stats = {}, {}, {"steps": 0, "drafted": 0, "accepted": 0, "tokens": 0}
+    for mode in args.modes:
+        start = time.perf_counter()
+        decoded = []
+        for text in texts:
+            row_stats = {}
+            ids = generator.generate_rule_output_ids(text, mode, stats=row_stats)
+            decoded.append(generator.tokenizer.decode(ids[0], skip_special_tokens=True))
+            if mode == "prompt_lookup":
+                for key in ("steps", "drafted", "accepted"):
+                    stats[key] += row_stats[key]
+                stats["tokens"] += ids.shape[1] - 1
+        seconds[mode] = time.perf_counter() - start
+        outputs[mode] = decoded
+
+    reference = args.modes[0]
+    print(f"{len(texts)} rows, reference mode: {reference}")
+    for mode in args.modes:
+        same_text = sum(a == b for a, b in zip(outputs[mode], outputs[reference]))
+        same_parse = sum(
+            parse_model_output(a) == parse_model_output(b) for a, b in zip(outputs[mode], outputs[reference])
+        )
+        # Parseable: at least one trigger condition, each with its hex code
+        parseable = sum(
+            bool(triggers) and all(cond["hex_code"] for cond in triggers)
+            for _, triggers in map(parse_model_output, outputs[mode])
+        )
+        print(
+            f"{mode:>14}: {1000 * seconds[mode] / len(texts):7.1f} ms/row, "
+            f"x{seconds[reference] / seconds[mode]:.2f} vs {reference}, "
+            f"identical output {same_text}/{len(texts)}, identical parse {same_parse}/{len(texts)}, "
+            f"parseable {parseable}/{len(texts)}"
+            + (f", correct {sum(map(eq, map(parse_model_output, outputs[mode]), expected))}/{len(texts)}"
+               if expected else "")
+        )
+    if "greedy" in outputs and "prompt_lookup" in outputs:
+        same = sum(a == b for a, b in zip(outputs["greedy"], outputs["prompt_lookup"]))
+        print(f"prompt_lookup vs greedy: identical output {same}/{len(texts)}")
+    if stats["steps"]:
+        print(
+            f"prompt_lookup: {stats['tokens'] / stats['steps']:.2f} tokens per decoder pass, "
+            f"{stats['accepted']}/{stats['drafted']} drafted tokens accepted"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import os
+
+import numpy as np
+
+# === Configuration ===
+# Seed of the random error/normal margins (unset: different values on every run)
+VALUE_SEED = int(os.environ["KPIT_VALUE_SEED"]) if os.getenv("KPIT_VALUE_SEED") else None
+# Distance of the just inside/outside values from a threshold when the signal resolution is unknown
+# (values are then not snapped to any grid)
+DEFAULT_RESOLUTION = float(os.getenv("KPIT_VALUE_RESOLUTION", "0.1"))
+# Without an increment, error/normal values are 1 to MARGIN_RATIO * |threshold| away from it
+MARGIN_RATIO = 0.5
+OPERATOR_CODES = {">": 0, ">=": 1, "<": 2, "<=": 3, "==": 4, "!=": 5}
+GT, GE, LT, LE, EQ, NE = range(6)
+# Tolerance (in grid steps) when deciding whether a threshold lies on the value grid
+GRID_EPS = 1e-9
+
+
+def _signal_arrays(conditions, signals):
+    """factor, offset, minimum, maximum arrays of the conditions (factor NaN when unknown).
+
+    A condition resolved by generator/signals.py carries the record of its bus as
+    cond["signal"]; other conditions are looked up by name in signals.
+    """
+    count = len(conditions)
+    factor = np.full(count, np.nan)
+    offset = np.zeros(count)
+    minimum = np.full(count, -np.inf)
+    maximum = np.full(count, np.inf)
+    for i, cond in enumerate(conditions):
+        signal = cond.get("signal") or (signals or {}).get(cond.get("variable"))
+        if not signal:
+            continue
+        if signal.get("factor"):
+            factor[i] = abs(float(signal["factor"]))
+        if signal.get("offset") is not None:
+            offset[i] = float(signal["offset"])
+        if signal.get("minimum") is not None:
+            minimum[i] = float(signal["minimum"])
+        if signal.get("maximum") is not None:
+            maximum[i] = float(signal["maximum"])
+    # DBC files often leave both limits at 0 for "no range"
+    unbounded = minimum >= maximum
+    minimum[unbounded], maximum[unbounded] = -np.inf, np.inf
+    return factor, offset, minimum, maximum
+
+
+def boundary_values(thresholds, operators, steps=None, factor=None, offset=None,
+                    minimum=None, maximum=None, rng=None):
+    """Error, normal and boundary values of many conditions at once (NumPy arrays).
+
+    thresholds: float array; operators: codes of OPERATOR_CODES; steps: distance of
+    the error/normal values from the threshold (None: random margin, see MARGIN_RATIO).
+    Where the factor of a signal is known, values lie on its grid offset + k * factor;
+    elsewhere (factor NaN or None) they are not snapped and the closest values are
+    DEFAULT_RESOLUTION away from the threshold. The error value of == and the normal
+    value of != are always the threshold itself. Values are clipped to [minimum,
+    maximum]. Returns a dict of arrays:
+
+    - error / normal: values set to trigger / heal the DTC
+    - inside: closest value meeting the condition, outside: closest value not meeting it
+    - extreme: farthest value meeting it within the range (NaN when the range is unknown)
+    - reachable: False when no value of the range meets the condition
+    """
+    t = np.asarray(thresholds, dtype=float)
+    op = np.asarray(operators, dtype=np.int8)
+    count = len(t)
+    factor = np.full(count, np.nan) if factor is None else np.asarray(factor, dtype=float)
+    offset = np.zeros(count) if offset is None else np.asarray(offset, dtype=float)
+    minimum = np.full(count, -np.inf) if minimum is None else np.asarray(minimum, dtype=float)
+    maximum = np.full(count, np.inf) if maximum is None else np.asarray(maximum, dtype=float)
+    if steps is None:
+        rng = rng if rng is not None else np.random.default_rng(VALUE_SEED)
+        # One decimal, as the values typed in the workbooks
+        steps = np.round(rng.uniform(1.0, np.maximum(1.0, MARGIN_RATIO * np.abs(t))), 1)
+    steps = np.broadcast_to(np.abs(np.asarray(steps, dtype=float)), t.shape)
+
+    known = np.isfinite(factor) & (factor > 0)
+    grid_factor = np.where(known, factor, 1.0)
+
+    def grid(k):
+        return np.round(offset + k * grid_factor, 9)
+
+    def position(values):
+        with np.errstate(invalid="ignore"):
+            return (values - offset) / grid_factor
+
+    def up(values):
+        """Smallest grid value >= values (values themselves without grid)"""
+        return np.where(known, grid(np.ceil(position(values) - GRID_EPS)), np.round(values, 9))
+
+    def down(values):
+        """Largest grid value <= values (values themselves without grid)"""
+        return np.where(known, grid(np.floor(position(values) + GRID_EPS)), np.round(values, 9))
+
+    k = position(t)
+    exact = np.round(t, 9)
+    on_or_above = up(t)
+    on_or_below = down(t)
+    above = np.where(known, grid(np.floor(k + GRID_EPS) + 1), np.round(t + DEFAULT_RESOLUTION, 9))
+    below = np.where(known, grid(np.ceil(k - GRID_EPS) - 1), np.round(t - DEFAULT_RESOLUTION, 9))
+    far_above = up(t + steps)
+    far_below = down(t - steps)
+
+    # ==/!= move away from the threshold upwards, unless that leaves the range
+    upwards = ((op != EQ) & (op != NE)) | (t + steps <= maximum)
+
+    inside = np.select(
+        [op == GT, op == GE, op == LT, op == LE, op == EQ],
+        [above, on_or_above, below, on_or_below, exact],
+        np.where(upwards, above, below),
+    )
+    outside = np.select(
+        [op == GT, op == GE, op == LT, op == LE, op == NE],
+        [on_or_below, below, on_or_above, above, exact],
+        np.where(upwards, above, below),
+    )
+    error_above = (op == GT) | (op == GE) | ((op == NE) & upwards)
+    error_below = (op == LT) | (op == LE) | ((op == NE) & ~upwards)
+    error = np.select(
+        [error_above, error_below],
+        [np.maximum(far_above, inside), np.minimum(far_below, inside)],
+        inside,
+    )
+    normal_above = (op == LT) | (op == LE) | ((op == EQ) & upwards)
+    normal_below = (op == GT) | (op == GE) | ((op == EQ) & ~upwards)
+    normal = np.select(
+        [normal_above, normal_below],
+        [np.maximum(far_above, outside), np.minimum(far_below, outside)],
+        outside,
+    )
+
+    # Farthest triggering value: the range limit (on the grid when known)
+    top = down(maximum)
+    bottom = up(minimum)
+    ne_extreme = np.where(np.abs(top - t) >= np.abs(t - bottom), top, bottom)
+    extreme = np.select(
+        [(op == GT) | (op == GE), (op == LT) | (op == LE), op == EQ],
+        [top, bottom, inside],
+        ne_extreme,
+    )
+    extreme[~np.isfinite(extreme)] = np.nan
+
+    reachable = (inside >= minimum) & (inside <= maximum)
+    return {
+        "error": np.clip(error, minimum, maximum),
+        "normal": np.clip(normal, minimum, maximum),
+        "inside": inside,
+        "outside": outside,
+        "extreme": extreme,
+        "reachable": reachable,
+    }
+
+
+def _number(value):
+    return None if np.isnan(value) else float(value)
+
+
+def assign_boundary_values(condition_lists, increment_text="", signals=None, rng=None):
+    """Set error_value, normal_value and boundary on every condition of several DTCs (in place).
+
+    condition_lists: the trigger_conditions of each DTC (e.g. all rows of a workbook),
+    computed as one batch. The range of a condition is its "signal" (set by
+    generator/signals.resolve_signals), else signals[variable] (name -> {"factor",
+    "offset", "minimum", "maximum"}), otherwise there is no grid and no limit.
+    increment_text: fixed distance of the error/normal values from the threshold.
+    Conditions whose value is not a number are left untouched. Returns the number
+    of conditions that no value of the signal range can trigger.
+    """
+    conditions, thresholds, operators = [], [], []
+    for trigger_conditions in condition_lists:
+        for cond in trigger_conditions:
+            try:
+                threshold = float(cond.get("value", ""))
+            except (ValueError, TypeError):
+                continue
+            conditions.append(cond)
+            thresholds.append(threshold)
+            operators.append(OPERATOR_CODES.get(cond.get("operator", "<"), LT))
+    if not conditions:
+        return 0
+
+    factor, offset, minimum, maximum = _signal_arrays(conditions, signals)
+    steps = float(increment_text) if str(increment_text or "").strip() else None
+    values = boundary_values(thresholds, operators, steps, factor, offset, minimum, maximum, rng)
+
+    in_range = (values["outside"] >= minimum) & (values["outside"] <= maximum)
+    columns = zip(values["error"].tolist(), values["normal"].tolist(), values["inside"].tolist(),
+                  values["outside"].tolist(), values["extreme"].tolist(), values["reachable"].tolist(),
+                  in_range.tolist())
+    for cond, (error, normal, inside, outside, extreme, reachable, outside_ok) in zip(conditions, columns):
+        cond["error_value"] = error
+        cond["normal_value"] = normal
+        cond["boundary"] = {
+            "inside": inside if reachable else None,
+            "outside": outside if outside_ok else None,
+            "extreme": _number(extreme) if reachable else None,
+        }
+    return int((~values["reachable"]).sum())
@@ -0,0 +1,171 @@
+# === System Imports and Path Setup ===
+import sys
+import argparse
+from pathlib import Path
+
+# Add parent directory to sys.path (before local imports)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from generator.pipeline import DECODING, DECODING_MODES
+from generator.timing import format_duration
+from generator.tracing import span, tracer
+from generator.ingest import INGEST_WORKERS, load_dtc_index
+from generator.archive import ARCHIVE_FORMATS
+from generator.boundary import VALUE_SEED
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate Robot Framework DTC test cases from a DTC workbook")
+    parser.add_argument("workbooks", nargs="+", metavar="workbook",
+                        help="DTC Excel workbooks (.xlsx/.xls) or directories of workbooks")
+    parser.add_argument("--sheet", action="append", dest="sheets",
+                        help="Only read these sheets (repeatable; default: every sheet with DTC columns)")
+    parser.add_argument("--workers", type=int, default=INGEST_WORKERS,
+                        help="Processes parsing the sheets in parallel (default: KPIT_INGEST_WORKERS, else one per CPU)")
+    parser.add_argument("-o", "--output-dir", default="generated_tests", help="Directory for the .robot files")
+    parser.add_argument("--dtc", action="append", help="Only generate these DTC IDs (repeatable)")
+    parser.add_argument("--tester", default="", help="Tester name written in the suite metadata")
+    parser.add_argument("--increment", default="", help="Fixed increment for error/normal values")
+    parser.add_argument("--signals", action="append",
+                        help="DBC/LDF file or directory resolving the trigger signals (repeatable; default: KPIT_SIGNAL_DB)")
+    parser.add_argument("--seed", type=int, default=VALUE_SEED,
+                        help="Seed of the random error/normal margins, for reproducible values (default: KPIT_VALUE_SEED)")
+    parser.add_argument("--model-version",
+                        help="Model version of the registry (default: the active one, else t5_model)")
+    parser.add_argument("--decoding", choices=DECODING_MODES, default=DECODING,
+                        help="Model decoding mode (default: KPIT_DECODING, else beam)")
+    parser.add_argument("--merge-triggers", action="store_true",
+                        help="Merge DTCs sharing trigger conditions into combined test sequences (--format files)")
+    parser.add_argument("--max-group-size", type=int, default=None,
+                        help="Maximum number of DTCs per merged sequence")
+    parser.add_argument("--shards", type=int, default=None,
+                        help="Split the suites into N runtime-balanced shard directories (one per HiL bench)")
+    parser.add_argument("--order-by-bench-state", action="store_true",
+                        help="Run suites grouped by ECU, BUS and precondition state (PWF and Voltage columns) "
+                             "to skip redundant transitions")
+    parser.add_argument("--hoist-setup", action="store_true",
+                        help="With --order-by-bench-state, run the bench precondition once per state in Suite Setup")
+    parser.add_argument("--format", choices=["files", "data-driven"], default="files",
+                        help="files: one .robot file per test; data-driven: one Test Template suite "
+                             "with a row per DTC plus a shared keyword resource")
+    parser.add_argument("--archive", choices=list(ARCHIVE_FORMATS), default=None,
+                        help="Stream the tests and a manifest.json into OUTPUT_DIR.zip/.tar/.tar.gz "
+                             "(one archive per shard) instead of one file each (--format files)")
+    parser.add_argument("--skip-invalid", action="store_true",
+                        help="Generate the valid rows when the workbook has row errors (default: stop)")
+    parser.add_argument("--trace", metavar="FILE", default=None,
+                        help="Print per-stage timings and write a Chrome trace (chrome://tracing, Perfetto) to FILE")
+    args = parser.parse_args(argv)
+    if args.hoist_setup and not args.order_by_bench_state:
+        parser.error("--hoist-setup runs the precondition once per bench state: it needs --order-by-bench-state")
+    if args.archive and (args.format != "files" or args.hoist_setup):
+        parser.error("--archive holds one file per test: not available with --format data-driven or --hoist-setup")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    from generator.pipeline import DtcTestGenerator
+    from generator.export import plan_suites, write_suites
+
+    # Every sheet is read and validated before the model is loaded: a bad row would
+    # otherwise only crash after hours of inference
+    with span("excel.read"):
+        df, report = load_dtc_index(args.workbooks, args.sheets, args.workers)
+    print(f"{len(df)} DTCs in {len(df[['Source', 'Sheet']].drop_duplicates())} sheet(s) "
+          f"of {df['Source'].nunique()} workbook(s)")
+    if report.errors or report.warnings:
+        print(report.format(), file=sys.stderr)
+    if report.sheet_errors:
+        sys.exit("The workbook cannot be used, fix the errors above")
+    if args.dtc:
+        df = df[df["DTC"].isin(args.dtc)]
+    invalid = report.invalid_index & set(df.index)
+    if invalid and not args.skip_invalid:
+        sys.exit(f"{len(invalid)} row(s) with errors, fix them or pass --skip-invalid")
+    df = df.drop(index=sorted(invalid))
+    print(f"Generating {len(df)} DTC test cases...")
+
+    signals = None
+    if args.signals:
+        from generator.signals import load_signal_index
+
+        signals = load_signal_index(args.signals)
+        print(f"{len(signals)} signals in the signal database")
+    from generator.registry import ModelRegistry
+
+    try:
+        model_dir, version = ModelRegistry().resolve(args.model_version)
+    except ValueError as e:
+        sys.exit(str(e))
+    if version:
+        print(f"Model version {version}")
+    generator = DtcTestGenerator(model_dir, decoding=args.decoding, signals=signals, seed=args.seed,
+                                 version=version)
+    data_list = list(generator.generate_workbook(df, args.tester, args.increment))
+
+    # A Test Template row checks a single DTC, merged sequences only exist as files
+    merge_triggers = args.merge_triggers and args.format == "files"
+    naive_ms = sum(data["estimated_runtime_ms"] for data in data_list)
+    suites = plan_suites(data_list, merge_triggers, args.max_group_size)
+    planned_ms = sum(suite["estimated_runtime_ms"] for _, suite, _ in suites)
+
+    if args.order_by_bench_state:
+        from generator.ordering import (
+            estimate_ordering, format_ordering_report, order_by_bench_state, write_bench_ordered,
+        )
+
+    if args.format == "data-driven":
+        from generator.export import write_data_driven_suite
+
+        def writer(planned, output_dir):
+            if args.order_by_bench_state:
+                planned = order_by_bench_state(planned)
+            return write_data_driven_suite(planned, output_dir, hoist_setup=args.hoist_setup)
+    elif args.archive:
+        from generator.archive import write_suites_archive
+
+        def writer(planned, output_dir):
+            if args.order_by_bench_state:
+                planned = order_by_bench_state(planned)
+            return write_suites_archive(planned, output_dir, args.archive, prefix_order=args.order_by_bench_state)
+    elif args.order_by_bench_state:
+        from functools import partial
+
+        writer = partial(write_bench_ordered, hoist_setup=args.hoist_setup)
+    else:
+        writer = write_suites
+
+    if args.shards:
+        from generator.sharding import shard_suites, write_shards, format_shard_report
+
+        shards = shard_suites(suites, args.shards)
+        paths = write_shards(shards, args.output_dir, writer=writer)
+        print(format_shard_report(shards))
+        if args.order_by_bench_state:
+            for shard in shards:
+                estimate = estimate_ordering(shard["suites"], args.hoist_setup)
+                print(f"shard_{shard['index']:02d}: {format_ordering_report(estimate, args.hoist_setup)}")
+    else:
+        paths = writer(suites, args.output_dir)
+        if args.order_by_bench_state:
+            print(format_ordering_report(estimate_ordering(suites, args.hoist_setup), args.hoist_setup))
+    if args.archive:
+        print(f"{len(suites)} test files streamed into {', '.join(paths)}")
+    else:
+        print(f"{len(paths)} files written to {args.output_dir}")
+    if merge_triggers:
+        merged = sum(1 for _, _, is_group in suites if is_group)
+        print(f"{merged} merged sequences, estimated bench time "
+              f"{format_duration(planned_ms)} instead of {format_duration(naive_ms)}")
+    else:
+        print(f"Estimated bench time: {format_duration(naive_ms)}")
+
+    if args.trace:
+        print(tracer.format_summary())
+        print(f"Trace written to {tracer.write_chrome_trace(args.trace)}")
+
+
+if __name__ == "__main__":
+    main()
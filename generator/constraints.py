@@ -0,0 +1,147 @@
+import re
+
+import torch
+from transformers import LogitsProcessor
+
+from generator.pipeline import TRIGGER_OPERATORS
+
+# === Configuration ===
+# Candidates checked per beam and step, from the most likely one down
+CONSTRAINT_TOP_K = 40
+SECTION_WORDS = {"coding": ("CODDING:",), "triggers": ("TRIGGERS:", "IF:")}
+ARROW_WORDS = ("→", "->")
+
+NUMBER_PATTERN = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?!x)")
+HEX_PATTERN = re.compile(r"0x[0-9A-Fa-f]+")
+IDENTIFIER_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+WORD_PATTERN = re.compile(r"[^\s\[\](),;&|]+")
+
+
+# === Output Grammar ===
+class OutputGrammar:
+    """Word-level grammar of the model output, with the words drawn from one input text:
+
+        CODDING: (IDENT OP VALUE)* TRIGGERS:|IF: (IDENT OP NUMBER [→] HEX)+
+
+    IDENT, VALUE, NUMBER and HEX are limited to the identifiers, words, numbers and hex
+    literals of the Implementation text, OP to TRIGGER_OPERATORS. Each state maps the
+    words it accepts to the next state; "end" is the only state where generation may stop.
+    """
+
+    def __init__(self, input_text):
+        identifiers = set(IDENTIFIER_PATTERN.findall(input_text))
+        values = set(WORD_PATTERN.findall(input_text)) - set(TRIGGER_OPERATORS)
+        numbers = set(NUMBER_PATTERN.findall(input_text))
+        hexes = set(HEX_PATTERN.findall(input_text))
+        operators = set(TRIGGER_OPERATORS)
+
+        coding_entry = dict.fromkeys(identifiers, "coding_op")
+        coding_entry.update(dict.fromkeys(SECTION_WORDS["triggers"], "trigger_ident"))
+        trigger_entry = dict.fromkeys(identifiers, "trigger_op")
+
+        self.transitions = {
+            "start": dict.fromkeys(SECTION_WORDS["coding"], "coding_ident"),
+            "coding_ident": coding_entry,
+            "coding_op": dict.fromkeys(operators, "coding_value"),
+            "coding_value": dict.fromkeys(values, "coding_ident"),
+            "trigger_ident": trigger_entry,
+            "trigger_op": dict.fromkeys(operators, "trigger_number"),
+            "trigger_number": dict.fromkeys(numbers, "trigger_hex"),
+            "trigger_hex": dict(dict.fromkeys(ARROW_WORDS, "trigger_hex_after_arrow"), **dict.fromkeys(hexes, "end")),
+            "trigger_hex_after_arrow": dict.fromkeys(hexes, "end"),
+            "end": trigger_entry,
+        }
+        self.prefixes = {
+            state: {word[:i] for word in words for i in range(1, len(word) + 1)}
+            for state, words in self.transitions.items()
+        }
+
+    def advance(self, state, partial, text):
+        """Feed text to (state, partial word); returns the new pair or None if text is invalid"""
+        for char in text:
+            if char.isspace():
+                if partial:
+                    state = self.transitions[state].get(partial)
+                    if state is None:
+                        return None
+                    partial = ""
+            else:
+                partial += char
+                if partial not in self.prefixes[state]:
+                    return None
+        return state, partial
+
+    def can_end(self, state, partial):
+        if partial:
+            state = self.transitions[state].get(partial)
+        return state == "end"
+
+
+def token_surfaces(tokenizer):
+    """Text each token adds to the output (None: special tokens, never generated under the grammar)"""
+    special_ids = set(tokenizer.all_special_ids)
+    # Added domain tokens (mine_vocabulary.py) carry no "▁" but are decoded as separate words
+    added_ids = set(tokenizer.added_tokens_decoder)
+    pieces = tokenizer.convert_ids_to_tokens(list(range(len(tokenizer))))
+    return [
+        None if token_id in special_ids
+        else " " + piece if token_id in added_ids
+        else piece.replace("▁", " ")
+        for token_id, piece in enumerate(pieces)
+    ]
+
+
+class GrammarLogitsProcessor(LogitsProcessor):
+    """Mask every token that would leave the OutputGrammar of the input text.
+
+    Only the CONSTRAINT_TOP_K most likely tokens of each beam are checked; the whole
+    vocabulary is scanned when none of them fits. The end-of-sequence token is allowed
+    once a complete trigger has been generated. The grammar state of each beam is kept
+    from the previous step and advanced by the last token only.
+    """
+
+    def __init__(self, tokenizer, input_text, top_k=CONSTRAINT_TOP_K, surfaces=None):
+        self.grammar = OutputGrammar(input_text)
+        self.top_k = top_k
+        self.eos_token_id = tokenizer.eos_token_id
+        self.surfaces = surfaces if surfaces is not None else token_surfaces(tokenizer)
+        # Grammar state of the beams of the previous step, by token ids (beams are reordered between steps)
+        self.states = {}
+
+    def _surface(self, token_id):
+        return (self.surfaces[token_id] if token_id < len(self.surfaces) else None) or ""
+
+    def _state(self, token_ids):
+        parent = tuple(token_ids[:-1])
+        if parent in self.states:
+            state = self.states[parent]
+            return state and self.grammar.advance(*state, self._surface(token_ids[-1]))
+        # First step, or a beam not seen at the previous step: parse the whole prefix
+        return self.grammar.advance("start", "", "".join(self._surface(token_id) for token_id in token_ids))
+
+    def _allowed(self, prefix_state, token_id):
+        if token_id == self.eos_token_id:
+            return self.grammar.can_end(*prefix_state)
+        surface = self.surfaces[token_id] if token_id < len(self.surfaces) else None
+        return surface is not None and self.grammar.advance(*prefix_state, surface) is not None
+
+    def __call__(self, input_ids, scores):
+        mask = torch.full_like(scores, float("-inf"))
+        states = {}
+        for row, token_ids in enumerate(input_ids.tolist()):
+            prefix_state = self._state(token_ids)
+            states[tuple(token_ids)] = prefix_state
+            if prefix_state is None:
+                # Beam already outside the grammar (cannot happen once constrained from the start)
+                mask[row] = 0
+                continue
+            candidates = torch.topk(scores[row], min(self.top_k, scores.shape[-1])).indices.tolist()
+            allowed = [token_id for token_id in candidates if self._allowed(prefix_state, token_id)]
+            if not allowed:
+                ranked = torch.argsort(scores[row], descending=True).tolist()
+                allowed = next(([token_id] for token_id in ranked if self._allowed(prefix_state, token_id)), [])
+            if not allowed:
+                allowed = [self.eos_token_id]
+            mask[row, allowed] = 0
+        self.states = states
+        return scores + mask
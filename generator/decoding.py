@@ -0,0 +1,96 @@
+import torch
+
+# === Configuration ===
+# Tokens copied from the input per draft, and longest output suffix looked up in the input
+PROMPT_LOOKUP_NUM_TOKENS = 10
+PROMPT_LOOKUP_MAX_NGRAM = 3
+
+
+# === Prompt Lookup Decoding ===
+def find_draft(prompt_ids, output_ids, num_tokens=PROMPT_LOOKUP_NUM_TOKENS, max_ngram_size=PROMPT_LOOKUP_MAX_NGRAM):
+    """Return the input tokens that followed the last occurrence of the output suffix.
+
+    The longest suffix (max_ngram_size tokens down to 1) found in the input wins.
+    The model copies signal names, thresholds and hex IDs from the Implementation text,
+    so the continuation in the input is a good guess of what it generates next.
+    """
+    for size in range(min(max_ngram_size, len(output_ids)), 0, -1):
+        ngram = output_ids[-size:]
+        for start in range(len(prompt_ids) - size - 1, -1, -1):
+            if prompt_ids[start:start + size] == ngram:
+                return prompt_ids[start + size:start + size + num_tokens]
+    return []
+
+
+def crop_cache(past_key_values, length):
+    """Drop the decoder self-attention cache entries after `length` tokens"""
+    if hasattr(past_key_values, "crop"):
+        past_key_values.crop(length)
+        return past_key_values
+    # Legacy tuple cache: (self_k, self_v, cross_k, cross_v) per layer
+    return tuple(
+        tuple(t[:, :, :length] if i < 2 else t for i, t in enumerate(layer))
+        for layer in past_key_values
+    )
+
+
+@torch.no_grad()
+def prompt_lookup_generate(model, input_ids, attention_mask=None, max_new_tokens=256,
+                           num_draft_tokens=PROMPT_LOOKUP_NUM_TOKENS,
+                           max_ngram_size=PROMPT_LOOKUP_MAX_NGRAM, stats=None):
+    """Greedy decoding of an encoder-decoder model with drafts copied from the input.
+
+    Each step feeds the pending token plus a draft found by find_draft; the decoder
+    scores them in a single pass and the draft is kept up to the first token that
+    differs from the model's own argmax, followed by that argmax. The result is the
+    same as greedy decoding, in fewer decoder passes when the output copies the input.
+
+    Works on a single sequence. Returns the output ids (decoder start token first) as
+    a [1, n] tensor like model.generate. stats, when given, receives the number of
+    decoder passes and drafted/accepted tokens.
+    """
+    config = model.config
+    eos_token_id = config.eos_token_id
+    encoder_outputs = model.get_encoder()(input_ids=input_ids, attention_mask=attention_mask)
+
+    prompt = input_ids[0].tolist()
+    output = [config.decoder_start_token_id]
+    cached = 0  # number of output tokens held by the decoder cache
+    past_key_values = None
+    counters = {"steps": 0, "drafted": 0, "accepted": 0}
+
+    while len(output) - 1 < max_new_tokens:
+        # Keep room for the token the model adds after the draft
+        remaining = max_new_tokens - (len(output) - 1)
+        draft = find_draft(prompt, output, num_draft_tokens, max_ngram_size)[:remaining - 1]
+
+        pending = output[cached:]
+        outputs = model(
+            encoder_outputs=encoder_outputs,
+            attention_mask=attention_mask,
+            decoder_input_ids=torch.tensor([pending + draft], device=input_ids.device),
+            past_key_values=past_key_values,
+            use_cache=True,
+        )
+        predicted = outputs.logits[0, len(pending) - 1:].argmax(-1).tolist()
+
+        accepted = 0
+        while accepted < len(draft) and draft[accepted] == predicted[accepted]:
+            accepted += 1
+        new_tokens = draft[:accepted] + [predicted[accepted]]
+
+        counters["steps"] += 1
+        counters["drafted"] += len(draft)
+        counters["accepted"] += accepted
+
+        if eos_token_id in new_tokens:
+            output += new_tokens[:new_tokens.index(eos_token_id) + 1]
+            break
+        output += new_tokens
+        # The cache holds the whole draft; only the accepted part stays valid
+        cached = len(output) - 1
+        past_key_values = crop_cache(outputs.past_key_values, cached)
+
+    if stats is not None:
+        stats.update(counters)
+    return torch.tensor([output], device=input_ids.device)
@@ -0,0 +1,186 @@
+import os
+import re
+from pathlib import Path
+from functools import lru_cache
+
+from jinja2 import Environment, FileSystemLoader
+
+from generator.grouping import merge_trigger_groups
+from generator.timing import format_duration
+from generator.tracing import span
+from generator.validation import DEFAULT_PWF, DEFAULT_VOLTAGE
+
+# === Configuration ===
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TEMPLATE_NAME = "dtc_test_template.robot.j2"
+GROUP_TEMPLATE_NAME = "dtc_group_test_template.robot.j2"
+BENCH_INIT_TEMPLATE_NAME = "dtc_bench_setup_init.robot.j2"
+DATA_DRIVEN_TEMPLATE_NAME = "dtc_data_driven_suite.robot.j2"
+KEYWORDS_TEMPLATE_NAME = "dtc_keywords.resource.j2"
+KEYWORDS_RESOURCE = "dtc_keywords.resource"
+# Keyword resource, relative to where the suite files are placed in the test repository
+RESOURCE_PATH = "../../../../Keywords/ProjectKeywords/HiL/Climate/Climate_General.resource"
+
+
+# === Rendering ===
+@lru_cache(maxsize=None)
+def get_template(name=TEMPLATE_NAME):
+    """Load and compile a Robot template once per process"""
+    env = Environment(loader=FileSystemLoader(str(REPO_ROOT)), trim_blocks=True, lstrip_blocks=True)
+    return env.get_template(name)
+
+
+def render_test_case(data, resource_path=RESOURCE_PATH, hoisted_setup=False):
+    """Render the Robot test case of one generated DTC (it imports the KEYWORDS_RESOURCE next to it)"""
+    return get_template(TEMPLATE_NAME).render(
+        **data, resource_path=resource_path, keywords_resource=KEYWORDS_RESOURCE, hoisted_setup=hoisted_setup
+    )
+
+
+def render_group_test_case(group, resource_path=RESOURCE_PATH, hoisted_setup=False):
+    """Render the merged Robot test case of DTCs sharing trigger conditions"""
+    return get_template(GROUP_TEMPLATE_NAME).render(
+        **group, resource_path=resource_path, keywords_resource=KEYWORDS_RESOURCE, hoisted_setup=hoisted_setup
+    )
+
+
+def render_keywords_resource(resource_path=RESOURCE_PATH):
+    """Render the shared DTC check keywords imported by every generated suite"""
+    return get_template(KEYWORDS_TEMPLATE_NAME).render(resource_path=resource_path)
+
+
+def write_keywords_resource(output_dir, resource_path=RESOURCE_PATH):
+    """Write KEYWORDS_RESOURCE into output_dir; returns its path"""
+    path = os.path.join(output_dir, KEYWORDS_RESOURCE)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(render_keywords_resource(resource_path))
+    return path
+
+
+def safe_filename(name):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", str(name))
+
+
+def test_case_filename(data):
+    return f"{safe_filename(data['dtc_code'])}_testcase.robot"
+
+
+def group_test_case_filename(group):
+    return f"{safe_filename(group['group_id'])}_group{len(group['dtcs'])}_testcase.robot"
+
+
+# === Export ===
+def plan_suites(data_list, merge_triggers=False, max_group_size=None):
+    """Return (filename, suite_data, is_group) for every suite to write"""
+    if merge_triggers:
+        groups, singles = merge_trigger_groups(data_list, max_group_size=max_group_size)
+    else:
+        groups, singles = [], list(data_list)
+
+    suites = [(group_test_case_filename(group), group, True) for group in groups]
+    suites += [(test_case_filename(data), data, False) for data in singles]
+    return suites
+
+
+def render_suite(suite, is_group, **options):
+    render = render_group_test_case if is_group else render_test_case
+    with span("render_template"):
+        return render(suite, **options)
+
+
+def stream_suite(suite, is_group, resource_path=RESOURCE_PATH, hoisted_setup=False):
+    """Yield the rendered suite piece by piece (Jinja generate), without building the whole text"""
+    template = get_template(GROUP_TEMPLATE_NAME if is_group else TEMPLATE_NAME)
+    return template.generate(**suite, resource_path=resource_path, keywords_resource=KEYWORDS_RESOURCE,
+                             hoisted_setup=hoisted_setup)
+
+
+def write_suites(suites, output_dir, prefix_order=False, **options):
+    """Write one .robot file per planned suite into output_dir, plus the shared keyword
+    resource they import; returns the written paths (resource last).
+
+    prefix_order keeps the given execution order by prefixing file names with
+    "001__", which Robot Framework strips from suite names.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for position, (filename, suite, is_group) in enumerate(suites, start=1):
+        if prefix_order:
+            filename = f"{position:03d}__{filename}"
+        path = os.path.join(output_dir, filename)
+        content = render_suite(suite, is_group, **options)
+        with span("export.write"), open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        paths.append(path)
+    paths.append(write_keywords_resource(output_dir, options.get("resource_path", RESOURCE_PATH)))
+    return paths
+
+
+def data_driven_rows(suites):
+    """Flatten planned suites into one data row per DTC trigger condition.
+
+    Merged groups are split back into their DTCs: a Test Template row checks one DTC.
+    DTCs without trigger condition keep a row with variable None, conditions without
+    numeric value one with error/normal value None (both rendered as a comment).
+    """
+    rows = []
+    for _, suite, is_group in suites:
+        for data in (suite["dtcs"] if is_group else [suite]):
+            conditions = data.get("trigger_conditions") or [{}]
+            for index, cond in enumerate(conditions, start=1):
+                suffix = f"_{index}" if len(conditions) > 1 else ""
+                rows.append({
+                    "name": f"Test_DTC{safe_filename(data['dtc_code'])}_Pos{suffix}",
+                    "dtc_code": data["dtc_code"],
+                    "ECU": data["ECU"],
+                    "Bus": data["Bus"],
+                    "Pwf": data.get("Pwf", DEFAULT_PWF),
+                    "Voltage": data.get("Voltage", DEFAULT_VOLTAGE),
+                    "variable": cond.get("variable"),
+                    "value": cond.get("value"),
+                    "error_value": cond.get("error_value"),
+                    "normal_value": cond.get("normal_value"),
+                    "unknown_signal": cond.get("unknown_signal", False),
+                    "timing": data["timing"],
+                    "source": data.get("source"),
+                })
+    return rows
+
+
+def suite_metadata(suites):
+    """Source (workbook [sheet]) and model version lists of the DTCs of several suites"""
+    sources, model_versions = {}, {}
+    for _, suite, is_group in suites:
+        for data in (suite["dtcs"] if is_group else [suite]):
+            if data.get("source"):
+                sources[data["source"].rpartition(" row ")[0] or data["source"]] = None
+            if data.get("model_version"):
+                model_versions[data["model_version"]] = None
+    return {"sources": list(sources), "model_versions": list(model_versions)}
+
+
+def write_data_driven_suite(suites, output_dir, suite_name="dtc_suite", hoist_setup=False,
+                            resource_path=RESOURCE_PATH):
+    """Write the planned suites as one Test Template suite plus the shared keyword resource.
+
+    Returns the written paths (suite first). The order of the rows is the order of suites.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rows = data_driven_rows(suites)
+    estimated_ms = sum(suite["estimated_runtime_ms"] for _, suite, _ in suites)
+    tester_name = suites[0][1]["tester_name"] if suites else ""
+
+    suite_path = os.path.join(output_dir, f"{safe_filename(suite_name)}.robot")
+    with open(suite_path, "w", encoding="utf-8") as f:
+        f.write(get_template(DATA_DRIVEN_TEMPLATE_NAME).render(
+            rows=rows, tester_name=tester_name, keywords_resource=KEYWORDS_RESOURCE,
+            hoisted_setup=hoist_setup, estimated_runtime=format_duration(estimated_ms),
+            **suite_metadata(suites),
+        ))
+
+    return [suite_path, write_keywords_resource(output_dir, resource_path)]
+
+
+def export_suites(data_list, output_dir, merge_triggers=False, max_group_size=None):
+    """Plan and write the suites of a list of generated DTCs"""
+    return write_suites(plan_suites(data_list, merge_triggers, max_group_size), output_dir)
@@ -0,0 +1,115 @@
+from generator.timing import estimate_group_runtime_ms, format_duration
+
+# Operators whose thresholds can be shared: one error value beyond every threshold
+# triggers all DTCs of the family, one normal value on the other side heals them all
+RANGE_DIRECTIONS = {">": "above", ">=": "above", "<": "below", "<=": "below"}
+
+
+def trigger_group_key(data):
+    """Return the key under which DTCs can share one trigger sequence, or None.
+
+    - single range condition (>, >=, <, <=): same ECU, bus, signal and direction
+      (thresholds may differ, they are merged)
+    - otherwise: same ECU, bus and identical set of conditions
+
+    Members also share their bench precondition (PWF state and supply voltage).
+    """
+    conditions = data.get("trigger_conditions", [])
+    if not conditions:
+        return None
+    if any("error_value" not in cond or "normal_value" not in cond for cond in conditions):
+        return None
+
+    ecu, bus = str(data.get("ECU")), str(data.get("Bus"))
+    state = (str(data.get("Pwf")), str(data.get("Voltage")))
+    if len(conditions) == 1 and conditions[0].get("operator") in RANGE_DIRECTIONS:
+        cond = conditions[0]
+        return (ecu, bus, "range", cond["variable"], RANGE_DIRECTIONS[cond["operator"]], state)
+
+    signature = tuple(sorted(
+        (cond["variable"], cond.get("operator", "<"), str(cond.get("value")))
+        for cond in conditions
+    ))
+    return (ecu, bus, "exact", signature, state)
+
+
+def merge_range_condition(members, direction):
+    """Pick values that satisfy every member: beyond the strictest threshold on error,
+    within the loosest one on recovery"""
+    conds = [member["trigger_conditions"][0] for member in members]
+    pick_error, pick_normal = (max, min) if direction == "above" else (min, max)
+    merged = dict(conds[0])
+    merged.pop("boundary", None)  # boundary values of the first member only
+    merged["error_value"] = pick_error(cond["error_value"] for cond in conds)
+    merged["normal_value"] = pick_normal(cond["normal_value"] for cond in conds)
+    merged["value"] = ", ".join(sorted({str(cond["value"]) for cond in conds}))
+    return merged
+
+
+def merge_group_timing(members):
+    """Share the trigger window: pre-check before the fastest DTC, wait for the slowest.
+
+    The pre-check only covers the members that have one (debounce long enough to
+    check), so a single short-debounce DTC does not remove it from the whole group.
+    """
+    timings = [member["timing"] for member in members]
+    pre_checks = [timing["pre_check_ms"] for timing in timings if timing["pre_check_ms"] is not None]
+    return {
+        "debounce_ms": max(timing["debounce_ms"] for timing in timings),
+        "pre_check_ms": min(pre_checks, default=None),
+        "timeout_ms": max(timing["timeout_ms"] for timing in timings),
+        "poll_ms": min(timing["poll_ms"] for timing in timings),
+    }
+
+
+def build_group(members, key):
+    """Build the template data of a merged test from DTCs sharing a trigger key"""
+    members = sorted(members, key=lambda member: member["timing"]["debounce_ms"])
+    first = members[0]
+    if key[2] == "range":
+        trigger_conditions = [merge_range_condition(members, key[4])]
+    else:
+        trigger_conditions = first["trigger_conditions"]
+
+    group = {
+        "tester_name": first["tester_name"],
+        "group_id": str(first["dtc_code"]),
+        "ECU": first["ECU"],
+        "Bus": first["Bus"],
+        "Pwf": first.get("Pwf"),
+        "Voltage": first.get("Voltage"),
+        "dtcs": members,
+        "dtc_codes": [str(member["dtc_code"]) for member in members],
+        "trigger_conditions": trigger_conditions,
+        "timing": merge_group_timing(members),
+    }
+    group["estimated_runtime_ms"] = estimate_group_runtime_ms(group)
+    group["estimated_runtime"] = format_duration(group["estimated_runtime_ms"])
+    return group
+
+
+def merge_trigger_groups(data_list, max_group_size=None):
+    """Split generated DTC data into merged groups and standalone tests.
+
+    Returns (groups, singles): groups hold 2+ DTCs sharing a trigger sequence,
+    singles are the DTCs that keep their own test case.
+    """
+    buckets = {}
+    singles = []
+    for data in data_list:
+        key = trigger_group_key(data)
+        if key is None:
+            singles.append(data)
+        else:
+            buckets.setdefault(key, []).append(data)
+
+    groups = []
+    for key, members in buckets.items():
+        size = max_group_size or len(members)
+        for start in range(0, len(members), size):
+            chunk = members[start:start + size]
+            if len(chunk) == 1:
+                singles.append(chunk[0])
+            else:
+                groups.append(build_group(chunk, key))
+    return groups, singles
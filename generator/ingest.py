@@ -0,0 +1,158 @@
+import os
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from generator.validation import FIRST_EXCEL_ROW, ValidationReport, validate_workbook
+
+# === Configuration ===
+# Worker processes used to parse the sheets (0: one per CPU, 1: serial)
+INGEST_WORKERS = int(os.getenv("KPIT_INGEST_WORKERS", "0"))
+# With INGEST_WORKERS=0, smaller inputs are read serially: starting a worker costs ~1 s
+INGEST_PARALLEL_MIN_MB = float(os.getenv("KPIT_INGEST_PARALLEL_MIN_MB", "2"))
+WORKBOOK_SUFFIXES = (".xlsx", ".xlsm", ".xls")
+SOURCE_COLUMNS = ("Source", "Sheet", "Row")
+
+
+def find_workbooks(paths):
+    """Expand directories into the workbooks they contain (sorted, Excel lock files skipped)"""
+    workbooks = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            workbooks += sorted(
+                child for child in path.iterdir()
+                if child.suffix.lower() in WORKBOOK_SUFFIXES and not child.name.startswith("~$")
+            )
+        else:
+            workbooks.append(path)
+    return workbooks
+
+
+def source_names(workbooks):
+    """Source name of each workbook: its path relative to the common folder of all of them.
+
+    "ecu1.xlsx" for a single workbook, "body/ecu1.xlsx" and "chassis/ecu1.xlsx" when
+    same-named workbooks of several folders are read together.
+    """
+    paths = [os.path.abspath(workbook) for workbook in workbooks]
+    try:
+        root = os.path.commonpath([os.path.dirname(path) for path in paths]) if paths else ""
+    except ValueError:
+        # Different drives (Windows): no common folder
+        return [Path(path).as_posix() for path in paths]
+    return [Path(os.path.relpath(path, root)).as_posix() for path in paths]
+
+
+def list_sheets(workbooks, sheets=None):
+    """(workbook, sheet, explicit, source name) tasks: the selected sheets, or every sheet of each workbook"""
+    tasks = []
+    for workbook, name in zip(workbooks, source_names(workbooks)):
+        if sheets:
+            tasks += [(str(workbook), sheet, True, name) for sheet in sheets]
+        else:
+            with pd.ExcelFile(workbook) as excel:
+                tasks += [(str(workbook), sheet, False, name) for sheet in excel.sheet_names]
+    return tasks
+
+
+def read_sheet(workbook, sheet, explicit=True, name=None):
+    """Read and validate one sheet (runs in a worker process); returns (DataFrame or None, report)"""
+    name = name or Path(workbook).name
+    source = f"{name} [{sheet}]"
+    try:
+        df = pd.read_excel(workbook, sheet_name=sheet)
+    except (OSError, ValueError) as e:
+        report = ValidationReport(source)
+        report.add("sheet", f"cannot be read: {e}")
+        return None, report
+    df, report = validate_workbook(df.reset_index(drop=True), source=source)
+    if report.sheet_errors and not explicit:
+        # Notes, revision history...: only sheets with DTC columns are expected when all are read
+        skipped = ValidationReport(source)
+        skipped.add("sheet", "skipped, no DTC/Implementation column", level="warning")
+        return None, skipped
+    if report.sheet_errors:
+        return None, report
+    df["Source"] = name
+    df["Sheet"] = sheet
+    df["Row"] = range(FIRST_EXCEL_ROW, len(df) + FIRST_EXCEL_ROW)
+    return df, report
+
+
+def _read_task(task):
+    return read_sheet(*task)
+
+
+def _available_cpus():
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def worker_count(workers, tasks):
+    """Processes to use for the tasks (1: read serially in this process)"""
+    if workers == 0:
+        size_mb = sum(os.path.getsize(path) for path in {workbook for workbook, *_ in tasks}) / 2**20
+        workers = _available_cpus() if size_mb >= INGEST_PARALLEL_MIN_MB else 1
+    return max(1, min(workers, len(tasks)))
+
+
+def load_dtc_index(paths, sheets=None, workers=INGEST_WORKERS):
+    """Read every sheet of several workbooks into one DTC index.
+
+    paths are workbooks or directories of workbooks; sheets selects sheet names
+    (default: every sheet with DTC columns). Sheets are parsed and validated in
+    parallel worker processes (see worker_count). Returns (DataFrame, ValidationReport): one row
+    per DTC with its Source workbook (see source_names), Sheet and Excel Row, and one report whose
+    issues refer to the index of that DataFrame. A DTC repeated in one sheet keeps its first row;
+    a DTC defined in several sheets is an error (the generated files are named after the DTC).
+    """
+    tasks = list_sheets(find_workbooks(paths), sheets)
+    workers = worker_count(workers, tasks)
+    if workers > 1:
+        # spawn: safe from the GUI (Qt and torch threads do not survive a fork)
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            results = list(pool.map(_read_task, tasks))
+    else:
+        results = [_read_task(task) for task in tasks]
+
+    report = ValidationReport(f"{len(tasks)} sheet(s)")
+    frames, offset = [], 0
+    for df, sheet_report in results:
+        for target, issues in ((report.errors, sheet_report.errors), (report.warnings, sheet_report.warnings)):
+            for issue in issues:
+                index = issue["index"] + offset if issue["index"] is not None else None
+                target.append(dict(issue, index=index, source=sheet_report.source))
+        if df is not None:
+            frames.append(df)
+            offset += len(df)
+    index = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["DTC", *SOURCE_COLUMNS])
+
+    # --- Same DTC twice in one sheet: the first row is used (warned by validate_workbook) --- #
+    dtc_key = index["DTC"].astype("string").str.lower()
+    repeated = dtc_key.notna() & pd.DataFrame({"dtc": dtc_key, "source": index["Source"], "sheet": index["Sheet"]}
+                                              ).duplicated(keep="first")
+    ignored = set(index.index[repeated])
+    report.errors = [issue for issue in report.errors if issue["index"] not in ignored]
+    index = index[~repeated]
+    report.row_count = len(index)
+
+    # --- Same DTC in several sheets or workbooks --- #
+    if len(frames) > 1:
+        sheet_key = index["Source"] + " [" + index["Sheet"].astype(str) + "]"
+        dtc_key = index["DTC"].astype("string").str.lower()
+        by_dtc = sheet_key.groupby(dtc_key)
+        spread = by_dtc.transform("nunique")
+        sheets_of = by_dtc.unique()  # One lookup per duplicated row instead of a scan of the index
+        for position in (spread > 1).fillna(False).to_numpy(dtype=bool).nonzero()[0]:
+            own = sheet_key.iloc[position]
+            others = sorted(set(sheets_of[dtc_key.iloc[position]]) - {own})
+            report.errors.append({
+                "index": index.index[position], "row": int(index["Row"].iloc[position]),
+                "source": own, "column": "DTC",
+                "message": f"DTC also defined in {', '.join(others)}",
+            })
+    return index, report
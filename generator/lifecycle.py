@@ -0,0 +1,237 @@
+import gc
+import os
+import sys
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+from generator.pipeline import DtcTestGenerator, MODEL_DIR
+from generator.tracing import span
+
+# === Configuration ===
+# Unload the model after this many seconds without generation (0 keeps it for the whole session)
+MODEL_IDLE_TIMEOUT_S = float(os.getenv("KPIT_MODEL_IDLE_TIMEOUT_S", "900"))
+
+logger = logging.getLogger(__name__)
+
+
+class ModelLifecycle:
+    """Loads the DtcTestGenerator on demand and unloads it once it has been idle.
+
+    use() hands out the generator, loading it first (or waiting for a running
+    prefetch) when it is not resident. prefetch() starts that load in a background
+    thread so that the model is ready by the time it is needed. evict_if_idle() is
+    meant to be called periodically (e.g. from a UI timer).
+
+    With a ModelRegistry (generator/registry.py) and no model_dir or version, the
+    active version is used and check_registry() (also called periodically) swaps
+    in the version activated meanwhile. swap() loads the new model in the
+    background while the current one keeps serving; generations already running
+    finish with the model they were given.
+    """
+
+    def __init__(self, model_dir=None, device="cpu", idle_timeout_s=MODEL_IDLE_TIMEOUT_S,
+                 registry=None, version=None, **options):
+        self.registry = registry
+        self.follow_registry = registry is not None and model_dir is None and version is None
+        if registry is not None and model_dir is None:
+            model_dir, version = registry.resolve(version)
+        self.model_dir = model_dir or MODEL_DIR
+        self.version = version
+        self.device = device
+        self.idle_timeout_s = idle_timeout_s
+        self.options = options
+        self.last_used = time.monotonic()
+        self.load_count = 0
+        self.last_error = None
+        self._generator = None
+        self._loading = None  # threading.Event set when the running load ends
+        self._in_use = 0
+        self._swapping = False
+        self.switching_to = None  # version (or folder) being loaded by swap()
+        self._failed_model_dir = None  # swap that failed, not retried until the registry changes again
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._generator is not None:
+                return "loaded"
+            return "loading" if self._loading is not None else "unloaded"
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._generator is not None:
+                return self._generator
+            loading = self._loading
+            if loading is None:
+                loading = self._loading = threading.Event()
+                owner = True
+            else:
+                owner = False
+            model_dir, version = self.model_dir, self.version
+
+        if not owner:
+            loading.wait()
+            with self._lock:
+                generator = self._generator
+            # The other load failed: try again here so that the caller gets the error
+            return generator if generator is not None else self._ensure_loaded()
+
+        try:
+            generator = DtcTestGenerator(model_dir, device=self.device, version=version, **self.options)
+        except Exception as e:
+            self.last_error = e
+            raise
+        else:
+            with self._lock:
+                # Switched to another model during the load: serve this caller, keep the new one
+                if self.model_dir == model_dir and self._generator is None:
+                    self._generator = generator
+                    self.load_count += 1
+                self.last_used = time.monotonic()
+            self.last_error = None
+            return generator
+        finally:
+            with self._lock:
+                self._loading = None
+            loading.set()
+
+    def prefetch(self):
+        """Start loading the model in the background unless it is resident or loading"""
+        with self._lock:
+            if self._generator is not None or self._loading is not None:
+                return
+        threading.Thread(target=self._prefetch, daemon=True).start()
+
+    def _prefetch(self):
+        try:
+            self._ensure_loaded()
+        except Exception:
+            pass  # kept in last_error, raised again by the next use()
+
+    @contextmanager
+    def use(self):
+        """Context manager yielding the loaded generator; it is not evicted while in use"""
+        generator = self._ensure_loaded()
+        with self._lock:
+            self._in_use += 1
+        try:
+            yield generator
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                self.last_used = time.monotonic()
+
+    def evict_if_idle(self):
+        """Unload the model when unused for idle_timeout_s; returns True if it was unloaded"""
+        with self._lock:
+            if self.idle_timeout_s <= 0 or self._generator is None or self._in_use:
+                return False
+            if time.monotonic() - self.last_used < self.idle_timeout_s:
+                return False
+            self._generator = None
+        gc.collect()
+        return True
+
+    def swap(self, model_dir, version=None):
+        """Switch to another model; returns the loading thread (None when no load is needed).
+
+        A resident model is replaced only once the new one is loaded, so generations
+        never wait for the switch; a model that is not resident is just loaded from
+        the new directory next time. If the load fails, the current model is kept.
+        """
+        with self._lock:
+            if model_dir == self.model_dir or self._swapping:
+                return None
+            if self._generator is None and self._loading is None:
+                self.model_dir, self.version = model_dir, version
+                logger.info("Model switched to %s", version or model_dir)
+                return None
+            self._swapping = True
+            self.switching_to = version or model_dir
+        thread = threading.Thread(target=self._swap, args=(model_dir, version), daemon=True)
+        thread.start()
+        return thread
+
+    def _swap(self, model_dir, version):
+        try:
+            with span("model.swap", version=version or model_dir):
+                generator = DtcTestGenerator(model_dir, device=self.device, version=version, **self.options)
+        except Exception as e:
+            with self._lock:
+                self._swapping = False
+                self.switching_to = None
+                self._failed_model_dir = model_dir
+            self.last_error = e
+            logger.error("Model %s could not be loaded, keeping %s: %s",
+                         version or model_dir, self.version or self.model_dir, e)
+            return
+        with self._lock:
+            # The old generator stays alive until the generations using it end
+            self._generator = generator
+            self.model_dir, self.version = model_dir, version
+            self.load_count += 1
+            self.last_used = time.monotonic()
+            self._swapping = False
+            self.switching_to = None
+            self._failed_model_dir = None
+        self.last_error = None
+        gc.collect()
+        logger.info("Model switched to %s", version or model_dir)
+
+    def switch_version(self, version=None):
+        """Pin a registry version (None: follow the active one again); returns the loading thread"""
+        model_dir, resolved = self.registry.resolve(version)
+        self.follow_registry = version is None
+        return self.swap(model_dir, resolved)
+
+    def check_registry(self):
+        """Swap in the active registry version if it changed; returns True when a switch starts"""
+        if not self.follow_registry:
+            return False
+        try:
+            model_dir, version = self.registry.resolve()
+        except (OSError, ValueError) as e:
+            logger.warning("Model registry %s cannot be read: %s", self.registry.root, e)
+            return False
+        if model_dir in (self.model_dir, self._failed_model_dir):
+            return False
+        self.swap(model_dir, version)
+        return True
+
+    def model_size_mb(self):
+        """Size of the resident model weights in MB (0 when unloaded)"""
+        with self._lock:
+            generator = self._generator
+        if generator is None:
+            return 0.0
+        return sum(p.numel() * p.element_size() for p in generator.model.parameters()) / 2**20
+
+
+def process_memory_mb():
+    """Resident memory of the current process in MB, None where it cannot be read cheaply"""
+    if sys.platform.startswith("linux"):
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize / 2**20
+    return None
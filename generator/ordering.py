@@ -0,0 +1,112 @@
+import os
+
+from generator.export import (
+    BENCH_INIT_TEMPLATE_NAME, KEYWORDS_RESOURCE, RESOURCE_PATH, get_template, safe_filename, write_suites,
+)
+from generator.timing import BENCH_DELAYS_MS, format_duration
+from generator.validation import DEFAULT_PWF, DEFAULT_VOLTAGE
+
+
+def bench_state(suite):
+    """Bench state a suite needs before its first step: its ECU, bus and precondition
+    (PWF state and supply voltage of its workbook row)"""
+    return {
+        "ecu": suite["ECU"],
+        "bus": suite["Bus"],
+        "pwf": suite.get("Pwf", DEFAULT_PWF),
+        "voltage": suite.get("Voltage", DEFAULT_VOLTAGE),
+    }
+
+
+def bench_state_key(suite):
+    """Grouping key of a suite: (ECU, bus, PWF state, voltage)"""
+    return tuple(str(value) for value in bench_state(suite).values())
+
+
+def group_by_bench_state(suites):
+    """Group planned suites by bench state, keeping the order in which states first appear"""
+    groups = {}
+    for planned in suites:
+        groups.setdefault(bench_state_key(planned[1]), []).append(planned)
+    return list(groups.items())
+
+
+def order_by_bench_state(suites):
+    """Reorder planned suites so that suites sharing a bench state run back to back"""
+    return [planned for _, members in group_by_bench_state(suites) for planned in members]
+
+
+def transition_ms(bench_delays=None):
+    """Cost of bringing the bench into its precondition state from another state"""
+    delays = dict(BENCH_DELAYS_MS, **(bench_delays or {}))
+    return delays["pwf_to_pad"] + delays["diag_logger"] + delays["power_supply"]
+
+
+def estimate_ordering(suites, hoist_setup=False, bench_delays=None):
+    """Estimate the bench time of the suites in the naive and the bench-state order.
+
+    Each suite estimate already pays a full precondition transition, and every
+    test keeps its own precondition steps when it is only reordered: the saving
+    only comes from a hoisted Suite Setup, which runs them once per bench state.
+    """
+    transition = transition_ms(bench_delays)
+    naive_ms = sum(suite["estimated_runtime_ms"] for _, suite, _ in suites)
+    states = group_by_bench_state(suites)
+
+    ordered_ms = naive_ms
+    if hoist_setup:
+        ordered_ms -= (len(suites) - len(states)) * transition
+
+    return {
+        "suites": len(suites),
+        "bench_states": len(states),
+        "naive_ms": naive_ms,
+        "ordered_ms": ordered_ms,
+        "saved_ms": naive_ms - ordered_ms,
+    }
+
+
+def format_ordering_report(estimate, hoist_setup=False):
+    if not hoist_setup:
+        return (
+            f"{estimate['suites']} suites over {estimate['bench_states']} bench states, ordered by bench state: "
+            f"estimated bench time {format_duration(estimate['ordered_ms'])} "
+            f"(every test keeps its precondition, use --hoist-setup to run it once per state)"
+        )
+    return (
+        f"{estimate['suites']} suites over {estimate['bench_states']} bench states, ordered with hoisted Suite Setup: "
+        f"estimated bench time {format_duration(estimate['ordered_ms'])} instead of "
+        f"{format_duration(estimate['naive_ms'])} (saves {format_duration(estimate['saved_ms'])})"
+    )
+
+
+def write_bench_ordered(suites, output_dir, hoist_setup=False):
+    """Write the suites so that Robot runs them grouped by bench state.
+
+    Without hoisting the files are prefixed with their position ("001__"). With
+    hoisting every bench state gets its own folder whose __init__.robot brings the
+    bench into that state once in Suite Setup; its tests skip those steps.
+    """
+    if not hoist_setup:
+        return write_suites(order_by_bench_state(suites), output_dir, prefix_order=True)
+
+    # Suites move one folder down, their relative resource path follows
+    resource_path = "../" + RESOURCE_PATH
+    paths = []
+    for position, (_, members) in enumerate(group_by_bench_state(suites), start=1):
+        state = bench_state(members[0][1])
+        state_name = f"{state['ecu']}_{state['bus']}_Pwf_{state['pwf']}_{state['voltage']}V"
+        state_dir = os.path.join(output_dir, f"{position:02d}__{safe_filename(state_name)}")
+        paths += write_suites(
+            members, state_dir, prefix_order=True,
+            resource_path=resource_path, hoisted_setup=True,
+        )
+
+        estimate = estimate_ordering(members, hoist_setup=True)
+        init_path = os.path.join(state_dir, "__init__.robot")
+        with open(init_path, "w", encoding="utf-8") as f:
+            f.write(get_template(BENCH_INIT_TEMPLATE_NAME).render(
+                **state, resource_path=resource_path, keywords_resource=KEYWORDS_RESOURCE,
+                estimated_runtime=format_duration(estimate["ordered_ms"]),
+            ))
+    return paths
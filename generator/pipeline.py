@@ -0,0 +1,255 @@
+import os
+import re
+import logging
+from pathlib import Path
+
+import numpy as np
+
+from generator.tracing import span
+from generator.boundary import VALUE_SEED, assign_boundary_values
+from generator.signals import default_signal_index, resolve_signals
+from generator.timing import compute_wait_windows, estimate_test_runtime_ms, format_duration
+from generator.validation import DEFAULT_PWF, DEFAULT_VOLTAGE
+
+# === Configuration ===
+# Fine-tuned model next to the package (train_model_readable.py saves it to ../t5_model),
+# independent of the working directory the app is started from
+MODEL_DIR = os.getenv("KPIT_MODEL_DIR", str(Path(__file__).resolve().parent.parent / "t5_model"))
+SAFETENSORS_WEIGHTS = "model.safetensors"
+TRIGGER_OPERATORS = [">", "<", "==", "!=", ">=", "<="]
+# beam: beam search (num_beams=10), greedy: single beam,
+# prompt_lookup: greedy with drafts copied from the Implementation text (same output as greedy),
+# constrained: beam search restricted to the CODDING/TRIGGERS output grammar
+DECODING_MODES = ("beam", "greedy", "prompt_lookup", "constrained")
+DECODING = os.getenv("KPIT_DECODING", "beam")
+NUM_BEAMS = 10
+CONSTRAINED_NUM_BEAMS = int(os.getenv("KPIT_CONSTRAINED_BEAMS", "3"))
+MAX_NEW_TOKENS = 256
+
+logger = logging.getLogger(__name__)
+
+
+# === Model Output Parsing ===
+def parse_model_output(raw_output):
+    """
+    Parse the raw output text from the model into structured codding and trigger_conditions.
+    If operator is missing in triggers, default to '<'.
+    """
+    raw_output = raw_output.replace("\n", " ").strip()
+    # Extract CODDING and TRIGGERS or IF sections
+    coding_match = re.search(r'CODDING:\s*(.*?)\s*(TRIGGERS:|IF:|$)', raw_output, re.IGNORECASE)
+    triggers_match = re.search(r'(TRIGGERS:|IF:)\s*(.*)', raw_output, re.IGNORECASE)
+
+    coding_raw = coding_match.group(1).strip() if coding_match else ""
+    triggers_raw = triggers_match.group(2).strip() if triggers_match else ""
+    # "Current_Value > 30 → 0x1E": the arrow only separates the value from its hex code
+    triggers_raw = re.sub(r'\s*(→|->)\s*', ' ', triggers_raw)
+
+    # Parse codding
+    codding = []
+    coding_parts = re.split(r'\s{2,}', coding_raw)  # split by 2+ spaces
+    for part in coding_parts:
+        part = part.strip()
+        if part:
+            codding.append(part)
+
+    # Parse triggers
+    triggers = []
+    if triggers_raw:
+        parts = triggers_raw.split()
+        i = 0
+        while i < len(parts):
+            var = parts[i]
+            op = "<"  # default operator
+            val = None
+            hex_code = ""
+
+            # Check if next token is an operator
+            if i + 1 < len(parts) and parts[i + 1] in TRIGGER_OPERATORS:
+                op = parts[i + 1]
+                val = parts[i + 2] if i + 2 < len(parts) else None
+                if i + 3 < len(parts) and parts[i + 3].startswith("0x"):
+                    hex_code = parts[i + 3]
+                    i += 4
+                else:
+                    i += 3
+            else:
+                # No explicit operator, value directly after var
+                val = parts[i + 1] if i + 1 < len(parts) else None
+                if i + 2 < len(parts) and parts[i + 2].startswith("0x"):
+                    hex_code = parts[i + 2]
+                    i += 3
+                else:
+                    i += 2
+
+            if val:
+                triggers.append({
+                    "variable": var,
+                    "operator": op,
+                    "value": val,
+                    "hex_code": hex_code
+                })
+
+    return codding, triggers
+
+
+def round_trip_mismatches(tokenizer, texts):
+    """(text, decoded) of the target texts whose parsed CODDING/TRIGGERS change once encoded
+    and decoded by tokenizer (e.g. spaces lost around added tokens): the model cannot emit them"""
+    mismatches = []
+    for text in texts:
+        decoded = tokenizer.decode(tokenizer(text).input_ids, skip_special_tokens=True)
+        if parse_model_output(decoded) != parse_model_output(text):
+            mismatches.append((text, decoded))
+    return mismatches
+
+
+# === Test Value Generation ===
+def assign_test_values(trigger_conditions, increment_text="", signals=None, rng=None):
+    """Generate error/normal and boundary values for each trigger condition (in place)"""
+    assign_boundary_values([trigger_conditions], increment_text, signals, rng)
+    return trigger_conditions
+
+
+def format_tester_name(tester_name):
+    tester_name = (tester_name or "").strip() or "Unknown Tester"
+    return tester_name.lower().replace(" ", ".")
+
+
+# === Generator ===
+class DtcTestGenerator:
+    """Turns DTC workbook rows into template data using the fine-tuned T5 model"""
+
+    def __init__(self, model_dir=MODEL_DIR, device="cpu", decoding=DECODING, signals=None, seed=VALUE_SEED,
+                 version=None):
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+        if decoding not in DECODING_MODES:
+            raise ValueError(f"Unknown decoding mode {decoding!r}, expected one of {DECODING_MODES}")
+        self.decoding = decoding
+        # Registry version of the checkpoint (generator/registry.py), written in the suite metadata
+        self.version = version
+        # SignalIndex (generator/signals.py): resolves the signal names emitted by the model
+        # and gives their range/resolution to the error and normal values (generator/boundary.py)
+        self.signals = signals if signals is not None else default_signal_index()
+        self.rng = np.random.default_rng(seed)
+        with span("model.load"):
+            self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+            # safetensors weights are memory-mapped instead of copied: the pages are loaded
+            # on demand and shared read-only by every process of the host using the model
+            has_safetensors = os.path.exists(os.path.join(model_dir, SAFETENSORS_WEIGHTS))
+            self.model = AutoModelForSeq2SeqLM.from_pretrained(
+                model_dir, low_cpu_mem_usage=True, use_safetensors=True if has_safetensors else None,
+            )
+            self.device = torch.device(device)
+            self.model.to(self.device)
+            self.model.eval()
+        self._token_surfaces = None
+
+    def generate_rule_output_ids(self, rule_text, decoding=None, stats=None):
+        """Token ids generated for one Implementation text with the given decoding mode"""
+        decoding = decoding or self.decoding
+        with span("model.tokenize"):
+            inputs = self.tokenizer(rule_text, return_tensors="pt", truncation=True, max_length=256).to(self.device)
+        with span("model.generate", decoding=decoding):
+            return self._generate(inputs, rule_text, decoding, stats)
+
+    def _generate(self, inputs, rule_text, decoding, stats=None):
+        if decoding == "prompt_lookup":
+            from generator.decoding import prompt_lookup_generate
+
+            return prompt_lookup_generate(
+                self.model, inputs["input_ids"], inputs["attention_mask"],
+                max_new_tokens=MAX_NEW_TOKENS, stats=stats,
+            )
+        if decoding == "constrained":
+            from transformers import LogitsProcessorList
+            from generator.constraints import GrammarLogitsProcessor, token_surfaces
+
+            if self._token_surfaces is None:
+                self._token_surfaces = token_surfaces(self.tokenizer)
+            processor = GrammarLogitsProcessor(self.tokenizer, rule_text, surfaces=self._token_surfaces)
+            return self.model.generate(
+                **inputs, max_new_tokens=MAX_NEW_TOKENS, num_beams=CONSTRAINED_NUM_BEAMS,
+                early_stopping=True, logits_processor=LogitsProcessorList([processor]),
+            )
+        if decoding == "greedy":
+            return self.model.generate(**inputs, max_new_tokens=MAX_NEW_TOKENS, num_beams=1, do_sample=False)
+        return self.model.generate(**inputs, max_new_tokens=MAX_NEW_TOKENS, num_beams=NUM_BEAMS, early_stopping=True)
+
+    def generate_rule_output_raw(self, rule_text, decoding=None):
+        outputs = self.generate_rule_output_ids(rule_text, decoding)
+        with span("model.decode"):
+            return self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+
+    def build_test_data(self, row, tester_name="", increment_text="", assign_values=True):
+        """Build the template data of one workbook row (pandas Series or dict).
+
+        With assign_values=False the trigger conditions get no error/normal values
+        (generate_workbook assigns those of the whole workbook at once).
+        """
+        with span("build_test_data", dtc=row["DTC"]):
+            return self._build_test_data(row, tester_name, increment_text, assign_values)
+
+    def _build_test_data(self, row, tester_name, increment_text, assign_values=True):
+        rule_text = row["Implementation"]
+        ECU = row.get("ECU", "ECU1")
+        Bus = row.get("BUS", "BUS")
+        Debounce = int(float(row.get("Debounce time", 1000)))
+        Pwf = str(row.get("PWF", DEFAULT_PWF)).strip()
+        Voltage = float(row.get("Voltage", DEFAULT_VOLTAGE))
+        Voltage = int(Voltage) if Voltage.is_integer() else Voltage
+
+        raw_output = self.generate_rule_output_raw(rule_text)
+        with span("parse_model_output"):
+            codding, trigger_conditions = parse_model_output(raw_output)
+            unknown_signals = resolve_signals(trigger_conditions, self.signals, Bus) if self.signals else []
+            if unknown_signals:
+                logger.debug("%s: signals not in the signal database: %s", row["DTC"], ", ".join(unknown_signals))
+            if assign_values:
+                assign_test_values(trigger_conditions, increment_text, self.signals, self.rng)
+
+        data = {
+            "tester_name": format_tester_name(tester_name),
+            "dtc_code": row["DTC"],
+            "ECU": ECU,
+            "Bus": Bus,
+            "Debounce": Debounce,
+            "Pwf": Pwf,
+            "Voltage": Voltage,
+            "codding": codding,
+            "trigger_conditions": trigger_conditions,
+            "timing": compute_wait_windows(Debounce),
+            "unknown_signals": unknown_signals,
+        }
+        data["estimated_runtime_ms"] = estimate_test_runtime_ms(data)
+        data["estimated_runtime"] = format_duration(data["estimated_runtime_ms"])
+        if self.version:
+            data["model_version"] = self.version
+        if "Source" in row:
+            # Rows of a DTC index (generator/ingest.py) keep track of their workbook
+            data["source"] = f"{row['Source']} [{row['Sheet']}] row {row['Row']}"
+        return data
+
+    def generate_workbook(self, df, tester_name="", increment_text=""):
+        """Return the template data of every row of a DTC workbook.
+
+        The error/normal values of all trigger conditions are computed in one batch
+        once the model has run on every row.
+        """
+        data_list = [
+            self.build_test_data(row, tester_name, increment_text, assign_values=False)
+            for _, row in df.iterrows()
+        ]
+        with span("boundary_values"):
+            unreachable = assign_boundary_values(
+                [data["trigger_conditions"] for data in data_list], increment_text, self.signals, self.rng,
+            )
+        if unreachable:
+            logger.warning("%d trigger condition(s) cannot be met within their signal range", unreachable)
+        unknown = {name for data in data_list for name in data["unknown_signals"]}
+        if unknown:
+            logger.warning("%d signal(s) emitted by the model are not in the signal database: %s",
+                           len(unknown), ", ".join(sorted(unknown)))
+        return data_list
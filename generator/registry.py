@@ -0,0 +1,167 @@
+# === System Imports and Path Setup ===
+import os
+import sys
+import json
+import shutil
+import argparse
+from pathlib import Path
+from datetime import datetime
+
+# Add parent directory to sys.path (before local imports)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from generator.pipeline import MODEL_DIR
+
+# === Configuration ===
+# One sub-folder per model version (a save_pretrained checkpoint plus its metadata)
+MODEL_REGISTRY = os.getenv("KPIT_MODEL_REGISTRY", str(Path(__file__).resolve().parent.parent / "model_registry"))
+METADATA_FILE = "kpit_model.json"
+# Name of the active version, read by every running app (GUI, watch mode) to switch models
+CURRENT_FILE = "CURRENT"
+
+
+def is_version_name(version):
+    """True for a plain folder name of the registry (no path, no hidden or reserved name)"""
+    return (isinstance(version, str) and bool(version) and Path(version).name == version
+            and not version.startswith(".") and version != CURRENT_FILE)
+
+
+class ModelRegistry:
+    """Versioned checkpoints of the fine-tuned T5 model in a local folder.
+
+    <root>/<version>/ holds a checkpoint and METADATA_FILE (creation date, source,
+    notes, evaluation scores); <root>/CURRENT names the active version. Versions
+    are published and activated with a rename, so a reader never sees a partial
+    checkpoint or pointer. Without any version the legacy MODEL_DIR is used.
+    """
+
+    def __init__(self, root=MODEL_REGISTRY):
+        self.root = Path(root)
+
+    def path(self, version):
+        return self.root / version
+
+    def metadata(self, version):
+        with open(self.path(version) / METADATA_FILE, encoding="utf-8") as f:
+            return json.load(f)
+
+    def versions(self):
+        """Metadata of every version, oldest first"""
+        if not self.root.is_dir():
+            return []
+        # Hidden ".vNNN.part" folders are registrations still being copied (or interrupted)
+        versions = [self.metadata(child.name) for child in self.root.iterdir()
+                    if is_version_name(child.name) and (child / METADATA_FILE).is_file()]
+        return sorted(versions, key=lambda meta: (meta.get("created_at", ""), meta["version"]))
+
+    def _next_version(self):
+        numbers = [int(meta["version"][1:]) for meta in self.versions()
+                   if meta["version"][:1] == "v" and meta["version"][1:].isdigit()]
+        return f"v{max(numbers, default=0) + 1:03d}"
+
+    def register(self, source_dir, version=None, eval_scores=None, notes="", activate=False):
+        """Copy a checkpoint folder into the registry as a new version; returns its metadata"""
+        source_dir = Path(source_dir)
+        if not (source_dir / "config.json").is_file():
+            raise ValueError(f"{source_dir} is not a model checkpoint (no config.json)")
+        version = version or self._next_version()
+        if not is_version_name(version):
+            raise ValueError(f"Invalid model version name {version!r}")
+        if self.path(version).exists():
+            raise ValueError(f"Model version {version} already exists")
+
+        metadata = {
+            "version": version,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "source": str(source_dir.resolve()),
+            "notes": notes,
+            "eval": eval_scores or {},
+        }
+        temp_dir = self.root / f".{version}.part"
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        shutil.copytree(source_dir, temp_dir)
+        with open(temp_dir / METADATA_FILE, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2)
+        os.rename(temp_dir, self.path(version))
+        if activate:
+            self.activate(version)
+        return metadata
+
+    def current(self):
+        """Active version, or None (no registry, no CURRENT or a deleted version)"""
+        try:
+            version = (self.root / CURRENT_FILE).read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+        return version if version and (self.path(version) / METADATA_FILE).is_file() else None
+
+    def activate(self, version):
+        """Make version the active one for every app following the registry"""
+        if not is_version_name(version) or not (self.path(version) / METADATA_FILE).is_file():
+            raise ValueError(f"Unknown model version {version!r}")
+        temp_path = self.root / f".{CURRENT_FILE}.{os.getpid()}.tmp"
+        temp_path.write_text(version + "\n", encoding="utf-8")
+        os.replace(temp_path, self.root / CURRENT_FILE)
+
+    def resolve(self, version=None):
+        """(model_dir, version) of version, else of the active one, else (MODEL_DIR, None)"""
+        if version:
+            if not is_version_name(version) or not (self.path(version) / METADATA_FILE).is_file():
+                raise ValueError(f"Unknown model version {version!r}")
+            return str(self.path(version)), version
+        current = self.current()
+        if current:
+            return str(self.path(current)), current
+        return MODEL_DIR, None
+
+
+def format_versions(registry):
+    current = registry.current()
+    lines = []
+    for meta in registry.versions():
+        scores = ", ".join(f"{name}={value:.4g}" if isinstance(value, (int, float)) else f"{name}={value}"
+                           for name, value in (meta.get("eval") or {}).items())
+        marker = "*" if meta["version"] == current else " "
+        lines.append(f"{marker} {meta['version']:<10} {meta.get('created_at', ''):<20} {scores}  {meta.get('notes', '')}")
+    return "\n".join(lines) if lines else f"No model version in {registry.root} (using {MODEL_DIR})"
+
+
+# === Command Line ===
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the versioned checkpoints of the DTC model")
+    parser.add_argument("--registry", default=MODEL_REGISTRY, help="Registry folder (default: KPIT_MODEL_REGISTRY)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List the versions (* marks the active one)")
+    register = commands.add_parser("register", help="Copy a checkpoint folder into the registry")
+    register.add_argument("checkpoint", help="Folder written by save_pretrained (e.g. t5_model)")
+    register.add_argument("--version", help="Version name (default: next vNNN)")
+    register.add_argument("--eval", help="JSON file of evaluation scores (e.g. trainer.evaluate() output)")
+    register.add_argument("--notes", default="", help="Free text stored with the version")
+    register.add_argument("--activate", action="store_true", help="Also make it the active version")
+    activate = commands.add_parser("activate", help="Switch every running app to this version")
+    activate.add_argument("version")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    registry = ModelRegistry(args.registry)
+    try:
+        if args.command == "register":
+            eval_scores = None
+            if args.eval:
+                with open(args.eval, encoding="utf-8") as f:
+                    eval_scores = json.load(f)
+            metadata = registry.register(args.checkpoint, args.version, eval_scores, args.notes, args.activate)
+            print(f"Registered {metadata['version']} in {registry.root}")
+        elif args.command == "activate":
+            registry.activate(args.version)
+            print(f"Active model version: {args.version}")
+        else:
+            print(format_versions(registry))
+    except (OSError, ValueError) as e:
+        sys.exit(str(e))
+
+
+if __name__ == "__main__":
+    main()
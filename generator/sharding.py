@@ -0,0 +1,55 @@
+import os
+import heapq
+
+from generator.export import write_suites
+from generator.timing import format_duration
+
+
+def shard_suites(suites, shard_count):
+    """Bin-pack planned suites into shard_count runtime-balanced shards.
+
+    Longest-processing-time first: suites are taken from the longest estimate down
+    and always given to the currently least loaded shard, which keeps the makespan
+    within 4/3 of the optimum. Returns a list of shards, each
+    {"index", "suites", "makespan_ms"}.
+    """
+    shard_count = max(1, min(shard_count, len(suites) or 1))
+    shards = [{"index": i + 1, "suites": [], "makespan_ms": 0} for i in range(shard_count)]
+    heap = [(0, i) for i in range(shard_count)]
+
+    ordered = sorted(suites, key=lambda planned: planned[1]["estimated_runtime_ms"], reverse=True)
+    for planned in ordered:
+        load, i = heapq.heappop(heap)
+        shards[i]["suites"].append(planned)
+        load += planned[1]["estimated_runtime_ms"]
+        shards[i]["makespan_ms"] = load
+        heapq.heappush(heap, (load, i))
+    return shards
+
+
+def format_shard_report(shards):
+    total_ms = sum(shard["makespan_ms"] for shard in shards)
+    lines = [f"{len(shards)} shards, total bench time {format_duration(total_ms)}"]
+    for shard in shards:
+        lines.append(
+            f"shard_{shard['index']:02d}: {len(shard['suites'])} suites, "
+            f"expected makespan {format_duration(shard['makespan_ms'])}"
+        )
+    makespan = max((shard["makespan_ms"] for shard in shards), default=0)
+    lines.append(f"Expected completion of all benches: {format_duration(makespan)}")
+    return "\n".join(lines)
+
+
+def write_shards(shards, output_dir, writer=write_suites):
+    """Write each shard into output_dir/shard_NN (one directory per HiL bench) plus a report.
+
+    writer(suites, directory) writes the suites of one shard, e.g. bench-state ordered.
+    """
+    paths = []
+    for shard in shards:
+        shard_dir = os.path.join(output_dir, f"shard_{shard['index']:02d}")
+        paths += writer(shard["suites"], shard_dir)
+
+    with open(os.path.join(output_dir, "shards_report.txt"), "w", encoding="utf-8") as f:
+        f.write(format_shard_report(shards) + "\n")
+    return paths
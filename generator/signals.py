@@ -0,0 +1,266 @@
+import os
+import re
+import json
+import logging
+from pathlib import Path
+
+from generator.tracing import span
+
+# === Configuration ===
+# DBC/LDF files, or directories of them, separated by os.pathsep (unset: no signal database)
+SIGNAL_DB = os.getenv("KPIT_SIGNAL_DB", "")
+# Per-user cache folder (%LOCALAPPDATA% on Windows), not the install folder other users can write to
+USER_CACHE_DIR = Path(os.getenv("LOCALAPPDATA") or os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "kpit"
+SIGNAL_CACHE = os.getenv("KPIT_SIGNAL_CACHE", str(USER_CACHE_DIR / "signal_index.json"))
+SIGNAL_DB_SUFFIXES = (".dbc", ".ldf")
+# Bump when the cached records change shape
+CACHE_VERSION = 2
+# Cached record fields (tuples: a fraction of the size of dicts once serialized); key is signal_key(name)
+RECORD_FIELDS = ("name", "message", "message_id", "bus", "factor", "offset", "minimum", "maximum", "unit", "key")
+# Fields of the resolved record kept on a trigger condition (its value grid and range)
+CONDITION_FIELDS = ("factor", "offset", "minimum", "maximum", "unit")
+
+_NOT_KEY = re.compile(r"[^0-9a-z]")
+
+logger = logging.getLogger(__name__)
+
+
+def signal_key(name):
+    """Lookup key of a signal name: case, "_", "-", "." and blanks are ignored"""
+    return _NOT_KEY.sub("", str(name).lower())
+
+
+# === DBC ===
+_DBC_MESSAGE = re.compile(r"^BO_\s+(\d+)\s+(\w+)\s*:")
+_DBC_SIGNAL = re.compile(
+    r"^SG_\s+(\w+)\s*(?:\w+\s*)?:\s*\d+\|\d+@[01][+-]\s*"
+    r"\(\s*([^,\s]+)\s*,\s*([^)\s]+)\s*\)\s*\[\s*([^|\s]+)\s*\|\s*([^\]\s]+)\s*\]\s*\"([^\"]*)\""
+)
+
+
+def parse_dbc(path):
+    """Signal records of a DBC file; the bus is named after the file"""
+    bus = Path(path).stem
+    records, message, message_id = [], None, None
+    with open(path, encoding="latin-1") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("BO_ "):
+                match = _DBC_MESSAGE.match(line)
+                if match:
+                    # Bit 31 only flags an extended (29-bit) identifier
+                    message_id = f"0x{int(match.group(1)) & 0x1FFFFFFF:X}"
+                    message = match.group(2)
+            elif line.startswith("SG_ ") and message:
+                match = _DBC_SIGNAL.match(line)
+                if match:
+                    name, factor, offset, minimum, maximum, unit = match.groups()
+                    records.append((name, message, message_id, bus, float(factor), float(offset),
+                                    float(minimum), float(maximum), unit, signal_key(name)))
+    return records
+
+
+# === LDF ===
+def _ldf_section(text, name):
+    """Body of a top-level "name { ... }" block of an LDF file ("" when missing)"""
+    match = re.search(rf"\b{name}\s*\{{", text)
+    if not match:
+        return ""
+    depth, start = 1, match.end()
+    for position in range(start, len(text)):
+        if text[position] == "{":
+            depth += 1
+        elif text[position] == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:position]
+    return text[start:]
+
+
+def parse_ldf(path):
+    """Signal records of a LIN description file; the bus is named after the file"""
+    bus = Path(path).stem
+    with open(path, encoding="latin-1") as f:
+        text = re.sub(r"//[^\n]*|/\*.*?\*/", "", f.read(), flags=re.DOTALL)
+
+    frames = {}
+    for frame, frame_id, body in re.findall(r"(\w+)\s*:\s*(\w+)\s*,[^{;]*\{([^}]*)\}", _ldf_section(text, "Frames")):
+        for signal in re.findall(r"(\w+)\s*,\s*\d+\s*;", body):
+            frames[signal] = (frame, f"0x{int(frame_id, 0):X}")
+
+    # Encoding name -> (factor, offset, minimum, maximum, unit) of its physical ranges
+    encodings = {}
+    for encoding, body in re.findall(r"(\w+)\s*\{([^}]*)\}", _ldf_section(text, "Signal_encoding_types")):
+        ranges = re.findall(
+            r"physical_value\s*,\s*([^,\s]+)\s*,\s*([^,\s]+)\s*,\s*([^,\s]+)\s*,\s*([^,;\s]+)\s*(?:,\s*\"([^\"]*)\")?",
+            body,
+        )
+        if ranges:
+            factor, offset = float(ranges[0][2]), float(ranges[0][3])
+            physical = [float(raw) * float(scale) + float(shift)
+                        for low, high, scale, shift, _ in ranges for raw in (low, high)]
+            encodings[encoding] = (factor, offset, min(physical), max(physical), ranges[0][4])
+    representation = {}
+    for encoding, names in re.findall(r"(\w+)\s*:\s*([^;]*);", _ldf_section(text, "Signal_representation")):
+        for signal in re.split(r"\s*,\s*", names.strip()):
+            representation[signal] = encoding
+
+    records = []
+    for name, size in re.findall(r"(\w+)\s*:\s*(\d+)\s*,", _ldf_section(text, "Signals")):
+        frame, frame_id = frames.get(name, (None, None))
+        encoding = encodings.get(representation.get(name))
+        if encoding:
+            factor, offset, minimum, maximum, unit = encoding
+        else:
+            # Raw signal: its size gives the range
+            factor, offset, minimum, maximum, unit = 1.0, 0.0, 0.0, float(2 ** int(size) - 1), ""
+        records.append((name, frame, frame_id, bus, factor, offset, minimum, maximum, unit, signal_key(name)))
+    return records
+
+
+PARSERS = {".dbc": parse_dbc, ".ldf": parse_ldf}
+
+
+# === Index ===
+class SignalIndex:
+    """Signals of the DBC/LDF files of every bus, by name.
+
+    lookup() resolves a model-emitted signal name with one dict access: exact
+    names first, then names compared without case and separators ("vehicle_speed"
+    finds "VehicleSpeed"). A name defined on several buses is resolved on the given
+    bus when possible. get() gives the record of an exact name, so that the index
+    can also be passed as signals to generator/boundary.py.
+    """
+
+    def __init__(self, records=()):
+        self.records = {}
+        self._by_key = {}
+        self._by_bus_key = {}
+        bus_keys = {}
+        for record in records:
+            record = dict(zip(RECORD_FIELDS, record))
+            if record["bus"] not in bus_keys:
+                bus_keys[record["bus"]] = signal_key(record["bus"])
+            self.records.setdefault(record["name"], record)
+            self._by_key.setdefault(record["key"], record)
+            self._by_bus_key.setdefault((bus_keys[record["bus"]], record["key"]), record)
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, name, default=None):
+        return self.records.get(name, default)
+
+    def lookup(self, name, bus=None):
+        """Record of a signal (exact or normalized name, on bus when given), or None"""
+        key = signal_key(name)
+        if bus is not None:
+            record = self._by_bus_key.get((signal_key(bus), key))
+            if record is not None:
+                return record
+        return self.records.get(name) or self._by_key.get(key)
+
+
+def find_signal_files(paths):
+    """Expand directories into the DBC/LDF files they contain (sorted)"""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files += sorted(child for child in path.iterdir() if child.suffix.lower() in SIGNAL_DB_SUFFIXES)
+        elif path.suffix.lower() in SIGNAL_DB_SUFFIXES:
+            files.append(path)
+        else:
+            logger.warning("Not a DBC/LDF file, ignored: %s", path)
+    return files
+
+
+def _read_cache(cache_path):
+    """Cached files: path -> ((size, mtime_ns), records); {} when missing, stale or malformed.
+
+    The cache is plain JSON (strings and numbers only), so reading it never runs code.
+    """
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cache = json.load(f)
+        if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+            return {}
+        return {
+            path: (tuple(stat), [tuple(record) for record in records])
+            for path, (stat, records) in cache["files"].items()
+        }
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return {}
+
+
+def _write_cache(cache_path, files):
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "files": files}, f, separators=(",", ":"))
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        logger.warning("Signal index cache not written (%s): %s", cache_path, e)
+
+
+def load_signal_index(paths, cache_path=SIGNAL_CACHE):
+    """Build the SignalIndex of DBC/LDF files (or directories of them).
+
+    The records of each file are cached in cache_path (JSON), keyed by the file
+    path, size and modification time: only new or changed files are parsed again.
+    cache_path=None disables the cache.
+    """
+    with span("signals.load"):
+        cached = _read_cache(cache_path) if cache_path else {}
+        files, parsed = {}, 0
+        for path in find_signal_files(paths):
+            stat = path.stat()
+            entry = cached.get(str(path.resolve()))
+            if entry and entry[0] == (stat.st_size, stat.st_mtime_ns):
+                files[str(path.resolve())] = entry
+                continue
+            try:
+                records = PARSERS[path.suffix.lower()](path)
+            except (OSError, ValueError) as e:
+                logger.error("Cannot read signal database %s: %s", path, e)
+                continue
+            files[str(path.resolve())] = ((stat.st_size, stat.st_mtime_ns), records)
+            parsed += 1
+        if cache_path and (parsed or files.keys() != cached.keys()):
+            _write_cache(cache_path, files)
+        index = SignalIndex(record for _, records in files.values() for record in records)
+    logger.info("Signal index: %d signals from %d file(s) (%d parsed)", len(index), len(files), parsed)
+    return index
+
+
+_default_index = None
+
+
+def default_signal_index():
+    """SignalIndex of KPIT_SIGNAL_DB, loaded once per process (None when it is not set)"""
+    global _default_index
+    if _default_index is None and SIGNAL_DB:
+        _default_index = load_signal_index(SIGNAL_DB.split(os.pathsep))
+    return _default_index
+
+
+def resolve_signals(trigger_conditions, index, bus=None):
+    """Replace model-emitted signal names by their database name (in place).
+
+    Resolved conditions get the message and message_id of the signal, and as signal
+    the range of the record found on that bus (CONDITION_FIELDS, used by
+    generator/boundary.py); the others are flagged unknown_signal. Returns the names
+    that were not found.
+    """
+    unknown = []
+    for cond in trigger_conditions:
+        record = index.lookup(cond["variable"], bus)
+        if record is None:
+            cond["unknown_signal"] = True
+            unknown.append(cond["variable"])
+            continue
+        cond["variable"] = record["name"]
+        cond["message"] = record["message"]
+        cond["message_id"] = record["message_id"]
+        cond["signal"] = {field: record[field] for field in CONDITION_FIELDS}
+    return unknown
@@ -0,0 +1,101 @@
+import os
+
+# === Configuration ===
+# Extra time granted on top of the DTC debounce before the check times out
+DEBOUNCE_MARGIN_MS = int(os.getenv("KPIT_DEBOUNCE_MARGIN_MS", "500"))
+# Interval between two DTC memory reads while polling
+POLL_INTERVAL_MS = int(os.getenv("KPIT_POLL_INTERVAL_MS", "100"))
+# Below this debounce the "not yet active" check is skipped (it would race the ECU)
+MIN_PRE_CHECK_DEBOUNCE_MS = 200
+
+# Assumed duration (ms) of the fixed bench steps of the template, used for estimates only
+BENCH_DELAYS_MS = {
+    "setup_teardown": 2000,   # Setup Testcase + TearDown Testcase
+    "pwf_to_pad": 1000,       # SET Pwf to PAD + wait for ST_CON_VEH
+    "diag_logger": 200,       # Step_Diag_Logger_SetSendDiag_Enable_Trace_Climate
+    "power_supply": 500,      # Power Supply Set Voltage
+    "clear_dtc": 300,         # Clear All Dtc
+    "clear_memory": 1000,     # Wait time ${Hildelay_ClearMemory}
+    "dtc_read": 150,          # One Dtc ... In Memory keyword
+    "set_signal": 100,        # Set / Remove trigger conditions
+}
+
+
+def compute_wait_windows(debounce_ms, margin_ms=DEBOUNCE_MARGIN_MS, poll_ms=POLL_INTERVAL_MS):
+    """Compute the wait/poll windows of one DTC from its debounce time.
+
+    - pre_check_ms: wait before asserting the DTC is *not yet* active (half the debounce),
+      None when the debounce is too short to check reliably
+    - timeout_ms: how long to poll for the DTC to become active / healed
+    - poll_ms: polling interval of Wait Until Keyword Succeeds
+    """
+    debounce_ms = max(int(debounce_ms), 0)
+    pre_check_ms = debounce_ms // 2 if debounce_ms >= MIN_PRE_CHECK_DEBOUNCE_MS else None
+    return {
+        "debounce_ms": debounce_ms,
+        "pre_check_ms": pre_check_ms,
+        "timeout_ms": debounce_ms + margin_ms,
+        "poll_ms": poll_ms,
+    }
+
+
+def estimate_test_runtime_ms(data, bench_delays=None):
+    """Estimate the expected bench time (ms) of one rendered DTC test case"""
+    delays = dict(BENCH_DELAYS_MS, **(bench_delays or {}))
+    timing = data.get("timing") or compute_wait_windows(data.get("Debounce", 1000))
+
+    precondition = (
+        delays["setup_teardown"] + delays["pwf_to_pad"] + delays["diag_logger"]
+        + delays["power_supply"] + delays["clear_dtc"] + delays["clear_memory"]
+        + delays["dtc_read"]
+    )
+
+    # Per condition: set + poll until active + read, remove + poll until healed + read,
+    # plus the optional "not yet active" / "still active" reads half-way through the debounce
+    pre_checks = 3 * delays["dtc_read"] if timing["pre_check_ms"] is not None else 0
+    # The DTC flips on average half a poll interval after the debounce elapsed
+    state_change = timing["debounce_ms"] + timing["poll_ms"] // 2
+    per_condition = (
+        2 * delays["set_signal"] + pre_checks
+        + 2 * (state_change + delays["dtc_read"])
+    )
+
+    conditions = max(len(data.get("trigger_conditions", [])), 1)
+    return precondition + conditions * per_condition
+
+
+def estimate_group_runtime_ms(group, bench_delays=None):
+    """Estimate the bench time (ms) of a merged test that checks several DTCs per trigger"""
+    delays = dict(BENCH_DELAYS_MS, **(bench_delays or {}))
+    dtc_count = len(group["dtcs"])
+    timing = group["timing"]
+
+    precondition = (
+        delays["setup_teardown"] + delays["pwf_to_pad"] + delays["diag_logger"]
+        + delays["power_supply"] + delays["clear_dtc"] + delays["clear_memory"]
+        + dtc_count * delays["dtc_read"]
+    )
+
+    # The condition is set once; all DTCs debounce in parallel, the slowest one dominates
+    pre_checked = sum(member["timing"]["pre_check_ms"] is not None for member in group["dtcs"])
+    pre_checks = 3 * pre_checked * delays["dtc_read"] if timing["pre_check_ms"] is not None else 0
+    state_change = timing["debounce_ms"] + timing["poll_ms"] // 2
+    per_condition = (
+        2 * delays["set_signal"] + pre_checks
+        + 2 * (state_change + dtc_count * delays["dtc_read"])
+    )
+
+    conditions = max(len(group.get("trigger_conditions", [])), 1)
+    return precondition + conditions * per_condition
+
+
+def format_duration(ms):
+    """Human readable duration used in suite metadata and UI messages"""
+    seconds = ms / 1000.0
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    if minutes < 60:
+        return f"{minutes}min {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}min"
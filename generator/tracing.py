@@ -0,0 +1,149 @@
+import os
+import json
+import time
+import atexit
+import bisect
+import threading
+from functools import wraps
+from collections import deque
+from contextlib import contextmanager
+
+# === Configuration ===
+# When set, the Chrome trace of the process is written to this file at exit
+TRACE_FILE = os.getenv("KPIT_TRACE_FILE")
+# Upper bounds (ms) of the histogram buckets; the last bucket takes everything above
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000)
+MAX_TRACE_EVENTS = 100_000
+
+
+class StageStats:
+    """Duration histogram of one pipeline stage"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+
+    def add(self, ms):
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+        self.buckets[bisect.bisect_left(HISTOGRAM_BOUNDS_MS, ms)] += 1
+
+    def percentile(self, q):
+        """Estimate the q-th percentile (0-100), interpolating inside the histogram bucket"""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                low = HISTOGRAM_BOUNDS_MS[i - 1] if i else 0.0
+                high = HISTOGRAM_BOUNDS_MS[i] if i < len(HISTOGRAM_BOUNDS_MS) else self.max_ms
+                low, high = max(low, self.min_ms), min(high, self.max_ms)
+                return low + (high - low) * (rank - seen) / n
+            seen += n
+        return self.max_ms
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "min_ms": round(self.min_ms, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "max_ms": round(self.max_ms, 3),
+            "histogram": dict(zip([f"<={b}ms" for b in HISTOGRAM_BOUNDS_MS] + ["more"], self.buckets)),
+        }
+
+
+class Tracer:
+    """Span timers around the stages of the generation pipeline.
+
+    Every span updates the histogram of its stage and is kept (bounded) as a Chrome
+    trace event, viewable in chrome://tracing or https://ui.perfetto.dev.
+    """
+
+    def __init__(self, max_events=MAX_TRACE_EVENTS):
+        self.enabled = True
+        self.stages = {}
+        self.events = deque(maxlen=max_events)
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name, **args):
+        """Time the enclosed block as one occurrence of stage `name`"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter(), args)
+
+    def traced(self, name=None):
+        """Decorator timing every call of a function as stage `name` (default: its qualified name)"""
+        def decorator(func):
+            stage = name or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, name, start, end, args=None):
+        ms = (end - start) * 1000
+        event = {
+            "name": name, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+            "ts": round((start - self._origin) * 1e6, 1), "dur": round(ms * 1000, 1),
+        }
+        if args:
+            event["args"] = {key: str(value) for key, value in args.items()}
+        with self._lock:
+            self.stages.setdefault(name, StageStats()).add(ms)
+            self.events.append(event)
+
+    def summary(self):
+        """Per-stage statistics, most expensive stage (total time) first"""
+        with self._lock:
+            stats = [dict(stage=name, **stage.as_dict()) for name, stage in self.stages.items()]
+        return sorted(stats, key=lambda stage: stage["total_ms"], reverse=True)
+
+    def format_summary(self):
+        lines = [f"{'stage':<28}{'count':>7}{'mean':>10}{'p50':>10}{'p95':>10}{'max':>10}{'total':>11}"]
+        for stage in self.summary():
+            lines.append(
+                f"{stage['stage']:<28}{stage['count']:>7}{stage['mean_ms']:>8.1f}ms{stage['p50_ms']:>8.1f}ms"
+                f"{stage['p95_ms']:>8.1f}ms{stage['max_ms']:>8.1f}ms{stage['total_ms'] / 1000:>10.2f}s"
+            )
+        return "\n".join(lines)
+
+    def write_chrome_trace(self, path):
+        """Write the recorded spans as a Chrome trace (JSON), with the stage statistics"""
+        with self._lock:
+            events = list(self.events)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms", "stages": self.summary()}, f)
+        return path
+
+    def reset(self):
+        with self._lock:
+            self.stages.clear()
+            self.events.clear()
+
+
+# Global tracer instance shared by the GUI, the CLIs and the server
+tracer = Tracer()
+span = tracer.span
+traced = tracer.traced
+
+if TRACE_FILE:
+    atexit.register(tracer.write_chrome_trace, TRACE_FILE)
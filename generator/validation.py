@@ -0,0 +1,190 @@
+import re
+
+import pandas as pd
+
+# === Configuration ===
+# Canonical column name -> accepted spellings (compared case-insensitively, blanks collapsed)
+COLUMN_ALIASES = {
+    "DTC": ("DTC", "DTC ID", "DTC_ID", "DTC Code"),
+    "ECU": ("ECU", "ECU Name"),
+    "BUS": ("BUS", "Bus Type"),
+    "Debounce time": ("Debounce time", "Debounce time (ms)", "Debounce time [ms]", "Debounce (ms)", "Debounce"),
+    "Implementation": ("Implementation", "Implementation rule"),
+    "PWF": ("PWF", "Pwf state", "Power mode"),
+    "Voltage": ("Voltage", "Voltage (V)", "Voltage [V]", "Supply voltage"),
+}
+REQUIRED_COLUMNS = ("DTC", "Implementation")
+DEFAULT_DEBOUNCE_MS = 1000
+# Bench precondition of a test when the sheet does not give one (SET Pwf to PAD, 12 V supply)
+DEFAULT_PWF = "PAD"
+DEFAULT_VOLTAGE = 12
+# UDS DTC number: three bytes written as 0x + 6 hex digits
+DTC_PATTERN = r"0x[0-9A-Fa-f]{6}"
+HEX_CODE_PATTERN = r"0x[0-9A-Fa-f]+"
+# First data row of a sheet read with pandas' default header (row 1)
+FIRST_EXCEL_ROW = 2
+
+
+def _column_key(name):
+    return re.sub(r"\s+", " ", str(name)).strip().lower()
+
+
+_ALIAS_TO_COLUMN = {_column_key(alias): column for column, aliases in COLUMN_ALIASES.items() for alias in aliases}
+
+
+class WorkbookValidationError(ValueError):
+    """Raised when a workbook has errors; the full ValidationReport is attached"""
+
+    def __init__(self, report):
+        super().__init__(report.format())
+        self.report = report
+
+
+class ValidationReport:
+    """Errors (the row cannot be generated) and warnings (a default is used) of one sheet.
+
+    Each issue is a dict with the DataFrame index, the Excel row number (both None
+    for sheet-level issues), the column and a message; issues of a merged DTC index
+    (generator/ingest.py) also name their source sheet.
+    """
+
+    def __init__(self, source="", row_count=0):
+        self.source = source
+        self.row_count = row_count
+        self.errors = []
+        self.warnings = []
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    @property
+    def invalid_index(self):
+        """DataFrame index of the rows with at least one error"""
+        return {issue["index"] for issue in self.errors if issue["index"] is not None}
+
+    @property
+    def sheet_errors(self):
+        return [issue for issue in self.errors if issue["index"] is None]
+
+    def add(self, column, message, mask=None, level="error"):
+        """Add one issue per True row of mask (boolean Series), or one sheet-level issue"""
+        issues = self.errors if level == "error" else self.warnings
+        if mask is None:
+            issues.append({"index": None, "row": None, "column": column, "message": message})
+            return
+        positions = mask.to_numpy(dtype=bool).nonzero()[0]
+        for position in positions:
+            issues.append({
+                "index": mask.index[position], "row": int(position) + FIRST_EXCEL_ROW,
+                "column": column, "message": message,
+            })
+
+    def errors_for(self, index):
+        """Errors preventing the generation of one row (sheet-level errors included)"""
+        return [issue for issue in self.errors if issue["index"] is None or issue["index"] == index]
+
+    def format(self, limit=50):
+        lines = [
+            f"{self.source + ': ' if self.source else ''}{self.row_count} rows, "
+            f"{len(self.errors)} error(s), {len(self.warnings)} warning(s)"
+        ]
+        for level, issues in (("ERROR", self.errors), ("WARNING", self.warnings)):
+            for issue in issues[:limit]:
+                where = f"row {issue['row']}" if issue["row"] is not None else "sheet"
+                if issue.get("source"):
+                    where = f"{issue['source']} {where}"
+                lines.append(f"  {level} {where}, {issue['column']}: {issue['message']}")
+            if len(issues) > limit:
+                lines.append(f"  ... {len(issues) - limit} more {level.lower()}(s)")
+        return "\n".join(lines)
+
+
+def normalize_columns(df):
+    """Rename aliased columns (e.g. "Debounce time (ms)") to the names used by the pipeline"""
+    renames = {}
+    for name in df.columns:
+        column = _ALIAS_TO_COLUMN.get(_column_key(name))
+        if column and column not in renames.values() and column not in df.columns:
+            renames[name] = column
+    return df.rename(columns=renames) if renames else df
+
+
+def _blank(series):
+    return series.isna() | (series.astype("string").str.strip() == "")
+
+
+def validate_workbook(df, source=""):
+    """Check a whole DTC sheet at once; returns (normalized DataFrame, ValidationReport).
+
+    Column aliases are renamed, DTC IDs are stripped and empty ECU/BUS/Debounce
+    cells get the pipeline defaults, so that every row without errors can be passed
+    to DtcTestGenerator.build_test_data. Every check is one vectorized operation
+    over the sheet: a report takes milliseconds even for thousands of rows.
+    """
+    df = normalize_columns(df)
+    report = ValidationReport(source, len(df))
+
+    missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    for column in missing:
+        aliases = ", ".join(f'"{alias}"' for alias in COLUMN_ALIASES[column])
+        report.add(column, f"missing column (accepted names: {aliases})")
+    if missing:
+        return df, report
+
+    df = df.copy()
+
+    # --- DTC: present, 0x + 6 hex digits; repeated IDs keep their first row --- #
+    dtc = df["DTC"].astype("string").str.strip()
+    df["DTC"] = dtc.astype(object).where(dtc.notna(), None)
+    dtc_blank = _blank(dtc)
+    report.add("DTC", "empty DTC ID", dtc_blank)
+    bad_format = ~dtc_blank & ~dtc.str.fullmatch(DTC_PATTERN).fillna(False).astype(bool)
+    report.add("DTC", "DTC ID is not a 0x + 6 hex digits code", bad_format)
+    duplicated = ~dtc_blank & dtc.str.lower().duplicated(keep="first").fillna(False).astype(bool)
+    report.add("DTC", "duplicate DTC ID, ignored (the first row with this DTC is used)", duplicated, level="warning")
+
+    # --- Implementation: present, with at least one hex code for the triggers --- #
+    implementation_blank = _blank(df["Implementation"])
+    report.add("Implementation", "empty Implementation", implementation_blank)
+    no_hex = ~implementation_blank & ~df["Implementation"].astype("string").str.contains(
+        HEX_CODE_PATTERN, regex=True
+    ).fillna(False).astype(bool)
+    report.add("Implementation", "no hex code (e.g. [0x1B2]) for the trigger conditions", no_hex, level="warning")
+
+    # --- Debounce time: numeric, not negative (empty: default) --- #
+    if "Debounce time" in df.columns:
+        raw = df["Debounce time"]
+        debounce = pd.to_numeric(raw, errors="coerce")
+        debounce_blank = _blank(raw)
+        report.add("Debounce time", "Debounce time is not a number", debounce.isna() & ~debounce_blank)
+        report.add("Debounce time", "negative Debounce time", debounce < 0)
+        report.add("Debounce time", f"empty Debounce time, {DEFAULT_DEBOUNCE_MS} ms used", debounce_blank,
+                   level="warning")
+        df["Debounce time"] = debounce.fillna(DEFAULT_DEBOUNCE_MS)
+    else:
+        report.add("Debounce time", f"no Debounce time column, {DEFAULT_DEBOUNCE_MS} ms used", level="warning")
+
+    # --- Voltage (bench precondition): optional, numeric --- #
+    if "Voltage" in df.columns:
+        raw = df["Voltage"]
+        voltage = pd.to_numeric(raw, errors="coerce")
+        report.add("Voltage", "Voltage is not a number", voltage.isna() & ~_blank(raw))
+        df["Voltage"] = voltage.astype(object).where(voltage.notna(), raw)
+
+    # --- ECU / BUS / PWF / Voltage: optional, the pipeline defaults are used when empty --- #
+    for column, default in (("ECU", "ECU1"), ("BUS", "BUS"), ("PWF", DEFAULT_PWF), ("Voltage", DEFAULT_VOLTAGE)):
+        if column in df.columns:
+            blank = _blank(df[column])
+            report.add(column, f"empty {column}, \"{default}\" used", blank, level="warning")
+            df[column] = df[column].where(~blank, default)
+
+    return df, report
+
+
+def load_workbook(path, sheet_name=0):
+    """Read and validate one sheet; raises WorkbookValidationError on sheet-level errors"""
+    df, report = validate_workbook(pd.read_excel(path, sheet_name=sheet_name), source=str(path))
+    if report.sheet_errors:
+        raise WorkbookValidationError(report)
+    return df, report
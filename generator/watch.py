@@ -0,0 +1,346 @@
+# === System Imports and Path Setup ===
+import os
+import sys
+import json
+import time
+import select
+import struct
+import hashlib
+import logging
+import argparse
+from pathlib import Path
+
+# Add parent directory to sys.path (before local imports)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from generator.pipeline import DECODING, DECODING_MODES, MODEL_DIR
+from generator.ingest import WORKBOOK_SUFFIXES, load_dtc_index
+from generator.export import test_case_filename, write_suites
+from generator.validation import WorkbookValidationError
+from generator.tracing import span
+from server.logging_config import setup_logging
+
+logger = logging.getLogger("generator.watch")
+
+# === Configuration ===
+# Seconds without new event on a workbook before it is regenerated (Excel saves in several writes)
+WATCH_DEBOUNCE_S = float(os.getenv("KPIT_WATCH_DEBOUNCE_S", "2"))
+# Polling period of the fallback watcher (network shares, Windows, macOS)
+WATCH_POLL_INTERVAL_S = float(os.getenv("KPIT_WATCH_POLL_INTERVAL_S", "1"))
+STATE_FILE = ".kpit_watch.json"
+# Columns that define a generated test; Source/Sheet/Row only change its metadata
+INPUT_COLUMNS = ("DTC", "Implementation", "ECU", "BUS", "Debounce time")
+
+
+def is_workbook(name):
+    return Path(name).suffix.lower() in WORKBOOK_SUFFIXES and not Path(name).name.startswith("~$")
+
+
+# === Watchers ===
+class InotifyWatcher:
+    """Names of the files written, moved or deleted in one directory (Linux inotify, via libc)"""
+
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_DELETE = 0x200
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, directory):
+        import ctypes
+        import ctypes.util
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_FROM | self.IN_MOVED_TO | self.IN_DELETE
+        if self._libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"inotify_add_watch failed for {directory}")
+
+    def poll(self, timeout):
+        """Wait up to timeout seconds; returns the set of changed file names"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        names, offset = set(), 0
+        while offset < len(data):
+            _, _, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            names.add(os.fsdecode(data[offset:offset + length].rstrip(b"\0")))
+            offset += length
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Same interface as InotifyWatcher, comparing (mtime, size) snapshots of the directory"""
+
+    def __init__(self, directory, interval=WATCH_POLL_INTERVAL_S):
+        self.directory = directory
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    stat = entry.stat()
+                    snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self, timeout):
+        time.sleep(min(timeout, self.interval))
+        snapshot = self._scan()
+        names = {name for name in snapshot.keys() | self.snapshot.keys()
+                 if snapshot.get(name) != self.snapshot.get(name)}
+        self.snapshot = snapshot
+        return names
+
+    def close(self):
+        pass
+
+
+def make_watcher(directory, polling=False):
+    """inotify on Linux (local disks), polling elsewhere or when inotify is unavailable"""
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directory)
+        except OSError as e:
+            logger.warning("inotify unavailable (%s), polling %s every %ss", e, directory, WATCH_POLL_INTERVAL_S)
+    return PollingWatcher(directory)
+
+
+# === Incremental Regeneration ===
+def row_fingerprint(row):
+    values = [str(row[column]) if column in row else "" for column in INPUT_COLUMNS]
+    return hashlib.sha1("\x1f".join(values).encode("utf-8")).hexdigest()
+
+
+class WorkbookSync:
+    """Keeps output_dir/<workbook>/ in line with the workbooks of a directory.
+
+    The fingerprint of every generated row and its template data are kept in
+    output_dir/.kpit_watch.json. A sync only runs the model on the added or changed
+    DTCs, re-renders moved rows from the kept data, and deletes the tests of removed
+    DTCs. The state survives restarts, so only what changed while stopped is redone.
+    """
+
+    def __init__(self, models, output_dir, tester_name="", increment_text=""):
+        self.models = models
+        self.output_dir = output_dir
+        self.tester_name = tester_name
+        self.increment_text = increment_text
+        self.state_path = os.path.join(output_dir, STATE_FILE)
+        self.state = self._load_state()
+
+    def _options(self):
+        return {"tester": self.tester_name, "increment": self.increment_text,
+                "decoding": self.models.options.get("decoding", DECODING), "model_dir": self.models.model_dir}
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {"options": self._options(), "workbooks": {}}
+        if state.get("options") != self._options():
+            logger.info("Generation options changed, every DTC will be regenerated")
+            state = {"options": self._options(), "workbooks": {}}
+        return state
+
+    def _save_state(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, default=str)
+        os.replace(temp_path, self.state_path)
+
+    @staticmethod
+    def _check_complete(known, report):
+        """Raise WorkbookValidationError unless every sheet of the workbook could be read.
+
+        The DTCs of an unreadable sheet, or of a sheet skipped for lack of DTC columns
+        (e.g. read while Excel is still writing it), would otherwise look removed and
+        their tests would be deleted. The state is left untouched for the next event.
+        """
+        generated = {entry["data"].get("source", "").rpartition(" row ")[0] for entry in known.values()}
+        for issue in report.warnings:
+            if issue["index"] is None and issue["column"] == "sheet" and issue.get("source") in generated:
+                report.errors.append(dict(issue, message=f"{issue['message']}, its generated DTCs are kept"))
+        if report.sheet_errors:
+            raise WorkbookValidationError(report)
+
+    def sync(self, path):
+        """Regenerate the changed DTCs of one workbook; returns the change summary"""
+        name = Path(path).name
+        target_dir = os.path.join(self.output_dir, Path(path).stem)
+        known = self.state["workbooks"].get(name, {})
+        if not known and not os.path.exists(path):
+            return None  # temporary file of a save, already renamed
+        start = time.perf_counter()
+
+        if not os.path.exists(path):
+            changes = {"added": [], "changed": [], "moved": [], "removed": sorted(known), "invalid": []}
+            df = None
+        else:
+            with span("watch.read"):
+                df, report = load_dtc_index([path], workers=1)
+            self._check_complete(known, report)
+            if not report.ok:
+                logger.warning("%s", report.format(limit=20))
+            invalid = report.invalid_index
+            rows = {row["DTC"]: row for index, row in df.iterrows() if index not in invalid}
+            changes = {"added": [], "changed": [], "moved": [], "invalid": sorted(
+                str(df.at[index, "DTC"]) for index in invalid
+            )}
+            for dtc, row in rows.items():
+                entry = known.get(dtc)
+                if entry is None:
+                    changes["added"].append(dtc)
+                elif entry["fingerprint"] != row_fingerprint(row):
+                    changes["changed"].append(dtc)
+                elif entry["data"].get("source") != f"{row['Source']} [{row['Sheet']}] row {row['Row']}":
+                    changes["moved"].append(dtc)
+            # Invalid rows keep their previous test until they are fixed
+            changes["removed"] = sorted(set(known) - set(rows) - set(changes["invalid"]))
+
+        updated = dict(known)
+        suites = []
+        if changes["added"] or changes["changed"]:
+            with self.models.use() as generator:
+                for dtc in changes["added"] + changes["changed"]:
+                    data = generator.build_test_data(rows[dtc], self.tester_name, self.increment_text)
+                    updated[dtc] = {"fingerprint": row_fingerprint(rows[dtc]), "data": data}
+                    suites.append((test_case_filename(data), data, False))
+        for dtc in changes["moved"]:
+            row = rows[dtc]
+            data = dict(known[dtc]["data"], source=f"{row['Source']} [{row['Sheet']}] row {row['Row']}")
+            updated[dtc] = dict(known[dtc], data=data)
+            suites.append((test_case_filename(data), data, False))
+        if suites:
+            write_suites(suites, target_dir)
+        for dtc in changes["removed"]:
+            updated.pop(dtc, None)
+            test_path = os.path.join(target_dir, test_case_filename({"dtc_code": dtc}))
+            if os.path.exists(test_path):
+                os.remove(test_path)
+
+        if updated:
+            self.state["workbooks"][name] = updated
+        else:
+            self.state["workbooks"].pop(name, None)
+        self._save_state()
+
+        changes["seconds"] = time.perf_counter() - start
+        if any(changes[key] for key in ("added", "changed", "moved", "removed", "invalid")):
+            logger.info(
+                "%s: %d added, %d changed, %d moved, %d removed, %d invalid in %.1fs%s",
+                name, len(changes["added"]), len(changes["changed"]), len(changes["moved"]),
+                len(changes["removed"]), len(changes["invalid"]), changes["seconds"],
+                "".join(f"\n  {key}: {', '.join(map(str, changes[key]))}"
+                        for key in ("added", "changed", "removed", "invalid") if changes[key]),
+            )
+        else:
+            logger.info("%s: no DTC change", name)
+        return changes
+
+
+def watch(directory, sync, debounce_s=WATCH_DEBOUNCE_S, polling=False, stop=None):
+    """Sync every workbook of directory, then each one again once its saves have settled.
+
+    Runs until stop() returns True (default: forever, Ctrl+C to quit).
+    """
+    for name in sorted(os.listdir(directory)):
+        if is_workbook(name):
+            _sync_safely(sync, os.path.join(directory, name))
+
+    watcher = make_watcher(directory, polling)
+    logger.info("Watching %s (%s, debounce %.1fs)", directory, type(watcher).__name__, debounce_s)
+    pending = {}  # workbook name -> time of its last event
+    retried = set()
+    try:
+        while stop is None or not stop():
+            now = time.monotonic()
+            timeout = min((pending[name] + debounce_s - now for name in pending), default=1.0)
+            for name in watcher.poll(max(0.05, min(timeout, 1.0))):
+                if is_workbook(name):
+                    pending[name] = time.monotonic()
+            now = time.monotonic()
+            for name in [name for name, last in pending.items() if now - last >= debounce_s]:
+                del pending[name]
+                if not _sync_safely(sync, os.path.join(directory, name)) and name not in retried:
+                    # Most likely still being written: try once more after another quiet period
+                    retried.add(name)
+                    pending[name] = now
+                else:
+                    retried.discard(name)
+            sync.models.evict_if_idle()
+            sync.models.check_registry()
+    finally:
+        watcher.close()
+
+
+def _sync_safely(sync, path):
+    try:
+        with span("watch.sync"):
+            sync.sync(path)
+        return True
+    except Exception as e:
+        logger.warning("%s could not be synchronized: %s", Path(path).name, e)
+        return False
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Watch a folder of DTC workbooks and regenerate the test cases of the DTCs that change"
+    )
+    parser.add_argument("directory", help="Folder where the DTC workbooks are saved")
+    parser.add_argument("-o", "--output-dir", default="generated_tests",
+                        help="One sub-folder of .robot files per workbook")
+    parser.add_argument("--tester", default="", help="Tester name written in the suite metadata")
+    parser.add_argument("--increment", default="", help="Fixed increment for error/normal values")
+    parser.add_argument("--decoding", choices=DECODING_MODES, default=DECODING)
+    parser.add_argument("--model-dir", default=None,
+                        help=f"Checkpoint folder (default: the active registry version, else {MODEL_DIR})")
+    parser.add_argument("--model-version",
+                        help="Pin a registry version (default: follow the active one, switched without restart)")
+    parser.add_argument("--debounce", type=float, default=WATCH_DEBOUNCE_S,
+                        help="Seconds of quiet after a save before regenerating (default: KPIT_WATCH_DEBOUNCE_S)")
+    parser.add_argument("--poll", action="store_true",
+                        help="Poll the folder instead of using inotify (network shares)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logging("watch")
+
+    from generator.lifecycle import ModelLifecycle
+    from generator.registry import ModelRegistry
+
+    if not os.path.isdir(args.directory):
+        sys.exit(f"{args.directory} is not a directory")
+    try:
+        models = ModelLifecycle(args.model_dir, registry=ModelRegistry(), version=args.model_version,
+                                decoding=args.decoding)
+    except ValueError as e:
+        sys.exit(str(e))
+    sync = WorkbookSync(models, args.output_dir, args.tester, args.increment)
+    try:
+        watch(args.directory, sync, args.debounce, args.poll)
+    except KeyboardInterrupt:
+        logger.info("Stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,57 +1,68 @@
 # === System Imports ===
 import sys
-import time
-import socket
+import os
+import logging
+import threading
 import subprocess
 from pathlib import Path
 
 # === Configuration ===
 FLASK_HOST = "127.0.0.1"
 FLASK_PORT =  8000 
+# Set KPIT_DEV_SERVER=1 to use the Werkzeug development server instead of waitress
+USE_DEV_SERVER = os.getenv("KPIT_DEV_SERVER") == "1"
+# Shared with server/readiness.py (GUI side) before it is imported
+os.environ.setdefault("KPIT_SERVER_URL", f"http://localhost:{FLASK_PORT}")
 
 # Add the current directory to local imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-# === Utils ===
-def is_port_open(host=FLASK_HOST, port=FLASK_PORT):
-    """Check if a TCP port is open."""
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.settimeout(0.5)
-        return s.connect_ex((host, port)) == 0
+from server.logging_config import setup_logging
+
+logger = logging.getLogger("run")
 
+# === Utils ===
 def run_flask():
     """Launch the Flask redirect server as a subprocess"""
+    if USE_DEV_SERVER:
+        command = [sys.executable, "server/redirect_server.py"]
+    else:
+        command = [sys.executable, "server/wsgi.py", "--port", str(FLASK_PORT)]
     proc = subprocess.Popen(
-        [sys.executable, "server/redirect_server.py"],
+        command,
         stdout=sys.stdout,  
         stderr=sys.stderr
     )
     return proc
 
+def watch_flask(proc):
+    """Report server readiness in the background without blocking the GUI"""
+    from server.readiness import wait_for_server
+
+    if wait_for_server(timeout=30.0):
+        logger.info("Flask server is running on http://%s:%s", FLASK_HOST, FLASK_PORT)
+    elif proc.poll() is not None:
+        logger.error("Flask server exited with code %s. Check logs/server.log for errors.", proc.returncode)
+    else:
+        logger.warning("Flask server is not ready yet. Password reset will wait for it when used.")
+
 # === Main Execution ===
 if __name__ == "__main__":
-    print("🚀 Starting Flask redirect server...")
+    setup_logging("app")
+    logger.info("Starting Flask redirect server...")
     flask_proc = run_flask()
 
-    # Wait until Flask has fully started
-    for i in range(20):  #Ensure Flask starts within 10 seconds.
-        if is_port_open():
-            print(f"Flask server is running on http://{FLASK_HOST}:{FLASK_PORT}")
-            break
-        time.sleep(0.5)
-    else:
-        print("Flask server did not start. Check console logs for errors.")
-        flask_proc.terminate()
-        sys.exit(1)
+    # Server and GUI start concurrently; readiness is checked through /healthz
+    threading.Thread(target=watch_flask, args=(flask_proc,), daemon=True).start()
 
     try:
-        print("🎨 Starting PyQt5 application...")
+        logger.info("Starting PyQt5 application...")
         from frontend.main import main
         main()  # Launch the PyQt application
     except Exception as e:
-        print(f"Error while running PyQt app: {str(e)}")
+        logger.exception("Error while running PyQt app: %s", e)
     finally:
-        print("Stopping Flask server...")
+        logger.info("Stopping Flask server...")
         flask_proc.terminate()
         flask_proc.wait()
-        print("Flask server terminated.")
+        logger.info("Flask server terminated.")
@@ -0,0 +1,71 @@
+# === System Imports and Path Setup ===
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add parent directory to sys.path (before local imports)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.supabase_config import SupabaseConfig
+from server.supabase_stub import SupabaseStub
+
+# fresh: a new config (own transport) per call, i.e. a new connection every time;
+# pooled: a new client per call on the shared transport (like create_auth_client);
+# shared: one client for every call (like get_client)
+MODES = ("fresh", "pooled", "shared")
+
+
+def stub_config(url):
+    config = SupabaseConfig()
+    config.url, config.key, config.service_key = url, "stub-anon-key", None
+    return config
+
+
+def run_mode(mode, url, calls):
+    """Seconds per PostgREST select of mode"""
+    shared_config = stub_config(url)
+    shared_client = shared_config.create_client()
+    start = time.perf_counter()
+    for _ in range(calls):
+        if mode == "fresh":
+            client = stub_config(url).create_client()
+        elif mode == "pooled":
+            client = shared_config.create_client()
+        else:
+            client = shared_client
+        client.table("users").select("*").execute()
+        if mode == "fresh":
+            client.postgrest.session.close()
+    return (time.perf_counter() - start) / calls
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Latency of PostgREST calls with and without connection reuse")
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Delay the stub adds to every response")
+    parser.add_argument("--connect-ms", type=float, default=30.0,
+                        help="Delay the stub adds to every new connection (TCP + TLS handshake)")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with SupabaseStub(latency=args.latency_ms / 1000, connect_latency=args.connect_ms / 1000) as stub:
+        print(f"PostgREST stub on {stub.url}: {args.latency_ms:g} ms per call, {args.connect_ms:g} ms per connection, "
+              f"{args.calls} selects per mode")
+        seconds = {}
+        for mode in args.modes:
+            run_mode(mode, stub.url, 2)  # Warm-up: imports
+            connections = stub.connections
+            seconds[mode] = run_mode(mode, stub.url, args.calls)
+            print(f"{mode:>7}: {1000 * seconds[mode]:6.1f} ms/call, "
+                  f"{stub.connections - connections} connections opened")
+        for mode in seconds:
+            if "fresh" in seconds and mode != "fresh":
+                print(f"{mode} saves {1000 * (seconds['fresh'] - seconds[mode]):.1f} ms/call vs fresh")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# === System Imports and Path Setup ===
+import os
+import sys
+import time
+import socket
+import argparse
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to sys.path (before local imports)
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from server.supabase_stub import SupabaseStub
+
+# Commands serving the redirect server on {port}: the Werkzeug development server and server/wsgi.py
+BACKENDS = {
+    "dev": [sys.executable, "-c", "from server.redirect_server import app; app.run(host='127.0.0.1', port={port})"],
+    "waitress": [sys.executable, "server/wsgi.py", "--host", "127.0.0.1", "--port", "{port}", "--threads", "{threads}"],
+    "gunicorn": [sys.executable, "server/wsgi.py", "--backend", "gunicorn", "--host", "127.0.0.1", "--port", "{port}",
+                 "--threads", "{threads}", "--workers", "{workers}"],
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_backend(backend, port, stub_url, threads, workers):
+    command = [part.format(port=port, threads=threads, workers=workers) for part in BACKENDS[backend]]
+    env = dict(os.environ, SUPABASE_URL=stub_url, SUPABASE_KEY="stub-anon-key", SUPABASE_SERVICE_KEY="stub-service-key",
+               KPIT_LOG_CONSOLE="0", PYTHONPATH=str(ROOT))
+    proc = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return proc
+
+
+def wait_ready(url, timeout=30.0):
+    import requests
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(url, timeout=2).status_code < 500:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def run_load(url, requests_count, concurrency):
+    """(requests/s, p50 ms, p95 ms, errors) of requests_count GETs sent by concurrency clients"""
+    import requests
+
+    def client(count):
+        latencies, errors = [], 0
+        with requests.Session() as session:
+            for _ in range(count):
+                start = time.perf_counter()
+                try:
+                    ok = session.get(url, timeout=30).status_code < 500
+                except requests.RequestException:
+                    ok = False
+                latencies.append(time.perf_counter() - start)
+                errors += not ok
+        return latencies, errors
+
+    counts = [requests_count // concurrency + (i < requests_count % concurrency) for i in range(concurrency)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(client, counts))
+    elapsed = time.perf_counter() - start
+    latencies = sorted(latency for result, _ in results for latency in result)
+    errors = sum(error for _, error in results)
+    return (len(latencies) / elapsed, 1000 * latencies[len(latencies) // 2],
+            1000 * latencies[int(len(latencies) * 0.95) - 1], errors)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput of the redirect server backends against a local Supabase stub")
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=["dev", "waitress"])
+    parser.add_argument("--path", default="/healthz", help="Route to load (default: /healthz, one Supabase call)")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=30.0, help="Delay added by the stub to every Supabase call")
+    parser.add_argument("--threads", type=int, default=16, help="Threads per worker (waitress/gunicorn)")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes (gunicorn)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with SupabaseStub(latency=args.latency_ms / 1000) as stub:
+        print(f"Supabase stub on {stub.url} ({args.latency_ms:g} ms per call), "
+              f"{args.requests} x GET {args.path}, {args.concurrency} clients")
+        for backend in args.backends:
+            port = free_port()
+            proc = start_backend(backend, port, stub.url, args.threads, args.workers)
+            try:
+                url = f"http://127.0.0.1:{port}{args.path}"
+                if not wait_ready(url):
+                    print(f"{backend:>9}: did not start")
+                    continue
+                run_load(url, args.concurrency, args.concurrency)  # Warm-up: connections and imports
+                rate, p50, p95, errors = run_load(url, args.requests, args.concurrency)
+                print(f"{backend:>9}: {rate:7.1f} req/s, p50 {p50:6.1f} ms, p95 {p95:6.1f} ms, {errors} errors")
+            finally:
+                proc.terminate()
+                proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import os
+import sys
+import queue
+import atexit
+import logging
+import threading
+import contextvars
+from pathlib import Path
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# === Logging Settings (shared by the server, the GUI and run.py) ===
+LOG_LEVEL = os.getenv("KPIT_LOG_LEVEL", "INFO").upper()
+LOG_DIR = os.getenv("KPIT_LOG_DIR", str(Path(__file__).resolve().parent.parent / "logs"))
+LOG_MAX_BYTES = int(os.getenv("KPIT_LOG_MAX_BYTES", str(5 * 2**20)))
+LOG_BACKUP_COUNT = int(os.getenv("KPIT_LOG_BACKUP_COUNT", "5"))
+LOG_CONSOLE = os.getenv("KPIT_LOG_CONSOLE", "1") == "1"
+# Chatty third-party loggers (one INFO line per HTTP call), kept at WARNING unless KPIT_LOG_LEVEL=DEBUG
+QUIET_LOGGERS = ("httpx", "httpcore", "hpack")
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(process)d %(name)s [%(request_id)s] %(message)s"
+
+# Correlation ID of the Flask request being handled by the current thread ("-" outside requests)
+request_id_var = contextvars.ContextVar("request_id", default="-")
+
+_lock = threading.Lock()
+_listener = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp every record with the current request ID.
+
+    Attached to the queue handler so that the ID is read in the thread that logs,
+    not in the listener thread that writes the record.
+    """
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+def _build_handlers(name, level, console):
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = []
+    if console:
+        stream = logging.StreamHandler(sys.stderr)
+        stream.setFormatter(formatter)
+        handlers.append(stream)
+    try:
+        os.makedirs(LOG_DIR, exist_ok=True)
+        file_handler = RotatingFileHandler(
+            os.path.join(LOG_DIR, f"{name}.log"), maxBytes=LOG_MAX_BYTES,
+            backupCount=LOG_BACKUP_COUNT, encoding="utf-8", delay=True,
+        )
+    except OSError as e:
+        print(f"Log file disabled ({LOG_DIR}): {e}", file=sys.stderr)
+    else:
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    for handler in handlers:
+        handler.setLevel(level)
+    return handlers
+
+
+def setup_logging(name, level=LOG_LEVEL, console=LOG_CONSOLE):
+    """Route the root logger of this process to the console and to LOG_DIR/<name>.log.
+
+    Records are put on an in-memory queue and written by a background listener
+    thread, so logging never blocks a request or the Qt event loop on I/O. Only the
+    first call of a process configures anything.
+    """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return
+        handlers = _build_handlers(name, level, console)
+        queue_handler = QueueHandler(queue.SimpleQueue())
+        queue_handler.addFilter(RequestIdFilter())
+
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(queue_handler)
+        if logging.getLevelName(level) != logging.DEBUG:
+            for quiet in QUIET_LOGGERS:
+                logging.getLogger(quiet).setLevel(logging.WARNING)
+        _listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_stop_listener)
+
+        if hasattr(os, "register_at_fork"):
+            # Pre-forked servers (gunicorn): the listener thread does not survive the fork.
+            # Each worker gets its own queue, listener and file (rotation is not process-safe).
+            def restart_in_child():
+                global _listener
+                for handler in handlers:
+                    handler.close()
+                queue_handler.queue = queue.SimpleQueue()
+                child_handlers = _build_handlers(f"{name}-{os.getpid()}", level, console)
+                _listener = QueueListener(queue_handler.queue, *child_handlers, respect_handler_level=True)
+                _listener.start()
+
+            os.register_at_fork(after_in_child=restart_in_child)
+
+
+def _stop_listener():
+    """Flush the queued records before the interpreter exits"""
+    if _listener is not None:
+        _listener.stop()
@@ -0,0 +1,36 @@
+import os
+import time
+
+# Base URL of the local redirect server (reset links and admin panel)
+SERVER_URL = os.getenv("KPIT_SERVER_URL", "http://localhost:8000")
+HEALTH_URL = f"{SERVER_URL}/healthz"
+
+
+def is_server_ready(timeout=2.0):
+    """Return True if the redirect server answers /healthz with a ready status.
+
+    /healthz checks Supabase itself (KPIT_HEALTH_TIMEOUT, 1 s by default), so the
+    timeout leaves room for that round trip.
+    """
+    import requests
+
+    try:
+        response = requests.get(HEALTH_URL, timeout=timeout)
+    except requests.RequestException:
+        return False
+    return response.status_code == 200
+
+
+def wait_for_server(timeout=10.0, interval=0.2):
+    """Block until the redirect server is ready or the timeout expires.
+
+    Only callers that actually need the server (e.g. sending a reset link)
+    should wait on it; the GUI starts without it.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        if is_server_ready():
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
@@ -1,55 +1,153 @@
 import os
+import logging
+import threading
 from dotenv import load_dotenv
 
 # Load environment variables from .env filet
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# === HTTP Settings (shared by every Supabase client) ===
+HTTP_CONNECT_TIMEOUT = float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("SUPABASE_READ_TIMEOUT", "20"))
+HTTP_RETRIES = int(os.getenv("SUPABASE_HTTP_RETRIES", "2"))  # Connection failures only, safe for POST/PUT
+HTTP_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("SUPABASE_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_KEEPALIVE_EXPIRY", "60"))
+
 
 class SupabaseConfig:
     def __init__(self):
         self.url = os.getenv("SUPABASE_URL")
         self.key = os.getenv("SUPABASE_ANON_KEY") or os.getenv("SUPABASE_KEY")  # Try both key names
+        self.service_key = os.getenv("SUPABASE_SERVICE_KEY")
         self.client = None
+        self.admin_client = None
+        self._transport = None
+        self._auth_http_client = None
+        self._lock = threading.Lock()
+
+        # Debug information (lazy: nothing is formatted unless DEBUG is enabled)
+        logger.debug("SUPABASE_URL set = %s, SUPABASE_KEY set = %s", bool(self.url), bool(self.key))
+        logger.debug("Current working directory = %s, .env file exists = %s", os.getcwd(), os.path.exists(".env"))
+
+    def get_transport(self):
+        """Returns the pooled HTTP/2 transport shared by all Supabase clients"""
+        with self._lock:
+            if self._transport is None:
+                import httpx
+
+                self._transport = httpx.HTTPTransport(
+                    http2=True,
+                    retries=HTTP_RETRIES,
+                    limits=httpx.Limits(
+                        max_connections=HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                    ),
+                )
+            return self._transport
+
+    def create_http_client(self):
+        """Returns a new httpx client on top of the shared connection pool.
 
-        # Debug information
-        print(f"DEBUG: SUPABASE_URL = {self.url}")
-        print(f"DEBUG: SUPABASE_KEY found = {'Yes' if self.key else 'No'}")
-        print(f"DEBUG: Current working directory = {os.getcwd()}")
-        print(f"DEBUG: .env file exists = {os.path.exists('.env')}")
+        Each Supabase sub-client needs its own httpx.Client because PostgREST
+        and storage rewrite the base URL and auth headers of the client they
+        are given; the connections themselves live in the shared transport.
+        """
+        import httpx
+
+        return httpx.Client(
+            transport=self.get_transport(),
+            timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            follow_redirects=True,
+        )
+
+    def create_client(self, key=None, **options):
+        """Creates a Supabase client whose sub-clients use the pooled transport"""
+        try:
+            from supabase import ClientOptions
+            from server.supabase_pooled import PooledClient
+        except ImportError:
+            logger.error("Supabase module is not installed. Please install it using: pip install supabase")
+            raise Exception("Supabase module not installed. Please run: pip install supabase")
+
+        key = key or self.key
+        if not self.url or not key:
+            missing_vars = []
+            if not self.url:
+                missing_vars.append("SUPABASE_URL")
+            if not key:
+                missing_vars.append("SUPABASE_ANON_KEY or SUPABASE_KEY")
+
+            raise ValueError(
+                f"Missing environment variables: {', '.join(missing_vars)}. Please check your .env file.")
+
+        client_options = ClientOptions(**options)
+        return PooledClient(self.url, key, client_options, new_http_client=self.create_http_client)
 
     def get_client(self):
         """Returns the initialized Supabase client"""
         if not self.client:
             try:
-                from supabase import create_client, Client
-
-                if not self.url or not self.key:
-                    missing_vars = []
-                    if not self.url:
-                        missing_vars.append("SUPABASE_URL")
-                    if not self.key:
-                        missing_vars.append("SUPABASE_ANON_KEY or SUPABASE_KEY")
-
-                    raise ValueError(
-                        f"Missing environment variables: {', '.join(missing_vars)}. Please check your .env file.")
-
-                self.client = create_client(self.url, self.key)
-                print("✅ Supabase client initialized successfully")
+                self.client = self.create_client()
+                logger.info("Supabase client initialized")
                 return self.client
 
-            except ImportError:
-                print("Supabase module is not installed. Please install it using: pip install supabas")
-                raise Exception("Supabase module not installed. Please run: pip install supabase")
             except Exception as e:
-                print(f"Supabase configuration error: {e}")
+                logger.error("Supabase configuration error: %s", e)
                 raise Exception(f"Supabase configuration error: {e}")
 
         return self.client
 
+    def get_admin_client(self):
+        """Returns the service-role client, or the anon client when no service key is set"""
+        if not self.admin_client:
+            if not self.service_key:
+                return self.get_client()
+            try:
+                self.admin_client = self.create_client(self.service_key)
+                logger.info("Supabase admin client initialized")
+            except Exception as e:
+                logger.error("Supabase configuration error: %s", e)
+                raise Exception(f"Supabase configuration error: {e}")
+
+        return self.admin_client
+
+    def get_auth_http_client(self):
+        """Returns the httpx client of the per-request auth clients (GoTrue never modifies it)"""
+        if self._auth_http_client is None:
+            http_client = self.create_http_client()
+            with self._lock:
+                if self._auth_http_client is None:
+                    self._auth_http_client = http_client
+        return self._auth_http_client
+
+    def create_auth_client(self):
+        """Returns a short-lived auth client for one request's user session.
+
+        A bare GoTrue client (no PostgREST, storage or realtime) on the shared
+        httpx client: sessions set on it never touch the shared clients, so
+        concurrent requests (e.g. password resets) cannot clobber each other.
+        """
+        from gotrue import SyncGoTrueClient
+
+        if not self.url or not self.key:
+            raise ValueError("Missing environment variables: SUPABASE_URL or SUPABASE_ANON_KEY/SUPABASE_KEY. "
+                             "Please check your .env file.")
+        return SyncGoTrueClient(
+            url=f"{self.url}/auth/v1",
+            headers={"apiKey": self.key, "Authorization": f"Bearer {self.key}"},
+            http_client=self.get_auth_http_client(),
+            auto_refresh_token=False,
+            persist_session=False,
+        )
+
     def is_configured(self):
         """Check if Supabase is properly configured"""
         return bool(self.url and self.key)
 
 
 # Global instance
-supabase_config = SupabaseConfig()
\ No newline at end of file
+supabase_config = SupabaseConfig()
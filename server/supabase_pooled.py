@@ -0,0 +1,41 @@
+import copy
+
+from supabase import Client
+from supafunc import SyncFunctionsClient
+
+
+class PooledClient(Client):
+    """Supabase client whose sub-clients (GoTrue, PostgREST, storage, functions) each get
+    their own httpx.Client from new_http_client.
+
+    supabase-py hands options.httpx_client to every sub-client, and PostgREST and storage
+    rewrite the base URL and headers of the client they are given: on one shared
+    httpx.Client they would overwrite each other. The httpx clients share the pooled
+    transport of SupabaseConfig, so the connections are still reused. Sub-clients are
+    rebuilt on sign-in/sign-out (supabase-py resets them) and get fresh httpx clients too.
+    """
+
+    def __init__(self, supabase_url, supabase_key, options, new_http_client):
+        self._new_http_client = new_http_client
+        super().__init__(supabase_url, supabase_key, options)
+
+    def _init_supabase_auth_client(self, auth_url, client_options, **kwargs):
+        client_options = copy.copy(client_options)
+        client_options.httpx_client = self._new_http_client()
+        return super()._init_supabase_auth_client(auth_url=auth_url, client_options=client_options, **kwargs)
+
+    def _init_postgrest_client(self, http_client=None, **kwargs):
+        return super()._init_postgrest_client(http_client=self._new_http_client(), **kwargs)
+
+    def _init_storage_client(self, http_client=None, **kwargs):
+        return super()._init_storage_client(http_client=self._new_http_client(), **kwargs)
+
+    @property
+    def functions(self):
+        if self._functions is None:
+            self._functions = SyncFunctionsClient(
+                url=self.functions_url,
+                headers=self.options.headers,
+                http_client=self._new_http_client(),
+            )
+        return self._functions
@@ -0,0 +1,139 @@
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class SupabaseStubHandler(BaseHTTPRequestHandler):
+    """Minimal Supabase API (auth health, user and PostgREST tables) for load tests"""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+    disable_nagle_algorithm = True  # Headers and body are written separately
+
+    def setup(self):
+        # Once per connection: stands for the TCP + TLS handshake with the hosted API
+        if self.server.connect_latency:
+            time.sleep(self.server.connect_latency)
+        super().setup()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body=None):
+        self.server.count_request(self.command, self.path)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        data = b"" if body is None else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/auth/v1/health":
+            self._reply(200, {"name": "GoTrue", "version": "stub"})
+        elif path == "/auth/v1/user":
+            self._reply(200, self.server.user(self.headers.get("Authorization", "")))
+        elif path.startswith("/rest/v1/"):
+            self._reply(200, self.server.rows)
+        else:
+            self._reply(404, {"message": "not found"})
+
+    def do_PUT(self):
+        if self.path.split("?")[0] == "/auth/v1/user":
+            authorization = self.headers.get("Authorization", "")
+            self.server.set_password(authorization, self._read_body().get("password"))
+            self._reply(200, self.server.user(authorization))
+        else:
+            self._reply(404, {"message": "not found"})
+
+    def do_PATCH(self):
+        self._read_body()
+        self._reply(200, self.server.rows[:1])
+
+    def do_POST(self):
+        self._read_body()
+        path = self.path.split("?")[0]
+        if path == "/auth/v1/logout":
+            self._reply(204)
+        elif path == "/auth/v1/recover":
+            self._reply(200, {})
+        else:
+            self._reply(404, {"message": "not found"})
+
+
+class SupabaseStub(ThreadingHTTPServer):
+    """Local stand-in for a Supabase project, served from a background thread.
+
+    latency (seconds) is added to every response to mimic the round trip to the
+    hosted API, connect_latency to every new connection (handshake). connections
+    counts the connections opened and requests the calls per "METHOD /path", so
+    tests can check what a client actually sent; password_updates lists the
+    (bearer token, password) of every PUT /auth/v1/user.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, connect_latency=0.0, rows=None):
+        super().__init__((host, port), SupabaseStubHandler)
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.connections = 0
+        self.rows = rows if rows is not None else [{"id": 1, "email": "user@example.com", "status": "pending"}]
+        self.requests = {}
+        self.password_updates = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def process_request(self, request, client_address):
+        with self._lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+    def count_request(self, method, path):
+        key = f"{method} {path.split('?')[0]}"
+        with self._lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def set_password(self, authorization, password):
+        with self._lock:
+            self.password_updates.append((authorization.removeprefix("Bearer "), password))
+
+    def user(self, authorization):
+        """User answered for a bearer token: the token is echoed so callers can tell sessions apart"""
+        token = authorization.removeprefix("Bearer ")
+        return {
+            "id": f"user-{token}",
+            "aud": "authenticated",
+            "role": "authenticated",
+            "email": f"{token}@example.com",
+            "app_metadata": {},
+            "user_metadata": {},
+            "created_at": "2025-01-01T00:00:00Z",
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
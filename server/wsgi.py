@@ -0,0 +1,85 @@
+# === System Imports and Path Setup ===
+import os
+import sys
+import logging
+import argparse
+from pathlib import Path
+
+# Add parent directory to sys.path (before local imports)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.logging_config import setup_logging
+
+logger = logging.getLogger("server.wsgi")
+
+# === Configuration ===
+DEFAULT_HOST = os.getenv("KPIT_SERVER_HOST", "0.0.0.0")
+DEFAULT_PORT = int(os.getenv("KPIT_SERVER_PORT", "8000"))
+DEFAULT_THREADS = int(os.getenv("KPIT_SERVER_THREADS", "8"))
+DEFAULT_WORKERS = int(os.getenv("KPIT_SERVER_WORKERS", "2"))
+DEFAULT_BACKEND = os.getenv("KPIT_SERVER_BACKEND", "waitress")
+
+
+# === Serving Backends ===
+def serve_waitress(app, host, port, threads):
+    """Serve the app with waitress (multi-threaded, works on Windows and Linux)"""
+    from waitress import serve
+
+    logger.info("Serving with waitress on http://%s:%s (%s threads)", host, port, threads)
+    serve(app, host=host, port=port, threads=threads, ident="KPIT")
+
+
+def serve_gunicorn(app, host, port, workers, threads):
+    """Serve the app with gunicorn (pre-forked workers, POSIX only)"""
+    from gunicorn.app.base import BaseApplication
+
+    class KpitApplication(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    options = {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "threads": threads,
+        "worker_class": "gthread",
+    }
+    logger.info("Serving with gunicorn on http://%s:%s (%s workers x %s threads)", host, port, workers, threads)
+    KpitApplication(app, options).run()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="KPIT redirect server (production mode)")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--backend", choices=["waitress", "gunicorn"], default=DEFAULT_BACKEND)
+    parser.add_argument("--threads", type=int, default=DEFAULT_THREADS, help="Threads per worker")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Worker processes (gunicorn only)")
+    return parser.parse_args(argv)
+
+
+# === Main Entry Point ===
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logging("server")
+
+    from server.redirect_server import app
+
+    if args.backend == "gunicorn" and sys.platform != "win32":
+        serve_gunicorn(app, args.host, args.port, args.workers, args.threads)
+    else:
+        if args.backend == "gunicorn":
+            logger.warning("gunicorn is not available on Windows, falling back to waitress")
+        serve_waitress(app, args.host, args.port, args.threads)
+
+
+if __name__ == "__main__":
+    main()
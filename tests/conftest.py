@@ -0,0 +1,11 @@
+import os
+import sys
+from pathlib import Path
+
+# Add the repository root to sys.path (before local imports)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# server.redirect_server refuses to import without credentials; tests point it at a stub
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_KEY", "test-anon-key")
+os.environ.setdefault("KPIT_LOG_CONSOLE", "0")
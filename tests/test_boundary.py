@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from generator.boundary import OPERATOR_CODES, assign_boundary_values, boundary_values
+
+
+def condition(operator, value, variable="VehSpeed"):
+    return {"variable": variable, "operator": operator, "value": str(value)}
+
+
+@pytest.mark.parametrize("value", [0.05, 12.34, -3.21])
+def test_unknown_resolution_keeps_exact_thresholds(value):
+    equal, different = condition("==", value), condition("!=", value)
+    assign_boundary_values([[equal, different]], rng=np.random.default_rng(0))
+
+    assert equal["error_value"] == value
+    assert equal["normal_value"] != value
+    assert different["normal_value"] == value
+    assert different["error_value"] != value
+
+
+@pytest.mark.parametrize("operator", [">", ">=", "<", "<=", "==", "!="])
+def test_unknown_resolution_values_meet_the_condition(operator):
+    meets = {">": np.greater, ">=": np.greater_equal, "<": np.less, "<=": np.less_equal,
+             "==": np.equal, "!=": np.not_equal}[operator]
+    thresholds = np.array([0.05, 0.15, 1.0, -7.25, 250.0])
+    values = boundary_values(thresholds, [OPERATOR_CODES[operator]] * len(thresholds),
+                             rng=np.random.default_rng(0))
+
+    assert meets(values["error"], thresholds).all()
+    assert not meets(values["normal"], thresholds).any()
+    assert meets(values["inside"], thresholds).all()
+    assert not meets(values["outside"], thresholds).any()
+
+
+def test_known_factor_snaps_to_the_signal_grid():
+    signals = {"VehSpeed": {"factor": 0.5, "offset": 0.25, "minimum": 0, "maximum": 100}}
+    greater, equal = condition(">", 10), condition("==", 10)
+    assign_boundary_values([[greater, equal]], increment_text="2", signals=signals)
+
+    assert greater["error_value"] == 12.25
+    assert greater["normal_value"] == 7.75
+    assert greater["boundary"] == {"inside": 10.25, "outside": 9.75, "extreme": 99.75}
+    # == is triggered with the exact threshold even off the grid
+    assert equal["error_value"] == 10
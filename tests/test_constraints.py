@@ -0,0 +1,29 @@
+from types import SimpleNamespace
+
+import torch
+
+from generator.constraints import GrammarLogitsProcessor
+
+# Decoder start (pad), eos and the words of "CODDING: TRIGGERS: VehSpeed > 50 → 0x32"
+SURFACES = [None, None, " CODDING:", " TRIGGERS:", " Veh", "Speed", " >", " 50", " →", " 0x32", " 0x"]
+TOKENIZER = SimpleNamespace(eos_token_id=1)
+TEXT = "VehSpeed above 50 km/h [0x32]"
+
+
+def full_parse(processor, token_ids):
+    text = "".join(processor.surfaces[token_id] or "" for token_id in token_ids)
+    return processor.grammar.advance("start", "", text)
+
+
+def test_cached_state_matches_full_parse():
+    processor = GrammarLogitsProcessor(TOKENIZER, TEXT, surfaces=SURFACES)
+    # Two beams, swapped between steps, the second one leaving the grammar at step 2
+    beams = [[0, 2, 3, 4, 5, 6, 7, 8, 9], [0, 2, 7, 3, 4, 5, 6, 7, 10]]
+    for step in range(1, len(beams[0]) + 1):
+        input_ids = torch.tensor([beam[:step] for beam in (beams if step % 2 else beams[::-1])])
+        scores = processor(input_ids, torch.zeros(len(beams), len(SURFACES)))
+        for row, token_ids in enumerate(input_ids.tolist()):
+            assert processor.states[tuple(token_ids)] == full_parse(processor, token_ids)
+            assert torch.isfinite(scores[row]).any()
+    assert processor.grammar.can_end(*processor.states[tuple(beams[0])])
+    assert processor.states[tuple(beams[1])] is None
@@ -0,0 +1,23 @@
+import pandas as pd
+
+from generator.ingest import load_dtc_index
+
+
+def test_repeated_dtc_keeps_first_row(tmp_path):
+    path = tmp_path / "dtcs.xlsx"
+    pd.DataFrame({
+        "DTC": ["0x123456", "0x654321", "0x123456"],
+        "Implementation": ["Speed above 50 km/h [0x32]", "Voltage below 9 V [0x1]", ""],
+        "ECU": ["ECU1", "ECU1", "ECU1"],
+        "BUS": ["CAN1", "CAN1", "CAN1"],
+        "Debounce time": [100, 100, 100],
+    }).to_excel(path, index=False)
+
+    df, report = load_dtc_index([path], workers=1)
+
+    assert report.ok
+    assert [w["row"] for w in report.warnings if w["column"] == "DTC"] == [4]
+    assert list(df["DTC"]) == ["0x123456", "0x654321"]
+    assert df["Implementation"].iloc[0] == "Speed above 50 km/h [0x32]"
+    assert report.row_count == 2
+    assert report.errors_for(df.index[0]) == []
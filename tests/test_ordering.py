@@ -0,0 +1,40 @@
+import pytest
+
+from generator.cli import parse_args
+from generator.ordering import estimate_ordering, order_by_bench_state, write_bench_ordered
+from generator.timing import compute_wait_windows
+
+
+def suite(code, ecu="ECU1", bus="CAN1", pwf="PAD", voltage=12):
+    data = {"tester_name": "T", "dtc_code": code, "ECU": ecu, "Bus": bus, "Pwf": pwf, "Voltage": voltage,
+            "Debounce": 500, "codding": "c", "timing": compute_wait_windows(500), "unknown_signals": [],
+            "trigger_conditions": [{"variable": "VehSpeed", "operator": ">", "value": "50",
+                                    "error_value": 60, "normal_value": 40}],
+            "estimated_runtime_ms": 10_000}
+    return (f"{code}_testcase.robot", data, False)
+
+
+def test_suites_are_grouped_by_ecu_bus_and_precondition():
+    suites = [suite("0x1"), suite("0x2", pwf="WOHNEN"), suite("0x3"), suite("0x4", bus="LIN1"),
+              suite("0x5", pwf="WOHNEN"), suite("0x6", voltage=13.5)]
+
+    ordered = [data["dtc_code"] for _, data, _ in order_by_bench_state(suites)]
+    assert ordered == ["0x1", "0x3", "0x2", "0x5", "0x4", "0x6"]
+    assert estimate_ordering(suites)["bench_states"] == 4
+    assert estimate_ordering(suites, hoist_setup=True)["saved_ms"] > 0
+
+
+def test_hoisted_folders_run_the_state_of_their_rows(tmp_path):
+    write_bench_ordered([suite("0x1", pwf="WOHNEN", voltage=13.5), suite("0x2")], str(tmp_path), hoist_setup=True)
+
+    folders = sorted(path.name for path in tmp_path.iterdir())
+    assert folders == ["01__ECU1_CAN1_Pwf_WOHNEN_13.5V", "02__ECU1_CAN1_Pwf_PAD_12V"]
+    init = (tmp_path / folders[0] / "__init__.robot").read_text()
+    assert "Suite Setup    Bench Precondition    WOHNEN    ${13.5}" in init
+    assert (tmp_path / folders[0] / "dtc_keywords.resource").is_file()
+
+
+def test_hoist_setup_needs_bench_state_ordering(capsys):
+    with pytest.raises(SystemExit):
+        parse_args(["dtc.xlsx", "--hoist-setup"])
+    assert "--order-by-bench-state" in capsys.readouterr().err
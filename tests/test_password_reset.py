@@ -0,0 +1,67 @@
+import sys
+import json
+import time
+import base64
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from server.supabase_config import supabase_config
+from server.supabase_stub import SupabaseStub
+
+RESETS = 40
+
+
+def access_token(user):
+    """Unsigned JWT that GoTrue accepts as an unexpired session token"""
+    def encode(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+    return f"{encode({'alg': 'HS256', 'typ': 'JWT'})}.{encode({'sub': user, 'exp': int(time.time()) + 3600})}.sig"
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    with SupabaseStub(latency=0.02) as stub:
+        monkeypatch.setattr(supabase_config, "url", stub.url)
+        yield stub
+
+
+def test_auth_clients_are_independent(stub):
+    first, second = supabase_config.create_auth_client(), supabase_config.create_auth_client()
+    first.set_session(access_token("a"), access_token("a"))
+    assert second.get_session() is None
+    assert first._http_client is second._http_client
+
+
+@pytest.fixture
+def frequent_thread_switches():
+    """Switch threads as often as possible, so that shared session state gets clobbered"""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_concurrent_password_resets(stub, frequent_thread_switches):
+    from server.redirect_server import app
+
+    tokens = {access_token(f"user{i}"): f"Secret-user{i}-1!" for i in range(RESETS)}
+
+    def reset(token):
+        password = tokens[token]
+        response = app.test_client().post("/update-password", data={
+            "access_token": token,
+            "new_password": password,
+            "confirm_password": password,
+        })
+        return response.status_code
+
+    with ThreadPoolExecutor(16) as pool:
+        statuses = list(pool.map(reset, tokens))
+
+    assert statuses == [200] * RESETS
+    # Every password went out with its own user's token
+    assert sorted(stub.password_updates) == sorted(tokens.items())
+    assert stub.requests["PUT /auth/v1/user"] == RESETS
+    assert stub.requests["POST /auth/v1/logout"] == RESETS
@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+from generator.registry import METADATA_FILE, ModelRegistry
+
+
+@pytest.fixture
+def registry(tmp_path):
+    (tmp_path / "v001").mkdir()
+    (tmp_path / "v001" / METADATA_FILE).write_text(json.dumps({"version": "v001"}))
+    return ModelRegistry(str(tmp_path))
+
+
+def test_activate_registered_version(registry):
+    registry.activate("v001")
+    assert registry.current() == "v001"
+
+
+@pytest.mark.parametrize("version", ["v002", "../v001", "v001/..", ".", "..", ""])
+def test_activate_rejects_unknown_names(registry, version):
+    with pytest.raises(ValueError):
+        registry.activate(version)
+    assert registry.current() is None
+
+
+def test_staging_folder_is_not_a_version(registry):
+    # Interrupted register(): the copy kept its metadata but was never renamed
+    (registry.root / ".v002.part").mkdir()
+    (registry.root / ".v002.part" / METADATA_FILE).write_text(json.dumps({"version": "v002"}))
+
+    assert [meta["version"] for meta in registry.versions()] == ["v001"]
+    with pytest.raises(ValueError):
+        registry.activate("v002")
@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtCore = pytest.importorskip("PyQt5.QtCore")
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from frontend.views.result_table import DtcResultFilterProxyModel, DtcResultTableModel  # noqa: E402
+
+ROWS = 10_000
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def result(number):
+    return {
+        "dtc_code": f"0x{number:06X}",
+        "codding": ["Variant_A" if number % 2 else "Variant_B"],
+        "trigger_conditions": [{"variable": "VehSpeed", "operator": ">", "value": str(number % 250)}],
+        "Debounce": (number * 37) % 5000,
+    }
+
+
+def test_batches_of_ten_thousand_rows(app):
+    model = DtcResultTableModel()
+    proxy = DtcResultFilterProxyModel()
+    proxy.setSourceModel(model)
+    inserts = []
+    model.rowsInserted.connect(lambda parent, first, last: inserts.append(last - first + 1))
+
+    for start in range(0, ROWS, 32):
+        model.append_results([result(number) for number in range(start, min(start + 32, ROWS))])
+    assert model.rowCount() == proxy.rowCount() == ROWS
+    assert len(inserts) == -(-ROWS // 32)
+
+    # A regenerated DTC replaces its row instead of adding one
+    model.append_results([dict(result(5), Debounce=1)])
+    assert model.rowCount() == ROWS
+
+    proxy.sort(3, QtCore.Qt.AscendingOrder)
+    debounces = [float(proxy.index(row, 3).data()) for row in range(proxy.rowCount())]
+    assert debounces == sorted(debounces)
+
+    proxy.setFilterFixedString("variant_b")
+    assert proxy.rowCount() == ROWS // 2
+    proxy.setFilterFixedString("0x00270F")
+    assert proxy.rowCount() == 1 and proxy.index(0, 0).data() == "0x00270F"
@@ -0,0 +1,35 @@
+from generator.boundary import assign_boundary_values
+from generator.signals import load_signal_index, resolve_signals
+
+DBC = """VERSION ""
+
+BO_ {message_id} {message}: 8 ECU
+ SG_ VehicleSpeed : 0|16@1+ ({factor},0) [0|{maximum}] "km/h" Vector__XXX
+"""
+
+
+def test_condition_uses_the_record_of_its_bus(tmp_path):
+    (tmp_path / "CAN1.dbc").write_text(DBC.format(message_id=256, message="Speed_1", factor=1, maximum=250))
+    (tmp_path / "CAN2.dbc").write_text(DBC.format(message_id=512, message="Speed_2", factor=0.25, maximum=100))
+    index = load_signal_index([tmp_path], cache_path=None)
+
+    conditions = [{"variable": "vehicle_speed", "operator": ">", "value": "50.1"}]
+    assert resolve_signals(conditions, index, bus="CAN2") == []
+    assign_boundary_values([conditions], increment_text="1", signals=index)
+
+    cond = conditions[0]
+    assert (cond["variable"], cond["message"], cond["message_id"]) == ("VehicleSpeed", "Speed_2", "0x200")
+    # Grid and range of CAN2 (0.25, max 100), not of the first VehicleSpeed (CAN1: 1, max 250)
+    assert cond["error_value"] == 51.25
+    assert cond["boundary"] == {"inside": 50.25, "outside": 50.0, "extreme": 100.0}
+
+
+def test_cache_is_reused_and_ignored_when_malformed(tmp_path):
+    (tmp_path / "CAN1.dbc").write_text(DBC.format(message_id=256, message="Speed_1", factor=1, maximum=250))
+    cache_path = tmp_path / "cache" / "signal_index.json"
+    first = load_signal_index([tmp_path], cache_path=str(cache_path))
+    cached = load_signal_index([tmp_path], cache_path=str(cache_path))
+    assert cached.get("VehicleSpeed") == first.get("VehicleSpeed")
+
+    cache_path.write_bytes(b"\x80\x04not json")
+    assert load_signal_index([tmp_path], cache_path=str(cache_path)).get("VehicleSpeed") == first.get("VehicleSpeed")
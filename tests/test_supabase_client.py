@@ -0,0 +1,19 @@
+from server.supabase_config import SupabaseConfig
+from server.supabase_stub import SupabaseStub
+
+
+def test_sub_clients_have_own_http_clients_on_the_shared_transport():
+    with SupabaseStub() as stub:
+        config = SupabaseConfig()
+        config.url, config.key, config.service_key = stub.url, "stub-anon-key", None
+        client = config.create_client()
+
+        rest, storage = client.postgrest.session, client.storage._client
+        http_clients = [rest, storage, client.functions._client, client.auth._http_client]
+        assert len({id(http_client) for http_client in http_clients}) == 4
+        assert all(http_client._transport is config.get_transport() for http_client in http_clients)
+        assert (str(rest.base_url), str(storage.base_url)) == (f"{stub.url}/rest/v1/", f"{stub.url}/storage/v1/")
+
+        client.table("users").select("*").execute()
+        client.table("users").select("*").execute()
+        assert stub.connections == 1
@@ -0,0 +1,96 @@
+import os
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from generator import ingest
+from generator.pipeline import DtcTestGenerator
+from generator.validation import WorkbookValidationError
+from generator.watch import STATE_FILE, WorkbookSync
+
+
+class FakeGenerator(DtcTestGenerator):
+    """DtcTestGenerator whose model always answers the same trigger"""
+
+    def __init__(self):
+        self.signals = None
+        self.rng = np.random.default_rng(0)
+        self.version = None
+
+    def generate_rule_output_raw(self, text, *args, **kwargs):
+        return "CODDING: Variant_A TRIGGERS: VehSpeed > 50 → 0x32"
+
+
+class FakeModels:
+    options = {}
+    model_dir = "fake_model"
+
+    @contextmanager
+    def use(self):
+        yield FakeGenerator()
+
+
+def write_workbook(path, dtc_column="DTC"):
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame({
+            dtc_column: ["0x123456", "0x654321"],
+            "Implementation": ["Speed above 50 km/h", "Speed above 50 km/h"],
+            "ECU": ["ECU1", "ECU1"],
+            "BUS": ["CAN1", "CAN1"],
+            "Debounce time": [500, 500],
+        }).to_excel(writer, sheet_name="Body", index=False)
+        pd.DataFrame({"Note": ["revision 2"]}).to_excel(writer, sheet_name="Notes", index=False)
+
+
+@pytest.fixture
+def synced(tmp_path):
+    """A workbook whose two DTCs have been generated once"""
+    workbook = tmp_path / "ecu1.xlsx"
+    write_workbook(workbook)
+    sync = WorkbookSync(FakeModels(), str(tmp_path / "out"))
+    changes = sync.sync(str(workbook))
+    assert sorted(changes["added"]) == ["0x123456", "0x654321"]
+    return sync, workbook
+
+
+def generated(sync):
+    return sorted(os.listdir(os.path.join(sync.output_dir, "ecu1")))
+
+
+def test_skipped_sheet_keeps_generated_tests(synced):
+    sync, workbook = synced
+    files, state = generated(sync), open(os.path.join(sync.output_dir, STATE_FILE)).read()
+    # Half-written save: the DTC column is not there yet, the sheet is skipped
+    write_workbook(workbook, dtc_column="Unnamed: 0")
+
+    with pytest.raises(WorkbookValidationError):
+        sync.sync(str(workbook))
+    assert generated(sync) == files
+    assert open(os.path.join(sync.output_dir, STATE_FILE)).read() == state
+
+
+def test_unreadable_sheet_keeps_generated_tests(synced, monkeypatch):
+    sync, workbook = synced
+    files = generated(sync)
+
+    def locked(*args, **kwargs):
+        raise OSError("file is locked")
+
+    monkeypatch.setattr(ingest.pd, "read_excel", locked)
+    with pytest.raises(WorkbookValidationError):
+        sync.sync(str(workbook))
+    assert generated(sync) == files
+    assert sorted(sync.state["workbooks"]["ecu1.xlsx"]) == ["0x123456", "0x654321"]
+
+
+def test_removed_dtc_deletes_its_test(synced):
+    sync, workbook = synced
+    df = pd.read_excel(workbook, sheet_name="Body").head(1)
+    with pd.ExcelWriter(workbook) as writer:
+        df.to_excel(writer, sheet_name="Body", index=False)
+
+    changes = sync.sync(str(workbook))
+    assert changes["removed"] == ["0x654321"]
+    assert generated(sync) == ["0x123456_testcase.robot", "dtc_keywords.resource"]